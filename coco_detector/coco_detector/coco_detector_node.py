@@ -2,15 +2,20 @@
 
 Subscribes to /image and publishes Detection2DArray message on topic /detected_objects.
 Also publishes (by default) annotated image with bounding boxes on /annotated_image.
+With frame_source:=shm, frames are read from the Go2 driver's shared-memory ring
+instead (driver parameter camera_shm), woken by the header-only frame_ready topic.
 Uses PyTorch and FasterRCNN_MobileNet model from torchvision.
 Bounding Boxes use image convention, ie center.y = 0 means top of image.
 """
 
 import collections
+import cv2
 import numpy as np
 import rclpy
 from rclpy.node import Node
+from rclpy.qos import QoSHistoryPolicy, QoSProfile, QoSReliabilityPolicy
 from sensor_msgs.msg import Image
+from std_msgs.msg import Header
 from vision_msgs.msg import BoundingBox2D, ObjectHypothesis, ObjectHypothesisWithPose
 from vision_msgs.msg import Detection2D, Detection2DArray
 from cv_bridge import CvBridge
@@ -20,6 +25,12 @@ from torchvision.utils import draw_bounding_boxes
 
 Detection = collections.namedtuple("Detection", "label, bbox, score")
 
+
+def i420_to_rgb(yuv):
+    """Converts planar YUV 4:2:0 (height * 3/2 rows of Y, U, V) to RGB."""
+    return cv2.cvtColor(yuv, cv2.COLOR_YUV2RGB_I420)
+
+
 class CocoDetectorNode(Node):
     """Detects COCO objects in image and publishes on ROS2.
 
@@ -33,14 +44,32 @@ class CocoDetectorNode(Node):
         self.declare_parameter('device', 'cpu')
         self.declare_parameter('detection_threshold', 0.9)
         self.declare_parameter('publish_annotated_image', True)
+        self.declare_parameter('frame_source', 'topic')
+        self.declare_parameter('shm_name', 'go2_camera_0')
         self.device = self.get_parameter('device').get_parameter_value().string_value
         self.detection_threshold = \
             self.get_parameter('detection_threshold').get_parameter_value().double_value
-        self.subscription = self.create_subscription(
-            Image,
-            "/camera/image_raw",
-            self.listener_callback,
-            10)
+        self.frame_source = self.get_parameter('frame_source').get_parameter_value().string_value
+        self.shm_name = self.get_parameter('shm_name').get_parameter_value().string_value
+        self.frame_ring = None
+        self.last_frame_index = 0
+        if self.frame_source == 'shm':
+            # Matches the driver's best-effort publisher; only the newest frame matters
+            frame_ready_qos = QoSProfile(
+                reliability=QoSReliabilityPolicy.BEST_EFFORT,
+                history=QoSHistoryPolicy.KEEP_LAST,
+                depth=1)
+            self.subscription = self.create_subscription(
+                Header,
+                "/camera/frame_ready",
+                self.frame_ready_callback,
+                frame_ready_qos)
+        else:
+            self.subscription = self.create_subscription(
+                Image,
+                "/camera/image_raw",
+                self.listener_callback,
+                10)
         self.detected_objects_publisher = \
             self.create_publisher(Detection2DArray, "detected_objects", 10)
         if self.get_parameter('publish_annotated_image').get_parameter_value().bool_value:
@@ -95,8 +124,69 @@ class CocoDetectorNode(Node):
 
     def listener_callback(self, msg):
         """Reads image and publishes on /detected_objects and /annotated_image."""
-        cv_image = self.bridge.imgmsg_to_cv2(msg, desired_encoding="rgb8")
+        if msg.encoding == "i420":
+            # Not a cv_bridge encoding; published by older Go2 drivers with video_format:=i420
+            yuv = np.frombuffer(msg.data, dtype=np.uint8).reshape(-1, msg.width)
+            cv_image = i420_to_rgb(yuv)
+        else:
+            cv_image = self.bridge.imgmsg_to_cv2(msg, desired_encoding="rgb8")
         image = cv_image.copy().transpose((2, 0, 1))
+        self.detect(image, msg.header)
+
+    def frame_ready_callback(self, msg):
+        """Reads the newest frame from the shared-memory ring and runs detection."""
+        if self.frame_ring is None and not self.attach_frame_ring():
+            return
+        frame = self.frame_ring.latest(copy=False, after=self.last_frame_index)
+        if frame is None:
+            if not self.frame_ring.replaced():
+                return
+            # The driver restarted and created a new ring under the same name
+            self.get_logger().info(f"Frame ring {self.shm_name} was recreated, reattaching")
+            self.frame_ring.close()
+            self.frame_ring = None
+            if not self.attach_frame_ring():
+                return
+            frame = self.frame_ring.latest(copy=False, after=self.last_frame_index)
+            if frame is None:
+                return
+        # The only copy: channel-first RGB straight out of shared memory
+        if frame.encoding == "i420" and frame.image.ndim == 2:
+            view = i420_to_rgb(frame.image)
+        elif frame.encoding in ("bgr8", "rgb8") and frame.image.ndim == 3:
+            view = frame.image[:, :, ::-1] if frame.encoding == "bgr8" else frame.image
+        else:
+            self.get_logger().warning(
+                f"Unsupported frame ring encoding '{frame.encoding}' "
+                f"with shape {frame.image.shape}, expected bgr8, rgb8 or i420",
+                throttle_duration_sec=5.0)
+            self.last_frame_index = frame.index
+            return
+        image = np.ascontiguousarray(view.transpose((2, 0, 1)))
+        if not frame.valid():
+            return  # overwritten by the driver while copying
+        self.last_frame_index = frame.index
+        header = Header()
+        header.stamp.sec, header.stamp.nanosec = frame.stamp
+        header.frame_id = frame.frame_id
+        self.detect(image, header)
+
+    def attach_frame_ring(self):
+        """Attaches to the driver's frame ring; returns False if it is unavailable."""
+        # Only needed with frame_source:=shm
+        from go2_common.frame_ring import FrameRingReader, FrameRingError
+        try:
+            self.frame_ring = FrameRingReader(self.shm_name)
+        except (FileNotFoundError, FrameRingError) as error:
+            self.get_logger().warning(f"Frame ring {self.shm_name} unavailable: {error}",
+                                      throttle_duration_sec=5.0)
+            return False
+        # A new ring numbers its frames from 1 again
+        self.last_frame_index = 0
+        return True
+
+    def detect(self, image, header):
+        """Runs detection on a channel-first RGB image and publishes the results."""
         batch_image = np.expand_dims(image, axis=0)
         tensor_image = torch.tensor(batch_image/255.0, dtype=torch.float, device=self.device)
         mobilenet_detections = self.model(tensor_image)[0]  # pylint: disable=E1102 disable not callable warning
@@ -105,12 +195,12 @@ class CocoDetectorNode(Node):
             mobilenet_detections["boxes"],
             mobilenet_detections["scores"]) if score >= self.detection_threshold]
         detection_array = Detection2DArray()
-        detection_array.header = msg.header
+        detection_array.header = header
         detection_array.detections = \
-            [self.mobilenet_to_ros2(detection, msg.header) for detection in filtered_detections]
+            [self.mobilenet_to_ros2(detection, header) for detection in filtered_detections]
         self.detected_objects_publisher.publish(detection_array)
         if self.annotated_image_publisher is not None:
-            self.publish_annotated_image(filtered_detections, msg.header, image)
+            self.publish_annotated_image(filtered_detections, header, image)
 
 
 rclpy.init()
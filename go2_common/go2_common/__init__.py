@@ -0,0 +1,11 @@
+# Copyright (c) 2024, RoboVerse community
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+Helpers shared by go2_robot_sdk and the packages that consume its output.
+
+Importing go2_robot_sdk runs its package setup (aioice path patching) and
+pulls in the WebRTC stack; the modules here import nothing beyond NumPy
+and ROS message types, so consumers can use them without the driver.
+Import the modules directly; this package imports nothing on its own.
+"""
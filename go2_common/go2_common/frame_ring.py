@@ -0,0 +1,310 @@
+# Copyright (c) 2024, RoboVerse community
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+Shared-memory ring of camera frames for consumers on the same machine.
+
+The driver writes every decoded frame into one of a fixed number of slots;
+readers map the same segment and look at the newest frame without ROS
+serialization or copies. Each slot is guarded by a sequence lock: the
+writer makes the slot's sequence odd before touching it and even (and
+larger) afterwards, so a reader that sees the same even sequence before
+and after using a frame knows it was not overwritten meanwhile.
+
+Every writer stamps the ring with a generation. A restarted driver
+creates a new segment under the same name and starts its frame indices
+at 1 again; it also zeroes the generation of the old segment if that one
+is still around. A reader notices either change with replaced() and
+attaches again.
+
+Layout (little endian):
+    ring header (64 bytes): magic, version, slot count, slot capacity,
+                            generation (0 = retired),
+                            newest frame index (0 = none yet)
+    slots: slot header (128 bytes) followed by the pixel data, each slot
+           aligned to 64 bytes
+
+Python offers no memory barriers; the sequence and pixel stores are
+separate interpreter operations, which keeps them ordered in practice on
+the x86 and ARM machines the driver runs on.
+"""
+
+import logging
+import struct
+import time
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"G2FR"
+VERSION = 2
+# magic, version, slots, reserved, capacity, generation, newest index
+HEADER = struct.Struct("<4sIIIQQQ")
+HEADER_SIZE = 64
+SLOT_HEADER = struct.Struct("<QQqIIII16s32s")
+# sequence, frame index, stamp sec, stamp nanosec, height, width, channels, encoding, frame id
+SLOT_HEADER_SIZE = 128
+GENERATION_OFFSET = HEADER.size - 16
+NEWEST_OFFSET = HEADER.size - 8
+
+# One 1080p bgr8 frame
+DEFAULT_SLOT_CAPACITY = 1920 * 1080 * 3
+
+
+class FrameRingError(Exception):
+    """Custom exception for frame ring errors"""
+    pass
+
+
+def _align(size: int, alignment: int = 64) -> int:
+    return (size + alignment - 1) // alignment * alignment
+
+
+@dataclass
+class RingFrame:
+    """
+    The newest frame of a ring.
+
+    `image` is a view into shared memory when read with copy=False; call
+    valid() after using it to make sure the writer did not overwrite it.
+    """
+    index: int
+    stamp: Tuple[int, int]  # (sec, nanosec)
+    encoding: str
+    frame_id: str
+    image: np.ndarray
+    _reader: "FrameRingReader"
+    _slot: int
+    _sequence: int
+
+    def valid(self) -> bool:
+        """True if the slot still holds this frame"""
+        return self._reader._slot_sequence(self._slot) == self._sequence
+
+
+class FrameRingWriter:
+    """Creates a frame ring and writes frames into it (single writer)"""
+
+    def __init__(self, name: str, slots: int = 4,
+                 slot_capacity: int = DEFAULT_SLOT_CAPACITY) -> None:
+        """
+        Create the shared memory segment, replacing a stale one of the same name.
+
+        Args:
+            name: Shared memory name, e.g. "go2_camera_0"
+            slots: Number of frame slots
+            slot_capacity: Maximum frame size in bytes
+        """
+        if slots < 2:
+            raise FrameRingError("A frame ring needs at least 2 slots")
+        self.name = name
+        self.slots = slots
+        self.slot_capacity = slot_capacity
+        self.slot_stride = _align(SLOT_HEADER_SIZE + slot_capacity)
+        size = HEADER_SIZE + slots * self.slot_stride
+        try:
+            self.shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        except FileExistsError:
+            # Left behind by a driver that did not shut down cleanly
+            stale = shared_memory.SharedMemory(name=name)
+            _retire(stale.buf)
+            stale.close()
+            stale.unlink()
+            self.shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        self.buf = self.shm.buf
+        # Nanosecond creation time: differs between any two writers of a name
+        self.generation = time.time_ns()
+        HEADER.pack_into(self.buf, 0, MAGIC, VERSION, slots, 0, slot_capacity,
+                         self.generation, 0)
+        self.index = 0
+        logger.info(f"Frame ring {name}: {slots} slots of {slot_capacity} bytes")
+
+    def write(self, image: np.ndarray, stamp: Tuple[int, int], encoding: str = "bgr8",
+              frame_id: str = "") -> int:
+        """
+        Write a frame into the next slot.
+
+        Args:
+            image: uint8 image, (height, width) or (height, width, channels)
+            stamp: (sec, nanosec) of the frame
+            encoding: ROS image encoding
+            frame_id: TF frame of the camera
+
+        Returns:
+            The frame index (1-based)
+        """
+        if image.dtype != np.uint8:
+            raise FrameRingError(f"Only uint8 images are supported, got {image.dtype}")
+        if image.nbytes > self.slot_capacity:
+            raise FrameRingError(
+                f"Frame of {image.nbytes} bytes exceeds the slot capacity {self.slot_capacity}")
+        height, width = image.shape[:2]
+        channels = image.shape[2] if image.ndim == 3 else 1
+
+        index = self.index + 1
+        slot = index % self.slots
+        offset = HEADER_SIZE + slot * self.slot_stride
+        # Odd sequence: slot is being written
+        struct.pack_into("<Q", self.buf, offset, 2 * index - 1)
+        data = np.ndarray(image.shape, dtype=np.uint8, buffer=self.buf,
+                          offset=offset + SLOT_HEADER_SIZE)
+        data[...] = image
+        del data
+        SLOT_HEADER.pack_into(
+            self.buf, offset, 2 * index, index, stamp[0], stamp[1], height, width, channels,
+            encoding.encode()[:16], frame_id.encode()[:32])
+        struct.pack_into("<Q", self.buf, NEWEST_OFFSET, index)
+        self.index = index
+        return index
+
+    def close(self) -> None:
+        """Remove the shared memory segment; readers keep their mapping until they close"""
+        _retire(self.buf)
+        self.buf = None
+        self.shm.close()
+        try:
+            self.shm.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class FrameRingReader:
+    """Attaches to a frame ring created by a FrameRingWriter"""
+
+    def __init__(self, name: str) -> None:
+        """
+        Args:
+            name: Shared memory name the writer was created with
+
+        Raises:
+            FileNotFoundError: The ring does not exist (yet)
+            FrameRingError: The segment is not a compatible frame ring
+        """
+        self.shm = shared_memory.SharedMemory(name=name)
+        _untrack(self.shm)
+        self.buf = self.shm.buf
+        header = _read_header(self.buf)
+        if header is None:
+            self.shm.close()
+            raise FrameRingError(f"{name} is not a version {VERSION} frame ring")
+        slots, capacity, self.generation = header
+        self.name = name
+        self.slots = slots
+        self.slot_stride = _align(SLOT_HEADER_SIZE + capacity)
+        self.torn = 0  # frames overwritten while being read
+
+    def replaced(self) -> bool:
+        """
+        True if this mapping no longer belongs to the ring's current writer.
+
+        That is the case when the writer retired it, or when the name now
+        refers to a ring of another generation. Checking the name opens the
+        segment, so call this when latest() finds nothing new despite a
+        new-frame notification, not on every frame. After a replacement,
+        close this reader, attach a new one and reset `after` to 0.
+        """
+        if _generation(self.buf) != self.generation:
+            return True
+        try:
+            current = shared_memory.SharedMemory(name=self.name)
+        except FileNotFoundError:
+            return False  # writer gone and not restarted yet: nothing newer to attach to
+        _untrack(current)
+        try:
+            return _generation(current.buf) != self.generation
+        finally:
+            current.close()
+
+    def newest_index(self) -> int:
+        """Index of the newest complete frame, 0 if none was written"""
+        return struct.unpack_from("<Q", self.buf, NEWEST_OFFSET)[0]
+
+    def latest(self, copy: bool = True, after: int = 0) -> Optional[RingFrame]:
+        """
+        Read the newest frame.
+
+        Args:
+            copy: Copy the pixels out of shared memory; with False the image is
+                a view and the caller must check frame.valid() after using it
+            after: Only return a frame newer than this index
+
+        Returns:
+            The frame, or None if there is no new complete frame
+        """
+        index = self.newest_index()
+        if index <= after:
+            return None
+        slot = index % self.slots
+        offset = HEADER_SIZE + slot * self.slot_stride
+        (sequence, frame_index, sec, nanosec, height, width, channels, encoding,
+         frame_id) = SLOT_HEADER.unpack_from(self.buf, offset)
+        if sequence != 2 * index or frame_index != index:
+            # Lapped by the writer between reading the index and the slot
+            self.torn += 1
+            return None
+        shape = (height, width, channels) if channels > 1 else (height, width)
+        image = np.ndarray(shape, dtype=np.uint8, buffer=self.buf,
+                           offset=offset + SLOT_HEADER_SIZE)
+        if copy:
+            image = image.copy()
+        frame = RingFrame(
+            index=index,
+            stamp=(sec, nanosec),
+            encoding=encoding.rstrip(b"\0").decode(),
+            frame_id=frame_id.rstrip(b"\0").decode(),
+            image=image,
+            _reader=self,
+            _slot=slot,
+            _sequence=sequence,
+        )
+        if copy and not frame.valid():
+            self.torn += 1
+            return None
+        return frame
+
+    def _slot_sequence(self, slot: int) -> int:
+        return struct.unpack_from("<Q", self.buf, HEADER_SIZE + slot * self.slot_stride)[0]
+
+    def close(self) -> None:
+        """Unmap the ring; views returned with copy=False must be released first"""
+        self.buf = None
+        self.shm.close()
+
+
+def _read_header(buf) -> Optional[Tuple[int, int, int]]:
+    """Slot count, slot capacity and generation, or None if buf is not a frame ring"""
+    if len(buf) < HEADER_SIZE:
+        return None
+    magic, version, slots, _, capacity, generation, _ = HEADER.unpack_from(buf, 0)
+    if magic != MAGIC or version != VERSION:
+        return None
+    return slots, capacity, generation
+
+
+def _generation(buf) -> int:
+    header = _read_header(buf)
+    return header[2] if header is not None else 0
+
+
+def _retire(buf) -> None:
+    """Zero the generation of a ring so its readers attach again"""
+    if _read_header(buf) is not None:
+        struct.pack_into("<Q", buf, GENERATION_OFFSET, 0)
+
+
+def _untrack(shm: shared_memory.SharedMemory) -> None:
+    """
+    Keep the resource tracker from unlinking a segment this process only attached to.
+
+    Before Python 3.13 every SharedMemory is registered with the tracker,
+    which unlinks it when the attaching process exits.
+    """
+    try:
+        from multiprocessing import resource_tracker
+        resource_tracker.unregister(shm._name, "shared_memory")
+    except Exception:
+        pass
@@ -0,0 +1,66 @@
+# Copyright (c) 2024, RoboVerse community
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+Direct-buffer PointCloud2 builder.
+Packs a float32 NumPy array into msg.data with a single buffer copy instead
+of sensor_msgs_py's per-point struct packing.
+"""
+
+import array
+from typing import Sequence
+
+import numpy as np
+from sensor_msgs.msg import PointCloud2, PointField
+from std_msgs.msg import Header
+
+FLOAT32_SIZE = 4
+
+
+class PointCloud2Builder:
+    """Build PointCloud2 messages with a fixed all-float32 field layout"""
+
+    def __init__(self, field_names: Sequence[str] = ('x', 'y', 'z', 'intensity')) -> None:
+        """
+        Initialize the builder.
+
+        Args:
+            field_names: FLOAT32 fields, in column order of the input arrays
+        """
+        self.field_names = tuple(field_names)
+        self.fields = [
+            PointField(name=name, offset=i * FLOAT32_SIZE, datatype=PointField.FLOAT32, count=1)
+            for i, name in enumerate(self.field_names)
+        ]
+        self.point_step = FLOAT32_SIZE * len(self.field_names)
+
+    def build(self, header: Header, points: np.ndarray) -> PointCloud2:
+        """
+        Create a PointCloud2 from an (N, len(field_names)) array.
+
+        Args:
+            header: Message header (frame_id, stamp)
+            points: Point array; converted to contiguous float32 only if needed
+
+        Returns:
+            PointCloud2 message
+        """
+        points = np.ascontiguousarray(points, dtype=np.float32)
+        if points.ndim != 2 or points.shape[1] != len(self.field_names):
+            points = points.reshape(-1, len(self.field_names))
+
+        msg = PointCloud2()
+        msg.header = header
+        msg.height = 1
+        msg.width = len(points)
+        msg.fields = self.fields
+        msg.is_bigendian = False
+        msg.point_step = self.point_step
+        msg.row_step = self.point_step * len(points)
+        msg.is_dense = False
+
+        # array('B') is the fast path of the uint8[] setter; frombytes is the one copy
+        data = array.array('B')
+        data.frombytes(points.reshape(-1).view(np.uint8))
+        msg.data = data
+        return msg
@@ -0,0 +1,23 @@
+# Copyright (c) 2024, RoboVerse community
+# SPDX-License-Identifier: BSD-3-Clause
+
+from setuptools import setup
+
+package_name = 'go2_common'
+
+setup(
+    name=package_name,
+    version='0.0.0',
+    packages=[package_name],
+    data_files=[
+        ('share/ament_index/resource_index/packages',
+            ['resource/' + package_name]),
+        ('share/' + package_name, ['package.xml']),
+    ],
+    install_requires=['setuptools'],
+    zip_safe=True,
+    maintainer='brimo',
+    maintainer_email='abizov94@gmail.com',
+    description='Dependency-light helpers shared by the Go2 driver and its consumers',
+    license='BSD-3-Clause',
+)
@@ -39,6 +39,12 @@ from nav_msgs.msg import Odometry
 from sensor_msgs.msg import PointCloud2, PointField, Imu
 from sensor_msgs_py import point_cloud2
 
+try:
+    from go2_common.point_cloud_builder import PointCloud2Builder
+except ImportError:
+    # go2_common not installed in the Isaac Sim environment
+    PointCloud2Builder = None
+
 
 
 from omni.isaac.orbit.sensors import CameraCfg, Camera
@@ -154,6 +160,8 @@ class RobotBaseNode(Node):
         self.go2_lidar_pub = []
         self.odom_pub = []
         self.imu_pub = []
+        self.lidar_cloud_builder = (
+            PointCloud2Builder(('x', 'y', 'z')) if PointCloud2Builder else None)
 
         for i in range(num_envs):
             self.joint_pub.append(self.create_publisher(JointState, f'robot{i}/joint_states', qos_profile))
@@ -241,14 +249,16 @@ class RobotBaseNode(Node):
 
     def publish_lidar(self, points, robot_num):
 
-        point_cloud = PointCloud2()
-        point_cloud.header = Header(frame_id="odom")
-        fields = [
-            PointField(name='x', offset=0, datatype=PointField.FLOAT32, count=1),
-            PointField(name='y', offset=4, datatype=PointField.FLOAT32, count=1),
-            PointField(name='z', offset=8, datatype=PointField.FLOAT32, count=1),
-        ]
-        point_cloud = point_cloud2.create_cloud(point_cloud.header, fields, points)
+        header = Header(frame_id="odom")
+        if self.lidar_cloud_builder is not None:
+            point_cloud = self.lidar_cloud_builder.build(header, points)
+        else:
+            fields = [
+                PointField(name='x', offset=0, datatype=PointField.FLOAT32, count=1),
+                PointField(name='y', offset=4, datatype=PointField.FLOAT32, count=1),
+                PointField(name='z', offset=8, datatype=PointField.FLOAT32, count=1),
+            ]
+            point_cloud = point_cloud2.create_cloud(header, fields, points)
         self.go2_lidar_pub[robot_num].publish(point_cloud)
 
 
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+# Copyright (c) 2024, RoboVerse community
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+Benchmark point cloud dedup: packed integer keys vs np.unique(axis=0).
+
+Decodes the corpus once with the native decoder, then runs both
+update_meshes_for_cloud2 implementations on the decoded vertices and
+reports input vertices per second.
+
+Usage:
+    python3 cloud_dedup_bench.py [--corpus DIR] [--repeat N]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from go2_robot_sdk.infrastructure.sensors.lidar_decoder import (
+    NativeLidarDecoder, update_meshes_for_cloud2, update_meshes_for_cloud2_reference
+)
+from voxel_corpus import load_frames, split_frame
+
+
+def run(func, samples, repeat: int) -> float:
+    """Return mean seconds per frame"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for decoded, header in samples:
+            func(decoded["positions"], decoded["uvs"], header["resolution"], header["origin"], 0)
+    return (time.perf_counter() - start) / (repeat * len(samples))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--corpus", help="directory with captured *.bin voxel frames")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    decoder = NativeLidarDecoder()
+    samples = []
+    for frame in load_frames(args.corpus):
+        metadata, payload = split_frame(frame)
+        samples.append((decoder.decode(payload, metadata["data"]), metadata["data"]))
+
+    vertices = sum(len(d["positions"]) // 3 for d, _ in samples) / len(samples)
+    print(f"frames: {len(samples)}, mean vertices/frame: {vertices:.0f}")
+
+    # Sanity check: identical output, including row order
+    for decoded, header in samples:
+        args_ = (decoded["positions"], decoded["uvs"], header["resolution"], header["origin"], 0)
+        assert np.array_equal(
+            update_meshes_for_cloud2(*args_), update_meshes_for_cloud2_reference(*args_))
+
+    reference_t = run(update_meshes_for_cloud2_reference, samples, args.repeat)
+    fast_t = run(update_meshes_for_cloud2, samples, args.repeat)
+    print(f"np.unique(axis=0):  {reference_t * 1e3:8.2f} ms/frame  "
+          f"{vertices / reference_t / 1e6:7.2f} Mpoints/s")
+    print(f"packed uint32 keys: {fast_t * 1e3:8.2f} ms/frame  "
+          f"{vertices / fast_t / 1e6:7.2f} Mpoints/s")
+    print(f"speedup:            {reference_t / fast_t:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
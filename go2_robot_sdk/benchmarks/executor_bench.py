@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+# Copyright (c) 2024, RoboVerse community
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+Benchmark the executor modes: cmd_vel-to-send latency and publish throughput.
+
+Reproduces the driver's threading layout without a robot. A teleop thread
+publishes Twist messages whose linear.x cycles through distinct non-zero
+values, noting when each value was published. The driver node's cmd_vel
+callback stores them in a VelocityChannel, whose run() task sends the
+latest one at --send-rate as it does on the data channel. The latency of
+a command is the time from publishing its Twist to its first send, so it
+includes the wait for the channel's next tick. Meanwhile a task on the
+event loop publishes Odometry as fast as it can, like the robot data
+callbacks do. It reports that rate and the process CPU usage, and the CPU
+usage of an idle driver (spinning, but with nothing published) measured
+before the load starts.
+
+Every mode runs in a fresh interpreter (rclpy can only be initialized once).
+
+Usage:
+    python3 executor_bench.py [--duration S] [--rate HZ] [--send-rate HZ]
+                              [--idle S] [--modes thread,asyncio,multi]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+MODES = ("thread", "asyncio", "multi")
+
+# Distinct linear.x values the teleop thread cycles through
+VELOCITY_STEPS = 99
+
+
+def sent_velocity(payload: str) -> float:
+    """linear.x of a rendered move command"""
+    return json.loads(json.loads(payload)["data"]["parameter"])["x"]
+
+
+async def run_mode(mode: str, duration: float, rate: float, send_rate: float,
+                   idle: float = 2.0) -> dict:
+    """Run one executor mode for `duration` seconds and return its results"""
+    import rclpy
+    from rclpy.callback_groups import MutuallyExclusiveCallbackGroup
+    from geometry_msgs.msg import Twist
+    from nav_msgs.msg import Odometry
+
+    from go2_robot_sdk.infrastructure.ros2.executors import spin_node
+    from go2_robot_sdk.infrastructure.webrtc.velocity_channel import VelocityChannel
+
+    rclpy.init()
+    driver = rclpy.create_node("bench_driver")
+    teleop = rclpy.create_node("bench_teleop")
+
+    latencies = []
+    published_at = {}  # linear.x -> perf_counter() of its latest publish
+    last_sent = None
+
+    def send(payload: str) -> None:
+        nonlocal last_sent
+        x = sent_velocity(payload)
+        if x != last_sent:
+            # Keepalive re-sends of the same velocity are not new commands
+            latencies.append(time.perf_counter() - published_at[x])
+            last_sent = x
+
+    channel = VelocityChannel(send, rate=send_rate, timeout=duration)
+    command_group = MutuallyExclusiveCallbackGroup()
+    driver.create_subscription(
+        Twist, "bench/cmd_vel",
+        lambda msg: channel.set(msg.linear.x, msg.linear.y, msg.angular.z), 10,
+        callback_group=command_group)
+    odom_publisher = driver.create_publisher(Odometry, "bench/odom", 10)
+    cmd_publisher = teleop.create_publisher(Twist, "bench/cmd_vel", 10)
+
+    published = 0
+    running = True
+
+    async def data_publisher():
+        nonlocal published
+        odom = Odometry()
+        while running:
+            for _ in range(10):
+                odom.header.stamp = driver.get_clock().now().to_msg()
+                odom_publisher.publish(odom)
+            published += 10
+            await asyncio.sleep(0)
+
+    def teleop_thread():
+        twist = Twist()
+        period = 1.0 / rate
+        step = 0
+        while running:
+            x = (step % VELOCITY_STEPS + 1) / 100
+            twist.linear.x = x
+            published_at[x] = time.perf_counter()
+            cmd_publisher.publish(twist)
+            step += 1
+            time.sleep(period)
+
+    spin_task = asyncio.create_task(spin_node(driver, mode=mode))
+    sender_task = asyncio.create_task(channel.run())
+    # Let discovery settle before measuring
+    await asyncio.sleep(1.0)
+    idle_cpu, idle_wall = time.process_time(), time.perf_counter()
+    await asyncio.sleep(idle)
+    idle_cpu = time.process_time() - idle_cpu
+    idle_wall = time.perf_counter() - idle_wall
+    latencies.clear()
+
+    publisher_task = asyncio.create_task(data_publisher())
+    thread = threading.Thread(target=teleop_thread, daemon=True)
+    cpu_start, wall_start = time.process_time(), time.perf_counter()
+    thread.start()
+    await asyncio.sleep(duration)
+    running = False
+    cpu = time.process_time() - cpu_start
+    wall = time.perf_counter() - wall_start
+
+    await publisher_task
+    thread.join()
+    sender_task.cancel()
+    rclpy.shutdown()
+    await asyncio.gather(spin_task, sender_task, return_exceptions=True)
+
+    ordered = sorted(latencies) or [float("nan")]
+    return {
+        "mode": mode,
+        "commands": len(latencies),
+        "expected": int(duration * min(rate, send_rate)),
+        "p50_ms": ordered[len(ordered) // 2] * 1e3,
+        "p95_ms": ordered[int((len(ordered) - 1) * 0.95)] * 1e3,
+        "p99_ms": ordered[int((len(ordered) - 1) * 0.99)] * 1e3,
+        "max_ms": ordered[-1] * 1e3,
+        "mean_ms": statistics.fmean(ordered) * 1e3,
+        "publish_rate": published / wall,
+        "cpu_percent": cpu / wall * 100,
+        "idle_cpu_percent": idle_cpu / idle_wall * 100,
+    }
+
+
+def sample(mode: str, duration: float, rate: float, send_rate: float, idle: float) -> dict:
+    """Run one mode in a fresh interpreter"""
+    out = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child", mode,
+         "--duration", str(duration), "--rate", str(rate), "--send-rate", str(send_rate),
+         "--idle", str(idle)],
+        check=True, capture_output=True, text=True,
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--rate", type=float, default=50.0, help="cmd_vel rate in Hz")
+    parser.add_argument("--send-rate", type=float, default=20.0,
+                        help="VelocityChannel send rate in Hz (cmd_vel_rate)")
+    parser.add_argument("--idle", type=float, default=2.0,
+                        help="seconds of idle spinning to measure CPU usage over")
+    parser.add_argument("--modes", default=",".join(MODES))
+    parser.add_argument("--child", choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(asyncio.run(
+            run_mode(args.child, args.duration, args.rate, args.send_rate, args.idle))))
+        return
+
+    print(f"duration: {args.duration}s, cmd_vel rate: {args.rate} Hz, "
+          f"send rate: {args.send_rate} Hz")
+    print(f"{'mode':<8} {'cmds':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8} "
+          f"{'publish/s':>10} {'cpu %':>6} {'idle %':>6}")
+    for mode in args.modes.split(","):
+        r = sample(mode, args.duration, args.rate, args.send_rate, args.idle)
+        print(f"{r['mode']:<8} {r['commands']:>4}/{r['expected']:<4} {r['p50_ms']:8.3f} "
+              f"{r['p95_ms']:8.3f} {r['p99_ms']:8.3f} {r['max_ms']:8.3f} "
+              f"{r['publish_rate']:10.0f} {r['cpu_percent']:6.1f} "
+              f"{r['idle_cpu_percent']:6.1f}")
+
+
+if __name__ == "__main__":
+    main()
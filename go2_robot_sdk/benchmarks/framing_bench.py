@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# Copyright (c) 2024, RoboVerse community
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+Benchmark binary frame parsing: zero-copy parse_frame vs slicing parser.
+
+The slicing parser is the previous decode_array_buffer logic: it slices the
+JSON segment and the payload out of the message (two copies), decodes the
+JSON bytes to str and copies the metadata dict. parse_frame keeps the
+payload as a memoryview into the message.
+
+Usage:
+    python3 framing_bench.py [--corpus DIR] [--repeat N] [--decode native|wasm]
+"""
+
+import argparse
+import json
+import struct
+import time
+
+from go2_robot_sdk.infrastructure.webrtc.framing import parse_frame
+from voxel_corpus import load_frames
+
+
+def parse_slicing(buffer: bytes):
+    """Previous parser: returns (metadata, payload bytes)"""
+    json_length = struct.unpack("<H", buffer[:2])[0]
+    json_segment = buffer[4:4 + json_length]
+    compressed_data = buffer[4 + json_length:]
+    metadata = json.loads(json_segment.decode("utf-8"))
+    return metadata.copy(), compressed_data
+
+
+def parse_zero_copy(buffer: bytes):
+    frame = parse_frame(buffer)
+    return frame.metadata, frame.payload
+
+
+def run(parse, frames, repeat: int, decoder=None) -> float:
+    """Return mean seconds per message"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for frame in frames:
+            metadata, payload = parse(frame)
+            if decoder is not None:
+                decoder.decode(payload, metadata["data"])
+    return (time.perf_counter() - start) / (repeat * len(frames))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--corpus", help="directory with captured *.bin voxel frames")
+    parser.add_argument("--repeat", type=int, default=2000)
+    parser.add_argument("--decode", choices=("native", "wasm"),
+                        help="also decode each payload with this backend")
+    args = parser.parse_args()
+
+    frames = load_frames(args.corpus)
+    payload_bytes = sum(len(parse_frame(f).payload) for f in frames) / len(frames)
+    print(f"frames: {len(frames)}, mean payload: {payload_bytes:.0f} bytes")
+
+    # Sanity check: identical metadata and payload
+    for frame in frames:
+        old_meta, old_payload = parse_slicing(frame)
+        new_meta, new_payload = parse_zero_copy(frame)
+        assert old_meta == new_meta and old_payload == new_payload
+
+    decoder = None
+    repeat = args.repeat
+    if args.decode:
+        from go2_robot_sdk.infrastructure.sensors.lidar_decoder import get_voxel_decoder
+        decoder = get_voxel_decoder(args.decode)
+        repeat = max(1, repeat // 100)
+
+    slicing_t = run(parse_slicing, frames, repeat, decoder)
+    zero_copy_t = run(parse_zero_copy, frames, repeat, decoder)
+    label = f" + {args.decode} decode" if decoder else ""
+    print(f"slicing{label}:   {slicing_t * 1e6:9.2f} us/message")
+    print(f"zero-copy{label}: {zero_copy_t * 1e6:9.2f} us/message")
+    # JSON segment slice, payload slice and metadata dict copy
+    print(f"copies avoided:   3 per message, {payload_bytes:.0f}+ bytes not copied")
+    print(f"speedup:          {slicing_t / zero_copy_t:9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
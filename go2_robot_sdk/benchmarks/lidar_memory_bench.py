@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# Copyright (c) 2024, RoboVerse community
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+Benchmark the WASM memory bridge against the previous per-byte implementation.
+
+The legacy decoder below reproduces the old `add_value_arr` Python loop and the
+ctypes-slice-to-bytearray output copies on top of the same WASM instance, so
+both variants run identical decompression work.
+
+Usage:
+    python3 lidar_memory_bench.py [--corpus DIR] [--repeat N]
+"""
+
+import argparse
+import ctypes
+import time
+
+import numpy as np
+
+from go2_robot_sdk.infrastructure.sensors.lidar_decoder import LidarDecoder
+from voxel_corpus import load_frames, split_frame
+
+
+class LegacyLidarDecoder(LidarDecoder):
+    """LidarDecoder with the pre-bridge per-byte copy paths"""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.legacy_heap = (ctypes.c_uint8 * self.memory.size).from_address(self.memory.address)
+
+    def add_value_arr(self, start, value):
+        if start + len(value) <= len(self.legacy_heap):
+            for i, byte in enumerate(value):
+                self.legacy_heap[start + i] = byte
+        else:
+            raise ValueError("Not enough space to insert bytes at the specified index.")
+
+    def decode(self, compressed_data, data):
+        result = super().decode(compressed_data, data)
+        u = result["face_count"]
+        heap = self.legacy_heap
+        result["positions"] = np.frombuffer(
+            bytearray(heap[self.positions:self.positions + u * 12]), dtype=np.uint8)
+        result["uvs"] = np.frombuffer(bytearray(heap[self.uvs:self.uvs + u * 8]), dtype=np.uint8)
+        result["indices"] = np.frombuffer(
+            bytearray(heap[self.indices:self.indices + u * 24]), dtype=np.uint32)
+        return result
+
+
+def run(decoder: LidarDecoder, frames, repeat: int) -> float:
+    """Return mean seconds per frame"""
+    samples = [split_frame(frame) for frame in frames]
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for metadata, payload in samples:
+            decoder.decode(payload, metadata["data"])
+    return (time.perf_counter() - start) / (repeat * len(samples))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--corpus", help="directory with captured *.bin voxel frames")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    frames = load_frames(args.corpus)
+    payload_bytes = sum(len(split_frame(f)[1]) for f in frames) / len(frames)
+    print(f"frames: {len(frames)}, mean payload: {payload_bytes:.0f} bytes")
+
+    bridge = LidarDecoder()
+    legacy = LegacyLidarDecoder()
+
+    # Sanity check: both paths must produce identical buffers
+    metadata, payload = split_frame(frames[0])
+    a = bridge.decode(payload, metadata["data"])
+    b = legacy.decode(payload, metadata["data"])
+    for key in ("positions", "uvs", "indices"):
+        assert np.array_equal(a[key], b[key]), key
+
+    legacy_t = run(legacy, frames, args.repeat)
+    bridge_t = run(bridge, frames, args.repeat)
+    print(f"legacy per-byte copies: {legacy_t * 1e3:8.2f} ms/frame  ({1 / legacy_t:7.1f} Hz)")
+    print(f"memory bridge:          {bridge_t * 1e3:8.2f} ms/frame  ({1 / bridge_t:7.1f} Hz)")
+    print(f"speedup:                {legacy_t / bridge_t:8.2f}x")
+    print(f"WASM callbacks:         {bridge.callback_stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# Copyright (c) 2024, RoboVerse community
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+Measure driver startup: go2_driver_node import plus the first voxel map decode.
+
+Every sample runs in a fresh interpreter. Scenarios:
+  cold        empty module cache (compile + serialize)
+  warm        populated module cache (deserialize)
+  cold+debug  empty cache with DWARF debug info, like the previous default
+
+Usage:
+    python3 startup_bench.py [--repeat N] [--backend wasm|native]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+CHILD = r"""
+import json, sys, time
+t0 = time.perf_counter()
+import go2_robot_sdk.presentation.go2_driver_node
+t1 = time.perf_counter()
+from go2_robot_sdk.infrastructure.sensors.lidar_decoder import get_voxel_decoder
+from voxel_corpus import synthetic_frames, split_frame
+metadata, payload = split_frame(synthetic_frames(1)[0])
+t2 = time.perf_counter()
+get_voxel_decoder(sys.argv[1]).decode(payload, metadata["data"])
+t3 = time.perf_counter()
+print(json.dumps({"import": t1 - t0, "first_decode": t3 - t2}))
+"""
+
+
+def sample(backend: str, cache_dir: str, debug_info: bool) -> dict:
+    """Run one fresh interpreter and return its timings in seconds"""
+    env = dict(os.environ)
+    env["GO2_WASM_CACHE_DIR"] = cache_dir
+    env["GO2_WASM_DEBUG_INFO"] = "1" if debug_info else "0"
+    env["PYTHONPATH"] = os.pathsep.join(
+        [os.path.dirname(os.path.abspath(__file__)), env.get("PYTHONPATH", "")]
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", CHILD, backend],
+        env=env, check=True, capture_output=True, text=True,
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def report(name: str, samples: list) -> None:
+    imports = [s["import"] * 1e3 for s in samples]
+    decodes = [s["first_decode"] * 1e3 for s in samples]
+    total = [a + b for a, b in zip(imports, decodes)]
+    print(f"{name:<11} import {statistics.median(imports):7.1f} ms  "
+          f"first decode {statistics.median(decodes):7.1f} ms  "
+          f"total {statistics.median(total):7.1f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--backend", default="wasm", choices=("wasm", "native"))
+    args = parser.parse_args()
+
+    cold, warm, debug = [], [], []
+    for _ in range(args.repeat):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cold.append(sample(args.backend, cache_dir, debug_info=False))
+            warm.append(sample(args.backend, cache_dir, debug_info=False))
+        with tempfile.TemporaryDirectory() as cache_dir:
+            debug.append(sample(args.backend, cache_dir, debug_info=True))
+
+    print(f"backend: {args.backend}, samples: {args.repeat} (median)")
+    report("cold", cold)
+    report("warm", warm)
+    report("cold+debug", debug)
+
+
+if __name__ == "__main__":
+    main()
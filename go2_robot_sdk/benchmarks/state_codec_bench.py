@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# Copyright (c) 2024, RoboVerse community
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+Benchmark state message decoding: typed MessageCodec vs json.loads.
+
+Both paths end in RobotDataService.process_webrtc_message with a publisher
+that only stores the result, so the numbers cover JSON decoding,
+validation and entity construction for rt/lf/sportmodestate and
+rt/lf/lowstate.
+
+Recorded messages are read from a file with one JSON text message per
+line; otherwise synthetic messages with the robot's field layout are used.
+
+Usage:
+    python3 state_codec_bench.py [--messages FILE] [--repeat N]
+"""
+
+import argparse
+import json
+import random
+import time
+from typing import List
+
+from go2_robot_sdk.application.services.robot_data_service import RobotDataService
+from go2_robot_sdk.domain.constants import RTC_TOPIC
+from go2_robot_sdk.infrastructure.webrtc.message_codec import MessageCodec, msgspec
+
+
+class StorePublisher:
+    """Keeps the last RobotData of each publish call"""
+
+    def __init__(self) -> None:
+        self.last = {}
+
+    def __getattr__(self, name):
+        if not name.startswith("publish_"):
+            raise AttributeError(name)
+        return lambda robot_data: self.last.__setitem__(name, robot_data)
+
+
+def synthetic_messages(count: int = 200) -> List[str]:
+    """Alternating sportmodestate/lowstate messages"""
+    rng = random.Random(0)
+
+    def floats(n: int) -> List[float]:
+        return [rng.uniform(-1.0, 1.0) for _ in range(n)]
+
+    messages = []
+    for i in range(count // 2):
+        sport = {
+            "stamp": {"sec": 1700000000 + i, "nanosec": 0},
+            "error_code": 0,
+            "imu_state": {
+                "quaternion": floats(4), "gyroscope": floats(3),
+                "accelerometer": floats(3), "rpy": floats(3), "temperature": 60,
+            },
+            "mode": 1, "progress": 0, "gait_type": 1, "foot_raise_height": 0.09,
+            "position": floats(3), "body_height": 0.32, "velocity": floats(3),
+            "yaw_speed": 0.0, "range_obstacle": floats(4),
+            "foot_force": [rng.randint(0, 200) for _ in range(4)],
+            "foot_position_body": floats(12), "foot_speed_body": floats(12),
+        }
+        low = {
+            "imu_state": {"rpy": floats(3)},
+            "motor_state": [
+                {"q": rng.uniform(-2.0, 2.0), "temperature": rng.randint(25, 45),
+                 "lost": 0, "reserve": [0, 0]}
+                for _ in range(20)
+            ],
+            "bms_state": {
+                "version_high": 1, "version_low": 18, "status": 8, "soc": 80,
+                "current": -2400, "cycle": 5, "bq_ntc": [25, 23], "mcu_ntc": [29, 28],
+                "cell_vol": [3600 + rng.randint(0, 50) for _ in range(15)],
+            },
+            "foot_force": [rng.randint(0, 200) for _ in range(4)],
+            "temperature_ntc1": 40, "power_v": 29.5,
+        }
+        messages.append(json.dumps(
+            {"type": "msg", "topic": RTC_TOPIC["LF_SPORT_MOD_STATE"], "data": sport}))
+        messages.append(json.dumps(
+            {"type": "msg", "topic": RTC_TOPIC["LOW_STATE"], "data": low}))
+    return messages
+
+
+def run(decode, messages: List[str], repeat: int) -> float:
+    """Return mean seconds per message"""
+    service = RobotDataService(StorePublisher())
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for message in messages:
+            service.process_webrtc_message(decode(message), "0")
+    return (time.perf_counter() - start) / (repeat * len(messages))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--messages", help="file with one recorded JSON message per line")
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    if args.messages:
+        with open(args.messages) as f:
+            messages = [line.strip() for line in f if line.strip()]
+    else:
+        messages = synthetic_messages()
+    print(f"messages: {len(messages)}, msgspec: {msgspec.__version__ if msgspec else 'missing'}")
+
+    # Sanity check: identical entities from both paths
+    codec = MessageCodec()
+    legacy_out, typed_out = StorePublisher(), StorePublisher()
+    for message in messages:
+        RobotDataService(legacy_out).process_webrtc_message(json.loads(message), "0")
+        RobotDataService(typed_out).process_webrtc_message(codec.decode(message), "0")
+        assert legacy_out.last == typed_out.last
+    print(f"codec: {codec.stats()}")
+
+    legacy_t = run(json.loads, messages, args.repeat)
+    typed_t = run(MessageCodec().decode, messages, args.repeat)
+    print(f"json.loads + validation: {legacy_t * 1e6:8.2f} us/message  {1 / legacy_t:9.0f} msg/s")
+    print(f"typed codec:             {typed_t * 1e6:8.2f} us/message  {1 / typed_t:9.0f} msg/s")
+    print(f"speedup:                 {legacy_t / typed_t:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+# Copyright (c) 2024, RoboVerse community
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+Voxel map payload corpus for benchmarks and parity tests.
+
+Frames are complete binary data channel messages as received from the robot:
+2-byte little-endian JSON length, 2 bytes padding, JSON header, LZ4 payload.
+Captured frames are loaded from a directory of `*.bin` files; otherwise a
+deterministic synthetic corpus is generated.
+"""
+
+import glob
+import json
+import os
+import struct
+from typing import List, Optional
+
+import numpy as np
+
+VOXEL_TOPIC = "rt/utlidar/voxel_map_compressed"
+GRID_SHAPE = (30, 128, 128)  # z, y, x
+
+
+def lz4_compress_block(data: bytes) -> bytes:
+    """
+    Minimal greedy LZ4 block compressor (no frame header).
+
+    Good enough to produce valid payloads with literal runs, long matches and
+    overlapping matches; compression ratio is not a goal.
+    """
+    n = len(data)
+    out = bytearray()
+    table = {}
+    anchor = 0
+    i = 0
+    # LZ4 spec: last match must start at least 12 bytes before the end,
+    # and the last 5 bytes are always literals.
+    match_limit = n - 12
+
+    def write_length(length: int) -> None:
+        while length >= 255:
+            out.append(255)
+            length -= 255
+        out.append(length)
+
+    while i < match_limit:
+        key = data[i:i + 4]
+        candidate = table.get(key)
+        table[key] = i
+        if candidate is None or i - candidate > 65535:
+            i += 1
+            continue
+
+        match_len = 4
+        while i + match_len < n - 5 and data[candidate + match_len] == data[i + match_len]:
+            match_len += 1
+
+        literal_len = i - anchor
+        token_lit = min(literal_len, 15)
+        token_match = min(match_len - 4, 15)
+        out.append((token_lit << 4) | token_match)
+        if literal_len >= 15:
+            write_length(literal_len - 15)
+        out += data[anchor:i]
+        out += struct.pack("<H", i - candidate)
+        if match_len - 4 >= 15:
+            write_length(match_len - 4 - 15)
+
+        i += match_len
+        anchor = i
+
+    literal_len = n - anchor
+    out.append(min(literal_len, 15) << 4)
+    if literal_len >= 15:
+        write_length(literal_len - 15)
+    out += data[anchor:]
+    return bytes(out)
+
+
+def synthetic_grid(seed: int, fill: float = 0.01) -> np.ndarray:
+    """Build a plausible occupancy grid: floor, a few walls and sparse clutter"""
+    rng = np.random.default_rng(seed)
+    grid = rng.random(GRID_SHAPE) < fill
+    grid[0:2, :, :] |= rng.random(GRID_SHAPE[1:]) < 0.6
+    for _ in range(4):
+        y = rng.integers(0, GRID_SHAPE[1])
+        x0, x1 = sorted(rng.integers(0, GRID_SHAPE[2], size=2))
+        grid[:rng.integers(5, GRID_SHAPE[0]), y, x0:x1] = True
+    return grid
+
+
+def build_frame(payload: bytes, origin=(0.0, 0.0, 0.0), resolution: float = 0.05,
+                stamp: float = 0.0) -> bytes:
+    """Wrap an LZ4 payload into a binary data channel message"""
+    header = {
+        "type": "msg",
+        "topic": VOXEL_TOPIC,
+        "data": {
+            "stamp": stamp,
+            "frame_id": "odom",
+            "resolution": resolution,
+            "src_size": GRID_SHAPE[0] * GRID_SHAPE[1] * GRID_SHAPE[2] // 8,
+            "origin": list(origin),
+            "width": [GRID_SHAPE[2], GRID_SHAPE[1], GRID_SHAPE[0]],
+        },
+    }
+    header_bytes = json.dumps(header).encode("utf-8")
+    return struct.pack("<HH", len(header_bytes), 0) + header_bytes + payload
+
+
+def synthetic_frames(count: int = 8, seed: int = 0) -> List[bytes]:
+    """Generate `count` deterministic voxel map frames"""
+    frames = []
+    for k in range(count):
+        grid = synthetic_grid(seed + k)
+        payload = lz4_compress_block(np.packbits(grid.reshape(-1)).tobytes())
+        origin = (0.05 * k, -0.05 * k, -0.5 + 0.05 * k)
+        frames.append(build_frame(payload, origin=origin, stamp=1700000000.0 + 0.1 * k))
+    return frames
+
+
+def load_frames(corpus_dir: Optional[str] = None, count: int = 8) -> List[bytes]:
+    """
+    Load captured frames from `corpus_dir` or fall back to the synthetic corpus.
+
+    Args:
+        corpus_dir: Directory containing raw `*.bin` data channel messages
+        count: Number of synthetic frames when no captured corpus is available
+    """
+    if corpus_dir:
+        paths = sorted(glob.glob(os.path.join(corpus_dir, "*.bin")))
+        if paths:
+            frames = []
+            for path in paths:
+                with open(path, "rb") as f:
+                    frames.append(f.read())
+            return frames
+    return synthetic_frames(count)
+
+
+def split_frame(frame: bytes):
+    """Return (metadata, payload) of a binary data channel message"""
+    json_len = struct.unpack_from("<H", frame)[0]
+    metadata = json.loads(frame[4:4 + json_len].decode("utf-8"))
+    return metadata, frame[4 + json_len:]
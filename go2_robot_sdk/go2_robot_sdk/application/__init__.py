@@ -1,7 +1,8 @@
 """
 Application layer - application services
 """
-from .services import RobotDataService, RobotControlService
+from .services import RobotDataService, RobotControlService, TopicDispatcher, SubscriptionManager
 from .utils import gen_command, gen_mov_command, generate_id
 
-__all__ = ['RobotDataService', 'RobotControlService', 'gen_command', 'gen_mov_command', 'generate_id'] 
\ No newline at end of file
+__all__ = ['RobotDataService', 'RobotControlService', 'TopicDispatcher', 'SubscriptionManager',
+           'gen_command', 'gen_mov_command', 'generate_id']
@@ -3,5 +3,9 @@ Application services
 """
 from .robot_data_service import RobotDataService
 from .robot_control_service import RobotControlService
+from .topic_dispatcher import TopicDispatcher
+from .subscription_manager import SubscriptionManager
+from .ingest_stage import IngestStage, TopicPolicy
 
-__all__ = ['RobotDataService', 'RobotControlService'] 
\ No newline at end of file
+__all__ = ['RobotDataService', 'RobotControlService', 'TopicDispatcher', 'SubscriptionManager',
+           'IngestStage', 'TopicPolicy']
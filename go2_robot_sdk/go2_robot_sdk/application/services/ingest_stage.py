@@ -0,0 +1,168 @@
+# Copyright (c) 2024, RoboVerse community
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+Ingest stage between the WebRTC transport and RobotDataService.
+
+Messages are queued per (robot, topic) in small bounded queues and handed
+to the data service by a worker thread, so a slow ROS side (DDS, large
+point clouds) neither blocks the event loop that services SCTP nor builds
+an ever-growing backlog. Per-topic policies:
+
+- queue_size: bounded queue; the oldest message is dropped on overflow.
+  1 means latest-value-only coalescing.
+- max_rate: at most this many deliveries per second; messages that arrive
+  faster wait in the queue and are coalesced/dropped by the bound above.
+- merge: called as merge(dropped, next) when a message is dropped, so
+  state carried by the dropped message can be folded into its successor.
+"""
+
+import logging
+import threading
+import time
+from collections import Counter, deque
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+Message = Dict[str, Any]
+
+
+@dataclass
+class TopicPolicy:
+    """Ingest policy of one topic"""
+    queue_size: int = 1  # 1 = latest value only
+    max_rate: float = 0.0  # deliveries per second, 0 = unlimited
+    merge: Optional[Callable[[Message, Message], Message]] = None
+
+
+class IngestStage:
+    """Bounded, rate-capped hand-off from the transport to a delivery callback"""
+
+    def __init__(self, deliver: Callable[[Message, str], None],
+                 policies: Optional[Dict[str, TopicPolicy]] = None,
+                 default_policy: Optional[TopicPolicy] = None) -> None:
+        """
+        Initialize the ingest stage.
+
+        Args:
+            deliver: Called as deliver(msg, robot_id) on the worker thread
+            policies: Policy per topic
+            default_policy: Policy of topics not in `policies`
+        """
+        self.deliver = deliver
+        self.policies = dict(policies or {})
+        self.default_policy = default_policy or TopicPolicy(queue_size=10)
+
+        self._queues: Dict[Tuple[str, str], Deque[Message]] = {}
+        self._next_due: Dict[Tuple[str, str], float] = {}
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+
+        # Statistics, per topic
+        self.received: Counter = Counter()
+        self.delivered: Counter = Counter()
+        self.dropped: Counter = Counter()
+
+    def policy(self, topic: str) -> TopicPolicy:
+        return self.policies.get(topic, self.default_policy)
+
+    def start(self) -> None:
+        """Start the delivery thread"""
+        if self._thread is not None:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="ingest", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 1.0) -> None:
+        """Stop the delivery thread; queued messages are discarded"""
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+
+    def submit(self, msg: Message, robot_id: str) -> None:
+        """
+        Queue a message for delivery. Never blocks.
+
+        Args:
+            msg: Decoded data channel message
+            robot_id: Robot the message came from
+        """
+        topic = msg.get("topic", "")
+        policy = self.policy(topic)
+        key = (robot_id, topic)
+        with self._cond:
+            self.received[topic] += 1
+            queue = self._queues.get(key)
+            if queue is None:
+                queue = self._queues[key] = deque()
+            if len(queue) >= max(1, policy.queue_size):
+                dropped = queue.popleft()
+                self.dropped[topic] += 1
+                queue.append(msg)
+                if policy.merge is not None:
+                    queue[0] = policy.merge(dropped, queue[0])
+            else:
+                queue.append(msg)
+            self._cond.notify()
+
+    def _take(self, now: float) -> Tuple[Optional[Tuple[str, str]], Optional[Message],
+                                         Optional[float]]:
+        """Pop the next due message; otherwise return how long to wait. Caller holds the lock"""
+        wait = None
+        for key, queue in self._queues.items():
+            if not queue:
+                continue
+            due = self._next_due.get(key, 0.0)
+            if now >= due:
+                msg = queue.popleft()
+                max_rate = self.policy(key[1]).max_rate
+                if max_rate > 0:
+                    # Stay on the rate grid unless we fell behind it
+                    next_due = due + 1.0 / max_rate
+                    self._next_due[key] = next_due if next_due > now else now + 1.0 / max_rate
+                # Rotate so busy topics cannot starve the others
+                self._queues[key] = self._queues.pop(key)
+                return key, msg, None
+            wait = due - now if wait is None else min(wait, due - now)
+        return None, None, wait
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                if not self._running:
+                    return
+                key, msg, wait = self._take(time.monotonic())
+                if msg is None:
+                    self._cond.wait(timeout=wait)
+                    continue
+            robot_id, topic = key
+            try:
+                self.deliver(msg, robot_id)
+                with self._cond:
+                    self.delivered[topic] += 1
+            except Exception as e:
+                logger.error(f"Error delivering {topic} message: {e}")
+
+    def pending(self) -> int:
+        """Number of queued messages"""
+        with self._cond:
+            return sum(len(queue) for queue in self._queues.values())
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Return {topic: {"received", "delivered", "dropped"}}"""
+        with self._cond:
+            return {
+                topic: {
+                    "received": self.received[topic],
+                    "delivered": self.delivered[topic],
+                    "dropped": self.dropped[topic],
+                }
+                for topic in sorted(self.received)
+            }
@@ -6,7 +6,6 @@ import logging
 
 
 from ...domain.interfaces import IRobotController
-from ..utils.command_generator import gen_mov_command
 from ...domain.constants import RTC_TOPIC
 
 
@@ -20,26 +19,19 @@ class RobotControlService:
         self.controller = controller
 
     def handle_cmd_vel(self, x: float, y: float, z: float, robot_id: str, obstacle_avoidance: bool = False) -> None:
-        """Process movement command"""
+        """Process movement command; zero velocities are forwarded so the robot stops"""
         try:
-            logger.info(f"Received cmd_vel: x={x}, y={y}, z={z}, robot_id={robot_id}, obstacle_avoidance={obstacle_avoidance}")
-            if x != 0.0 or y != 0.0 or z != 0.0:
-                cmd = gen_mov_command(
-                    round(x, 2),
-                    round(y, 2),
-                    round(z, 2),
-                    obstacle_avoidance
-                )
-                logger.info(f"Sending movement command to robot {robot_id}: {cmd}")
-                self.controller.send_movement_command(robot_id, x, y, z)
+            logger.debug(f"Received cmd_vel: x={x}, y={y}, z={z}, robot_id={robot_id}")
+            self.controller.send_movement_command(robot_id, x, y, z)
         except Exception as e:
             logger.error(f"Error handling cmd_vel: {e}")
 
-    def handle_webrtc_request(self, api_id: int, parameter_str: str, topic: str, msg_id: str, robot_id: str) -> None:
+    def handle_webrtc_request(self, api_id: int, parameter_str: str, topic: str, msg_id: str,
+                              robot_id: str, priority: int = 0) -> None:
         """Process WebRTC request"""
         try:
             parameter = "" if parameter_str == "" else json.loads(parameter_str)
-            self.controller.send_webrtc_request(robot_id, api_id, parameter, topic)
+            self.controller.send_webrtc_request(robot_id, api_id, parameter, topic, priority)
             logger.info(f"WebRTC request sent to robot {robot_id}")
         except ValueError as e:
             logger.error(f"Invalid JSON in WebRTC request: {e}")
@@ -3,11 +3,15 @@
 
 import logging
 import math
-from typing import Dict, Any
+import time
+from typing import Dict, Any, Optional
 
 from ...domain.entities import RobotData, RobotState, IMUData, OdometryData, JointData, LidarData
 from ...domain.interfaces import IRobotDataPublisher
 from ...domain.constants import RTC_TOPIC
+from .topic_dispatcher import TopicDispatcher
+from ..utils.metrics import Histogram, get_metrics_registry
+from ..utils.tracing import StampTracer, robot_stamp
 
 logger = logging.getLogger(__name__)
 
@@ -15,34 +19,89 @@ logger = logging.getLogger(__name__)
 class RobotDataService:
     """Service for processing and validating robot data"""
 
-    def __init__(self, publisher: IRobotDataPublisher):
+    def __init__(self, publisher: IRobotDataPublisher, tracer: Optional[StampTracer] = None):
+        """
+        Args:
+            publisher: Publisher of the processed data
+            tracer: Records message age and stage timings of traced messages
+                and maps robot stamps to the local clock
+        """
         self.publisher = publisher
+        self.tracer = tracer
+        self.dispatcher = TopicDispatcher()
+        self.dispatcher.register(RTC_TOPIC["ULIDAR_ARRAY"], self._handle_lidar)
+        self.dispatcher.register(RTC_TOPIC["ROBOTODOM"], self._handle_odometry)
+        self.dispatcher.register(RTC_TOPIC["LF_SPORT_MOD_STATE"], self._handle_sport_mode_state)
+        self.dispatcher.register(RTC_TOPIC["LOW_STATE"], self._handle_low_state)
+        self.metrics = get_metrics_registry()
+        self._process_time: Dict[str, Histogram] = {}
 
     def process_webrtc_message(self, msg: Dict[str, Any], robot_id: str) -> None:
         """Process WebRTC message"""
+        start = time.perf_counter()
+        trace = msg.get("_trace")
+        if trace is not None:
+            trace.mark("dequeue")
+            if self.tracer is not None:
+                stamp = robot_stamp(msg)
+                if stamp is not None:
+                    msg["_local_stamp"] = self.tracer.local_stamp(
+                        robot_id, stamp, trace.received_wall)
         try:
-            topic = msg.get('topic')
-            robot_data = RobotData(robot_id=robot_id, timestamp=0.0)
-
-            if topic == RTC_TOPIC["ULIDAR_ARRAY"]:
-                self._process_lidar_data(msg, robot_data)
-                self.publisher.publish_lidar_data(robot_data)
-                self.publisher.publish_voxel_data(robot_data)
-
-            elif topic == RTC_TOPIC["ROBOTODOM"]:
-                self._process_odometry_data(msg, robot_data)
-                self.publisher.publish_odometry(robot_data)
-
-            elif topic == RTC_TOPIC["LF_SPORT_MOD_STATE"]:
-                self._process_sport_mode_state(msg, robot_data)
-                self.publisher.publish_robot_state(robot_data)
-
-            elif topic == RTC_TOPIC["LOW_STATE"]:
-                self._process_low_state(msg, robot_data)
-                self.publisher.publish_joint_state(robot_data)
-
+            self.dispatcher.dispatch(msg, robot_id)
         except Exception as e:
             logger.error(f"Error processing WebRTC message: {e}")
+        topic = msg.get("topic", "")
+        if trace is not None and self.tracer is not None:
+            trace.mark("publish")
+            self.tracer.record(topic, trace, msg.get("_local_stamp"))
+        histogram = self._process_time.get(topic)
+        if histogram is None:
+            histogram = self._process_time[topic] = self.metrics.histogram(
+                "go2_process_seconds", "Message processing time including publishing", topic=topic)
+        histogram.observe(time.perf_counter() - start)
+
+    @staticmethod
+    def _new_robot_data(msg: Dict[str, Any], robot_id: str) -> RobotData:
+        """RobotData carrying the message's local stamp and trace, if any"""
+        return RobotData(
+            robot_id=robot_id,
+            timestamp=msg.get("_local_stamp", 0.0),
+            trace=msg.get("_trace"),
+        )
+
+    @staticmethod
+    def merge_lidar_messages(dropped: Dict[str, Any], latest: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Ingest merge hook for voxel maps.
+
+        "unchanged" compares a frame with the frame received just before it;
+        once that frame is dropped the comparison no longer holds.
+        """
+        if latest.get("unchanged") and not dropped.get("unchanged"):
+            latest["unchanged"] = False
+        return latest
+
+    def _handle_lidar(self, msg: Dict[str, Any], robot_id: str) -> None:
+        robot_data = self._new_robot_data(msg, robot_id)
+        self._process_lidar_data(msg, robot_data)
+        self.publisher.publish_lidar_data(robot_data)
+        self.publisher.publish_voxel_data(robot_data)
+
+    def _handle_odometry(self, msg: Dict[str, Any], robot_id: str) -> None:
+        robot_data = self._new_robot_data(msg, robot_id)
+        self._process_odometry_data(msg, robot_data)
+        self.publisher.publish_odometry(robot_data)
+
+    def _handle_sport_mode_state(self, msg: Dict[str, Any], robot_id: str) -> None:
+        robot_data = self._new_robot_data(msg, robot_id)
+        self._process_sport_mode_state(msg, robot_data)
+        self.publisher.publish_robot_state(robot_data)
+
+    def _handle_low_state(self, msg: Dict[str, Any], robot_id: str) -> None:
+        robot_data = self._new_robot_data(msg, robot_id)
+        self._process_low_state(msg, robot_data)
+        self.publisher.publish_joint_state(robot_data)
 
     def _process_lidar_data(self, msg: Dict[str, Any], robot_data: RobotData) -> None:
         """Process lidar data"""
@@ -58,7 +117,8 @@ class RobotDataService:
                 stamp=data.get("stamp", 0.0),
                 width=data.get("width"),
                 src_size=data.get("src_size"),
-                compressed_data=msg.get("compressed_data")
+                compressed_data=msg.get("compressed_data"),
+                unchanged=msg.get("unchanged", False)
             )
         except Exception as e:
             logger.error(f"Error processing lidar data: {e}")
@@ -90,6 +150,12 @@ class RobotDataService:
         try:
             data = msg["data"]
 
+            if msg.get("typed"):
+                # Already type- and finiteness-checked by the message codec
+                robot_data.robot_state = data.to_robot_state()
+                robot_data.imu_data = data.imu_state.to_imu_data()
+                return
+
             # Data validation
             if not self._validate_float_list(data.get("position", [])):
                 return
@@ -137,6 +203,9 @@ class RobotDataService:
         """Process low state data"""
         try:
             low_state_data = msg['data']
+            if msg.get("typed"):
+                robot_data.joint_data = low_state_data.to_joint_data()
+                return
             robot_data.joint_data = JointData(
                 motor_state=low_state_data['motor_state']
             )
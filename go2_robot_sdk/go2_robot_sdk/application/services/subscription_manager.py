@@ -0,0 +1,83 @@
+# Copyright (c) 2024, RoboVerse community
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+On-demand robot topic subscriptions.
+The robot streams every topic it is subscribed to over the WebRTC link, so
+each robot is kept subscribed to the topics in demand (by active ROS
+consumers) plus an always-on set, and nothing else.
+"""
+
+import json
+import logging
+import threading
+from typing import Callable, Dict, FrozenSet, Iterable, Set, Tuple
+
+from ...domain.constants import DATA_CHANNEL_TYPE
+
+logger = logging.getLogger(__name__)
+
+
+class SubscriptionManager:
+    """Track and reconcile the robot topics each robot is subscribed to"""
+
+    def __init__(self, send: Callable[[str, str], None], always_on: Iterable[str] = ()) -> None:
+        """
+        Initialize the subscription manager.
+
+        Args:
+            send: Sends a data channel message: send(robot_id, message)
+            always_on: Robot topics subscribed regardless of demand
+        """
+        self.send = send
+        self.always_on: FrozenSet[str] = frozenset(always_on)
+        self._subscribed: Dict[str, Set[str]] = {}
+        # update() runs from the ROS timer thread and the asyncio loop
+        self._lock = threading.Lock()
+
+    def attach(self, robot_id: str) -> None:
+        """Start tracking a freshly validated connection (no subscriptions yet)"""
+        with self._lock:
+            self._subscribed[robot_id] = set()
+
+    def detach(self, robot_id: str) -> None:
+        """Stop tracking a robot, e.g. after disconnect"""
+        with self._lock:
+            self._subscribed.pop(robot_id, None)
+
+    def subscribed(self, robot_id: str) -> FrozenSet[str]:
+        """Topics the robot is currently subscribed to"""
+        with self._lock:
+            return frozenset(self._subscribed.get(robot_id, ()))
+
+    def update(self, robot_id: str, demanded: Iterable[str]) -> Tuple[Set[str], Set[str]]:
+        """
+        Subscribe to newly demanded topics and unsubscribe from unused ones.
+
+        Args:
+            robot_id: Robot to reconcile; ignored until attach() was called
+            demanded: Robot topics with an active consumer
+
+        Returns:
+            (subscribed, unsubscribed) topic sets of this update
+        """
+        wanted = set(self.always_on).union(demanded)
+        with self._lock:
+            current = self._subscribed.get(robot_id)
+            if current is None:
+                return set(), set()
+            added = wanted - current
+            removed = current - wanted
+            current |= added
+            current -= removed
+
+        for topic in sorted(added):
+            self.send(robot_id, json.dumps(
+                {"type": DATA_CHANNEL_TYPE["SUBSCRIBE"], "topic": topic}))
+        for topic in sorted(removed):
+            self.send(robot_id, json.dumps(
+                {"type": DATA_CHANNEL_TYPE["UNSUBSCRIBE"], "topic": topic}))
+
+        if added or removed:
+            logger.info(f"Robot {robot_id} subscriptions: +{sorted(added)} -{sorted(removed)}")
+        return added, removed
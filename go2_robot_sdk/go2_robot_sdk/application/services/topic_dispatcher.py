@@ -0,0 +1,86 @@
+# Copyright (c) 2024, RoboVerse community
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+Topic dispatch table for robot data channel messages.
+The transport asks `accepts(topic)` with a topic peeked from the raw
+message and drops the message unparsed when nothing handles that topic.
+"""
+
+import logging
+from collections import Counter
+from typing import Any, Callable, Dict
+
+logger = logging.getLogger(__name__)
+
+TopicHandler = Callable[[Dict[str, Any], str], None]
+
+
+class TopicDispatcher:
+    """Registry mapping topic to handler, with per-topic parsed/skipped counters"""
+
+    def __init__(self) -> None:
+        self._handlers: Dict[str, TopicHandler] = {}
+        self.parsed: Counter = Counter()
+        self.skipped: Counter = Counter()
+
+    def register(self, topic: str, handler: TopicHandler) -> None:
+        """
+        Register the handler of a topic.
+
+        Args:
+            topic: Data channel topic, e.g. rt/lf/lowstate
+            handler: Called with (message, robot_id) for each parsed message
+        """
+        self._handlers[topic] = handler
+
+    def unregister(self, topic: str) -> None:
+        """Remove the handler of a topic; its messages are skipped from now on"""
+        self._handlers.pop(topic, None)
+
+    @property
+    def topics(self) -> frozenset:
+        """Topics with a registered handler"""
+        return frozenset(self._handlers)
+
+    def accepts(self, topic: str) -> bool:
+        """
+        Decide whether a message must be parsed, before parsing it.
+
+        Args:
+            topic: Topic read from the raw message
+
+        Returns:
+            True if a handler is registered; otherwise the message is
+            counted as skipped and False is returned
+        """
+        if topic in self._handlers:
+            return True
+        self.skipped[topic] += 1
+        return False
+
+    def dispatch(self, msg: Dict[str, Any], robot_id: str) -> bool:
+        """
+        Route a parsed message to its handler.
+
+        Args:
+            msg: Decoded message
+            robot_id: Robot the message came from
+
+        Returns:
+            True if a handler was called
+        """
+        topic = msg.get("topic", "")
+        self.parsed[topic] += 1
+        handler = self._handlers.get(topic)
+        if handler is None:
+            return False
+        handler(msg, robot_id)
+        return True
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Return {topic: {"parsed": n, "skipped": n}}"""
+        return {
+            topic: {"parsed": self.parsed[topic], "skipped": self.skipped[topic]}
+            for topic in sorted(set(self.parsed) | set(self.skipped))
+        }
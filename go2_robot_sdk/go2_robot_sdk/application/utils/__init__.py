@@ -1,6 +1,10 @@
 """
 Application utilities - command generation and helper functions
 """
-from .command_generator import gen_command, gen_mov_command, generate_id
+from .command_generator import gen_command, gen_mov_command, generate_id, MoveCommandTemplate
+from .metrics import MetricsRegistry, Counter, Gauge, Histogram, get_metrics_registry
+from .tracing import Trace, StampTracer, robot_stamp
 
-__all__ = ['gen_command', 'gen_mov_command', 'generate_id'] 
\ No newline at end of file
+__all__ = ['gen_command', 'gen_mov_command', 'generate_id', 'MoveCommandTemplate',
+           'MetricsRegistry', 'Counter', 'Gauge', 'Histogram', 'get_metrics_registry',
+           'Trace', 'StampTracer', 'robot_stamp']
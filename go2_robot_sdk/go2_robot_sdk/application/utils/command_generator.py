@@ -124,4 +124,55 @@ def gen_mov_command(
             topic=SPORT_MODE_TOPIC,
         )
 
-    return json.dumps(command) 
\ No newline at end of file
+    return json.dumps(command)
+
+
+class MoveCommandTemplate:
+    """
+    Precompiled gen_mov_command.
+
+    The command is rendered once with sentinel values and turned into a
+    format string, so each call only formats the id and the velocities.
+    Output is identical to gen_mov_command for the same id.
+    """
+
+    _ID_SENTINEL = 987654321
+
+    def __init__(self, obstacle_avoidance: bool = False):
+        """
+        Args:
+            obstacle_avoidance: Build the obstacle avoidance move command
+        """
+        if obstacle_avoidance:
+            parameters = {"x": "__x__", "y": "__y__", "yaw": "__z__", "mode": 0}
+            api_id, topic = 1003, OBSTACLE_AVOIDANCE_TOPIC
+        else:
+            parameters = {"x": "__x__", "y": "__y__", "z": "__z__"}
+            api_id, topic = 1008, SPORT_MODE_TOPIC
+
+        rendered = json.dumps(create_command_structure(
+            api_id=api_id, parameter=parameters, topic=topic, command_id=self._ID_SENTINEL))
+        template = rendered.replace("{", "{{").replace("}", "}}")
+        template = template.replace(str(self._ID_SENTINEL), "{id}")
+        for name in ("x", "y", "z"):
+            # The parameter is a JSON string inside JSON, so its quotes are escaped
+            template = template.replace(f'\\"__{name}__\\"', "{" + name + "!r}")
+        self.template = template
+
+    def render(self, x: float, y: float, z: float, command_id: Optional[int] = None) -> str:
+        """
+        Render a movement command.
+
+        Args:
+            x: Forward/backward velocity, rounded to 2 decimals
+            y: Left/right velocity, rounded to 2 decimals
+            z: Rotation velocity, rounded to 2 decimals
+            command_id: Optional specific command ID
+
+        Returns:
+            JSON string of the movement command
+        """
+        return self.template.format(
+            id=command_id or generate_id(),
+            x=round(float(x), 2), y=round(float(y), 2), z=round(float(z), 2),
+        )
@@ -0,0 +1,201 @@
+# Copyright (c) 2024, RoboVerse community
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+Driver-wide performance metrics.
+
+Counters, gauges and fixed-bucket latency histograms, kept cheap enough
+for per-message hot paths: components look their series up once and then
+only add to plain attributes. Updates take no lock; under the GIL a rare
+lost increment between threads is acceptable for monitoring.
+
+The registry can be exported as Prometheus text and is published as
+diagnostic_msgs/DiagnosticArray by the driver node.
+"""
+
+import bisect
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Iterator, List, Sequence, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+# Seconds; 100 µs .. 1 s covers message handling up to point cloud publishing
+DEFAULT_LATENCY_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0
+)
+
+
+class Counter:
+    """Monotonically increasing value"""
+    kind = "counter"
+
+    def __init__(self) -> None:
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+
+class Gauge:
+    """Value that can go up and down"""
+    kind = "gauge"
+
+    def __init__(self) -> None:
+        self.value = 0.0
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+
+class Histogram:
+    """Latency histogram with fixed bucket upper bounds in seconds"""
+    kind = "histogram"
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS) -> None:
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)  # last slot: above the largest bucket
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+
+    @contextmanager
+    def time(self) -> Iterator[None]:
+        """Observe the duration of the with-block"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+    def quantile(self, q: float) -> float:
+        """Upper bucket bound containing quantile q; inf if above all buckets"""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            if cumulative >= target:
+                return bound
+        return float("inf")
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+
+Metric = Union[Counter, Gauge, Histogram]
+
+
+class MetricsRegistry:
+    """Named, labelled metric series"""
+
+    def __init__(self) -> None:
+        self._series: Dict[Tuple[str, Labels], Metric] = {}
+        self._help: Dict[str, str] = {}
+        self._collectors: List[Callable[["MetricsRegistry"], None]] = []
+        self._lock = threading.Lock()
+
+    def _get(self, factory: Callable[[], Metric], name: str, labels: Dict[str, str],
+             help_text: str) -> Metric:
+        key = (name, tuple(sorted((k, str(v)) for k, v in labels.items())))
+        metric = self._series.get(key)
+        if metric is None:
+            with self._lock:
+                metric = self._series.get(key)
+                if metric is None:
+                    metric = self._series[key] = factory()
+                    if help_text:
+                        self._help.setdefault(name, help_text)
+        return metric
+
+    def counter(self, name: str, help_text: str = "", **labels: str) -> Counter:
+        return self._get(Counter, name, labels, help_text)
+
+    def gauge(self, name: str, help_text: str = "", **labels: str) -> Gauge:
+        return self._get(Gauge, name, labels, help_text)
+
+    def histogram(self, name: str, help_text: str = "",
+                  buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS, **labels: str) -> Histogram:
+        return self._get(lambda: Histogram(buckets), name, labels, help_text)
+
+    def add_collector(self, collector: Callable[["MetricsRegistry"], None]) -> None:
+        """
+        Register a callback run before every snapshot.
+
+        Collectors copy statistics that components already keep (queue
+        drops, command latency, ...) into gauges, so those need no
+        instrumentation of their own.
+        """
+        self._collectors.append(collector)
+
+    def collect(self) -> List[Tuple[str, Labels, Metric]]:
+        """Run the collectors and return all series sorted by name and labels"""
+        for collector in list(self._collectors):
+            try:
+                collector(self)
+            except Exception as e:
+                logger.debug(f"Metrics collector failed: {e}")
+        with self._lock:
+            items = list(self._series.items())
+        items.sort(key=lambda item: item[0])
+        return [(name, labels, metric) for (name, labels), metric in items]
+
+    def to_prometheus(self) -> str:
+        """Render all series in the Prometheus text exposition format"""
+        lines: List[str] = []
+        described = set()
+        for name, labels, metric in self.collect():
+            if name not in described:
+                described.add(name)
+                if name in self._help:
+                    lines.append(f"# HELP {name} {self._help[name]}")
+                lines.append(f"# TYPE {name} {metric.kind}")
+            if isinstance(metric, Histogram):
+                cumulative = 0
+                for bound, count in zip(metric.buckets, metric.counts):
+                    cumulative += count
+                    lines.append(f"{name}_bucket{_labels(labels, le=repr(bound))} {cumulative}")
+                lines.append(f"{name}_bucket{_labels(labels, le='+Inf')} {metric.count}")
+                lines.append(f"{name}_sum{_labels(labels)} {metric.sum!r}")
+                lines.append(f"{name}_count{_labels(labels)} {metric.count}")
+            else:
+                lines.append(f"{name}{_labels(labels)} {metric.value!r}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str) -> None:
+        """Atomically write the Prometheus text to `path` (node_exporter textfile format)"""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(self.to_prometheus())
+        os.replace(tmp_path, path)
+
+
+def _labels(labels: Iterable[Tuple[str, str]], **extra: str) -> str:
+    pairs = list(labels) + list(extra.items())
+    if not pairs:
+        return ""
+    body = ",".join(f'{key}="{_escape(value)}"' for key, value in pairs)
+    return "{" + body + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+_registry = MetricsRegistry()
+
+
+def get_metrics_registry() -> MetricsRegistry:
+    """Process-wide metrics registry"""
+    return _registry
@@ -0,0 +1,191 @@
+# Copyright (c) 2024, RoboVerse community
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+End-to-end stamp tracing from the robot to the ROS publish.
+
+A Trace travels with a message (key "_trace") from the data channel
+callback to the publisher and collects perf_counter marks at each pipeline
+stage: receive, parse, decode (LiDAR pool only), dequeue (ingest stage),
+build (ROS message built) and publish.
+
+Robot stamps are on the robot's clock. ClockOffsetEstimator maps them to
+the local clock with the minimum of (arrival - robot stamp) over a sliding
+window, i.e. the least-delayed recent sample is taken as zero transport
+delay. Ages are therefore "time since the robot sampled, beyond the
+best-case link delay", which is robust to unsynchronized clocks.
+"""
+
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+
+class Trace:
+    """Stage marks of one message"""
+    __slots__ = ("received_wall", "marks")
+
+    def __init__(self) -> None:
+        self.received_wall = time.time()
+        self.marks: List[Tuple[str, float]] = [("receive", time.perf_counter())]
+
+    def mark(self, stage: str) -> None:
+        self.marks.append((stage, time.perf_counter()))
+
+    def stages(self) -> Dict[str, float]:
+        """Return {stage: seconds since the previous mark} plus "total" """
+        result = {}
+        for (_, previous), (stage, mark) in zip(self.marks, self.marks[1:]):
+            result[stage] = mark - previous
+        result["total"] = self.marks[-1][1] - self.marks[0][1]
+        return result
+
+
+def robot_stamp(msg: Dict[str, Any]) -> Optional[float]:
+    """
+    Read the robot-side stamp of a message in seconds.
+
+    Handles data.stamp and data.header.stamp, either as float seconds or
+    as {"sec", "nanosec"}; typed (msgspec) data objects are read the same
+    way through attributes.
+
+    Returns:
+        Stamp in seconds on the robot clock, or None if the message has none
+    """
+    data = msg.get("data")
+    stamp = _field(data, "stamp")
+    if stamp is None:
+        stamp = _field(_field(data, "header"), "stamp")
+    if stamp is None:
+        return None
+    if isinstance(stamp, (int, float)):
+        return float(stamp) if stamp > 0 else None
+    sec = _field(stamp, "sec")
+    nanosec = _field(stamp, "nanosec")
+    if isinstance(sec, (int, float)) and isinstance(nanosec, (int, float)):
+        return sec + nanosec * 1e-9
+    return None
+
+
+def _field(obj: Any, name: str) -> Any:
+    if isinstance(obj, dict):
+        return obj.get(name)
+    return getattr(obj, name, None)
+
+
+class ClockOffsetEstimator:
+    """Robot-to-local clock offset as the windowed minimum of arrival - stamp"""
+
+    def __init__(self, window: float = 10.0) -> None:
+        """
+        Args:
+            window: Seconds of samples the minimum is taken over; follows clock drift
+        """
+        self.window = window
+        # (arrival, offset) with increasing offsets: the front is the window minimum
+        self._samples: Deque[Tuple[float, float]] = deque()
+
+    def update(self, stamp: float, arrival: float) -> float:
+        """Add a sample and return the current offset"""
+        offset = arrival - stamp
+        samples = self._samples
+        while samples and samples[-1][1] >= offset:
+            samples.pop()
+        samples.append((arrival, offset))
+        while samples[0][0] < arrival - self.window:
+            samples.popleft()
+        return samples[0][1]
+
+    @property
+    def offset(self) -> Optional[float]:
+        return self._samples[0][1] if self._samples else None
+
+
+class RollingStats:
+    """Percentiles over the last `window` samples"""
+
+    def __init__(self, window: int = 512) -> None:
+        self.samples: Deque[float] = deque(maxlen=window)
+
+    def add(self, value: float) -> None:
+        self.samples.append(value)
+
+    def summary(self) -> Dict[str, float]:
+        """Return p50/p95/p99/max in milliseconds"""
+        if not self.samples:
+            return {}
+        ordered = sorted(self.samples)
+        last = len(ordered) - 1
+        return {
+            "p50_ms": ordered[last // 2] * 1e3,
+            "p95_ms": ordered[int(last * 0.95)] * 1e3,
+            "p99_ms": ordered[int(last * 0.99)] * 1e3,
+            "max_ms": ordered[last] * 1e3,
+        }
+
+
+class StampTracer:
+    """Per-topic message age and stage timings"""
+
+    def __init__(self, window: int = 512, offset_window: float = 10.0) -> None:
+        """
+        Args:
+            window: Samples kept per statistic
+            offset_window: Clock offset estimation window in seconds
+        """
+        self.window = window
+        self.offset_window = offset_window
+        self._offsets: Dict[str, ClockOffsetEstimator] = {}
+        self._stats: Dict[Tuple[str, str], RollingStats] = {}
+
+    def local_stamp(self, robot_id: str, stamp: float, arrival: float) -> float:
+        """
+        Map a robot stamp to the local wall clock.
+
+        Args:
+            robot_id: Robot whose clock the stamp is on
+            stamp: Robot stamp in seconds
+            arrival: Local wall time the message arrived
+
+        Returns:
+            Offset-corrected stamp in local wall-clock seconds
+        """
+        estimator = self._offsets.get(robot_id)
+        if estimator is None:
+            estimator = self._offsets[robot_id] = ClockOffsetEstimator(self.offset_window)
+        return stamp + estimator.update(stamp, arrival)
+
+    def record(self, topic: str, trace: Trace, local_stamp: Optional[float] = None) -> None:
+        """
+        Record a published message.
+
+        Args:
+            topic: Robot topic of the message
+            trace: The message's trace, marked up to "publish"
+            local_stamp: Offset-corrected robot stamp, if the message had one
+        """
+        for stage, seconds in trace.stages().items():
+            self._stat(topic, stage).add(seconds)
+        if local_stamp is not None:
+            self._stat(topic, "age").add(time.time() - local_stamp)
+
+    def _stat(self, topic: str, name: str) -> RollingStats:
+        stats = self._stats.get((topic, name))
+        if stats is None:
+            stats = self._stats[(topic, name)] = RollingStats(self.window)
+        return stats
+
+    def summary(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """Return {topic: {stage or "age": {"p50_ms", "p95_ms", "p99_ms", "max_ms"}}}"""
+        result: Dict[str, Dict[str, Dict[str, float]]] = {}
+        for (topic, name), stats in sorted(list(self._stats.items())):
+            result.setdefault(topic, {})[name] = stats.summary()
+        return result
+
+    def offsets(self) -> Dict[str, float]:
+        """Current robot-to-local clock offset per robot in seconds"""
+        return {
+            robot_id: estimator.offset
+            for robot_id, estimator in self._offsets.items()
+            if estimator.offset is not None
+        }
@@ -1,7 +1,7 @@
 # Copyright (c) 2024, RoboVerse community
 # SPDX-License-Identifier: BSD-3-Clause
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import List
 
 
@@ -16,13 +16,71 @@ class RobotConfig:
     publish_raw_voxel: bool
     obstacle_avoidance: bool
     conn_mode: str  # 'single' or 'multi'
+    lidar_decoder: str = "wasm"  # 'wasm' or 'native'
+    lidar_decode_workers: int = 2  # 0 decodes inline on the event loop
+    lidar_keyframe_interval: int = 1  # full point cloud every N lidar frames
+    # Topics always subscribed; 'all' for every topic
+    robot_topics: List[str] = field(default_factory=list)
+    subscription_check_period: float = 2.0  # seconds between subscription re-evaluations
+    lowstate_max_rate: float = 50.0  # Hz cap for lowstate processing, 0 = unlimited
+    ingest_queue_size: int = 10  # per-topic queue bound for topics without a coalescing policy
+    cmd_vel_rate: float = 20.0  # Hz at which the latest cmd_vel is sent to the robot
+    cmd_vel_timeout: float = 0.5  # seconds without cmd_vel before the robot is stopped
+    robot_index: int = -1  # handle only this robot of robot_ip_list (worker process); -1 = all
+    metrics_period: float = 5.0  # seconds between /diagnostics metrics, 0 = off
+    metrics_prometheus_file: str = ""  # Prometheus text file written with the metrics, '' = off
+    trace_stamps: bool = False  # record per-topic message age and pipeline stage timings
+    use_robot_stamp: bool = False  # stamp headers with the offset-corrected robot stamp
+    executor: str = "thread"  # 'thread', 'asyncio' or 'multi', see infrastructure/ros2/executors
+    executor_threads: int = 0  # MultiThreadedExecutor threads, 0 = rclpy default
+    camera_shm: bool = False  # also write camera frames into a shared-memory ring
+    camera_shm_slots: int = 4  # frame slots of the shared-memory ring
+    video_max_fps: float = 0.0  # camera output frame rate cap, 0 = every decoded frame
+    video_scale: float = 1.0  # camera output size factor
+    # 'bgr8' or 'i420' (decoder-native YUV for the frame ring and JPEG; image_raw stays bgr8)
+    video_format: str = "bgr8"
+    publish_compressed: bool = False  # also publish JPEG camera/image_raw/compressed
+    jpeg_quality: int = 80  # JPEG quality 1-100
+    jpeg_max_fps: float = 10.0  # JPEG frames per second, 0 = every published frame
+    jpeg_workers: int = 2  # JPEG encoder threads
+    video_passthrough: bool = False  # publish H.264 as received; decode only for raw image demand
+    heartbeat_period: float = 1.0  # seconds between driver_heartbeat messages, 0 = off
+
+    @property
+    def robot_ids(self) -> List[str]:
+        """IDs of the robots handled by this process"""
+        if self.robot_index >= 0:
+            return [str(self.robot_index)]
+        return [str(i) for i in range(len(self.robot_ip_list))]
 
     @classmethod
-    def from_params(cls, robot_ip: str, token: str, conn_type: str, 
-                   enable_video: bool, decode_lidar: bool, 
-                   publish_raw_voxel: bool, obstacle_avoidance: bool):
+    def from_params(cls, robot_ip: str, token: str, conn_type: str,
+                    enable_video: bool, decode_lidar: bool,
+                    publish_raw_voxel: bool, obstacle_avoidance: bool,
+                    lidar_decoder: str = "wasm", lidar_decode_workers: int = 2,
+                    lidar_keyframe_interval: int = 1, robot_topics: str = "",
+                    subscription_check_period: float = 2.0, lowstate_max_rate: float = 50.0,
+                    ingest_queue_size: int = 10, cmd_vel_rate: float = 20.0,
+                    cmd_vel_timeout: float = 0.5, robot_index: int = -1,
+                    metrics_period: float = 5.0, metrics_prometheus_file: str = "",
+                    trace_stamps: bool = False, use_robot_stamp: bool = False,
+                    executor: str = "thread", executor_threads: int = 0,
+                    camera_shm: bool = False,
+                    camera_shm_slots: int = 4, video_max_fps: float = 0.0,
+                    video_scale: float = 1.0, video_format: str = "bgr8",
+                    publish_compressed: bool = False, jpeg_quality: int = 80,
+                    jpeg_max_fps: float = 10.0, jpeg_workers: int = 2,
+                    video_passthrough: bool = False, heartbeat_period: float = 1.0):
         """Создание конфигурации из параметров"""
         robot_ip_list = robot_ip.replace(" ", "").split(",")
+        if robot_index >= len(robot_ip_list):
+            raise ValueError(
+                f"robot_index {robot_index} out of range for {len(robot_ip_list)} robots")
+        if executor not in ("thread", "asyncio", "multi"):
+            raise ValueError(f"executor must be 'thread', 'asyncio' or 'multi', got '{executor}'")
+        if video_format not in ("bgr8", "i420"):
+            raise ValueError(f"video_format must be 'bgr8' or 'i420', got '{video_format}'")
+        robot_topic_list = [t.strip() for t in robot_topics.split(",") if t.strip()]
         conn_mode = "single" if (
             len(robot_ip_list) == 1 and conn_type != "cyclonedds") else "multi"
         
@@ -34,5 +92,32 @@ class RobotConfig:
             decode_lidar=decode_lidar,
             publish_raw_voxel=publish_raw_voxel,
             obstacle_avoidance=obstacle_avoidance,
-            conn_mode=conn_mode
+            conn_mode=conn_mode,
+            lidar_decoder=lidar_decoder,
+            lidar_decode_workers=lidar_decode_workers,
+            lidar_keyframe_interval=lidar_keyframe_interval,
+            robot_topics=robot_topic_list,
+            subscription_check_period=subscription_check_period,
+            lowstate_max_rate=lowstate_max_rate,
+            ingest_queue_size=ingest_queue_size,
+            cmd_vel_rate=cmd_vel_rate,
+            cmd_vel_timeout=cmd_vel_timeout,
+            robot_index=robot_index,
+            metrics_period=metrics_period,
+            metrics_prometheus_file=metrics_prometheus_file,
+            trace_stamps=trace_stamps,
+            use_robot_stamp=use_robot_stamp,
+            executor=executor,
+            executor_threads=executor_threads,
+            camera_shm=camera_shm,
+            camera_shm_slots=camera_shm_slots,
+            video_max_fps=video_max_fps,
+            video_scale=video_scale,
+            video_format=video_format,
+            publish_compressed=publish_compressed,
+            jpeg_quality=jpeg_quality,
+            jpeg_max_fps=jpeg_max_fps,
+            jpeg_workers=jpeg_workers,
+            video_passthrough=video_passthrough,
+            heartbeat_period=heartbeat_period
         ) 
\ No newline at end of file
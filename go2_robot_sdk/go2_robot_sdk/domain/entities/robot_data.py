@@ -2,7 +2,7 @@
 # SPDX-License-Identifier: BSD-3-Clause
 
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Union
 import numpy as np
 
 
@@ -54,7 +54,8 @@ class LidarData:
     stamp: float
     width: Optional[List[int]] = None
     src_size: Optional[int] = None
-    compressed_data: Optional[bytes] = None
+    compressed_data: Optional[Union[bytes, memoryview]] = None  # view into the received frame
+    unchanged: bool = False  # payload identical to the previous frame
 
 
 @dataclass
@@ -70,10 +71,11 @@ class CameraData:
 class RobotData:
     """Aggregated robot data container"""
     robot_id: str
-    timestamp: float
+    timestamp: float  # offset-corrected robot stamp on the local wall clock, 0.0 if unknown
     robot_state: Optional[RobotState] = None
     imu_data: Optional[IMUData] = None
     odometry_data: Optional[OdometryData] = None
     joint_data: Optional[JointData] = None
     lidar_data: Optional[LidarData] = None
-    camera_data: Optional[CameraData] = None 
\ No newline at end of file
+    camera_data: Optional[CameraData] = None
+    trace: Optional[Any] = None  # application.utils.tracing.Trace when stamp tracing is on
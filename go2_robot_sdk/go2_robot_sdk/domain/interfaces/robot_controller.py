@@ -23,6 +23,7 @@ class IRobotController(ABC):
         pass
 
     @abstractmethod
-    def send_webrtc_request(self, robot_id: str, api_id: int, parameter: str, topic: str) -> None:
-        """Send WebRTC request"""
+    def send_webrtc_request(self, robot_id: str, api_id: int, parameter: str, topic: str,
+                            priority: int = 0) -> None:
+        """Send WebRTC request; higher priority requests are sent first"""
         pass 
\ No newline at end of file
@@ -0,0 +1,6 @@
+"""
+Infrastructure processes - driver worker processes for per-robot sharding
+"""
+from .worker_process import WorkerProcess, worker_ros_args
+
+__all__ = ['WorkerProcess', 'worker_ros_args']
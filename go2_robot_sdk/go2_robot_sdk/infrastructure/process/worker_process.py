@@ -0,0 +1,172 @@
+# Copyright (c) 2024, RoboVerse community
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+Driver worker processes for process-per-robot sharding.
+Each worker is a regular go2_driver_node process restricted to one robot
+with the robot_index parameter, so aiortc, LiDAR decoding, video and ROS
+publishing of different robots no longer share one GIL. Topic names stay
+robot{i}/... because the worker still sees the full robot_ip list.
+
+Exit is not the only failure: a worker whose event loop is blocked keeps
+running but stops publishing driver_heartbeat. With a heartbeat timeout,
+such a worker is killed and restarted like one that exited.
+"""
+
+import logging
+import signal
+import subprocess
+import sys
+import time
+from typing import List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+WORKER_MODULE = "go2_robot_sdk.main"
+
+
+def worker_ros_args(ros_args: Sequence[str], robot_index: int,
+                    node_name: str = "go2_driver_node") -> List[str]:
+    """
+    Build the --ros-args of one worker from the supervisor's own.
+
+    The supervisor's node name remap is replaced with a per-robot node
+    name; parameters, parameter files and other remaps are kept.
+
+    Args:
+        ros_args: Supervisor command line arguments
+        robot_index: Robot handled by the worker
+        node_name: Base name of the worker nodes
+
+    Returns:
+        Arguments starting with --ros-args
+    """
+    forwarded: List[str] = []
+    args = list(ros_args)
+    in_ros_args = False
+    i = 0
+    while i < len(args):
+        arg = args[i]
+        if arg == "--ros-args":
+            in_ros_args = True
+        elif arg == "--":
+            in_ros_args = False
+        elif in_ros_args:
+            node_remap = i + 1 < len(args) and args[i + 1].startswith("__node:=")
+            if arg in ("-r", "--remap") and node_remap:
+                i += 2
+                continue
+            forwarded.append(arg)
+        i += 1
+    return [
+        "--ros-args", *forwarded,
+        "-r", f"__node:={node_name}_{robot_index}",
+        "-p", f"robot_index:={robot_index}",
+    ]
+
+
+class WorkerProcess:
+    """One supervised driver worker with restart backoff"""
+
+    def __init__(self, robot_index: int, args: Sequence[str], initial_backoff: float = 1.0,
+                 max_backoff: float = 30.0, stable_after: float = 30.0,
+                 heartbeat_timeout: float = 0.0, startup_timeout: float = 30.0) -> None:
+        """
+        Initialize the worker.
+
+        Args:
+            robot_index: Robot handled by the worker
+            args: Worker command line arguments (see worker_ros_args)
+            initial_backoff: Restart delay after the first crash in seconds
+            max_backoff: Upper bound of the restart delay in seconds
+            stable_after: Uptime after which the restart delay is reset
+            heartbeat_timeout: Seconds without a heartbeat after which a running
+                worker is killed, 0 = only exits are detected
+            startup_timeout: Seconds a new worker may take to send its first heartbeat
+        """
+        self.robot_index = robot_index
+        self.command = [sys.executable, "-m", WORKER_MODULE, *args]
+        self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
+        self.stable_after = stable_after
+        self.heartbeat_timeout = heartbeat_timeout
+        self.startup_timeout = startup_timeout
+
+        self.process: Optional[subprocess.Popen] = None
+        self.started_at = 0.0
+        self.restart_at = 0.0
+        self.backoff = initial_backoff
+        self.restarts = 0
+        self.hangs = 0
+        self.last_exit_code: Optional[int] = None
+        self.last_heartbeat: Optional[float] = None
+
+    @property
+    def alive(self) -> bool:
+        return self.process is not None and self.process.poll() is None
+
+    @property
+    def pid(self) -> Optional[int]:
+        return self.process.pid if self.process is not None else None
+
+    def start(self) -> None:
+        """Spawn the worker process"""
+        self.process = subprocess.Popen(self.command)
+        self.started_at = time.monotonic()
+        self.last_heartbeat = None
+        logger.info(f"Started worker for robot {self.robot_index} (pid {self.process.pid})")
+
+    def heartbeat(self, now: Optional[float] = None) -> None:
+        """Record a heartbeat of the running worker"""
+        self.last_heartbeat = time.monotonic() if now is None else now
+
+    def stale(self, now: float) -> bool:
+        """True if the running worker missed its heartbeat deadline"""
+        if self.heartbeat_timeout <= 0:
+            return False
+        if self.last_heartbeat is None:
+            return now - self.started_at > self.startup_timeout
+        return now - self.last_heartbeat > self.heartbeat_timeout
+
+    def check(self, now: Optional[float] = None) -> None:
+        """Restart the worker if it exited or hung and its backoff has elapsed"""
+        now = time.monotonic() if now is None else now
+        if self.alive:
+            if not self.stale(now):
+                return
+            # Blocked, not exiting: SIGINT would not be handled either
+            since = self.started_at if self.last_heartbeat is None else self.last_heartbeat
+            logger.warning(
+                f"Worker for robot {self.robot_index} sent no heartbeat for "
+                f"{now - since:.1f}s, killing it")
+            self.hangs += 1
+            self.process.kill()
+            self.process.wait()
+        if self.process is not None:
+            # Newly observed exit: schedule the restart
+            self.last_exit_code = self.process.returncode
+            uptime = now - self.started_at
+            if uptime >= self.stable_after:
+                self.backoff = self.initial_backoff
+            self.restart_at = now + self.backoff
+            logger.warning(
+                f"Worker for robot {self.robot_index} exited with code {self.last_exit_code} "
+                f"after {uptime:.1f}s, restarting in {self.backoff:.1f}s")
+            self.backoff = min(self.max_backoff, self.backoff * 2)
+            self.process = None
+        if now >= self.restart_at:
+            self.restarts += 1
+            self.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop the worker: SIGINT first, SIGKILL if it does not exit in time"""
+        process, self.process = self.process, None
+        if process is None or process.poll() is not None:
+            return
+        process.send_signal(signal.SIGINT)
+        try:
+            process.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            logger.warning(f"Worker for robot {self.robot_index} did not stop, killing it")
+            process.kill()
+            process.wait()
@@ -1,6 +1,9 @@
 """
 ROS2 infrastructure adapters
 """
-from .ros2_publisher import ROS2Publisher
+from .ros2_publisher import ROS2Publisher, VideoPacket
+from .metrics_publisher import MetricsPublisher
+from .executors import EXECUTOR_MODES, create_executor, spin_node
 
-__all__ = ['ROS2Publisher'] 
\ No newline at end of file
+__all__ = ['ROS2Publisher', 'VideoPacket', 'MetricsPublisher',
+           'EXECUTOR_MODES', 'create_executor', 'spin_node']
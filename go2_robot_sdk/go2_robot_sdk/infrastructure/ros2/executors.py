@@ -0,0 +1,162 @@
+# Copyright (c) 2024, RoboVerse community
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+Ways of running the rclpy executor next to the asyncio event loop.
+
+- thread:  SingleThreadedExecutor in a daemon thread (the original layout).
+           ROS callbacks hand work to the loop across threads.
+- asyncio: ROS callbacks run on the event loop, so ROS callbacks, aiortc
+           callbacks and data channel sends all run on one thread and no
+           cross-thread handoff is needed. A helper thread blocks in the
+           executor's wait set and hands each ready callback to the loop
+           with call_soon_threadsafe: an idle driver does not wake up, and a
+           callback runs as soon as the loop gets to it.
+- multi:   MultiThreadedExecutor; the driver node puts its callbacks in
+           explicit callback groups so commands are never queued behind
+           sensor or timer callbacks.
+"""
+
+import asyncio
+import logging
+import threading
+from typing import Optional
+
+import rclpy
+from rclpy.executors import (
+    Executor, MultiThreadedExecutor, ShutdownException, SingleThreadedExecutor, TimeoutException
+)
+from rclpy.node import Node
+
+logger = logging.getLogger(__name__)
+
+EXECUTOR_MODES = ("thread", "asyncio", "multi")
+
+
+def create_executor(mode: str, num_threads: int = 0) -> Executor:
+    """
+    Create the executor of an executor mode.
+
+    Args:
+        mode: One of EXECUTOR_MODES
+        num_threads: Worker threads of the multi mode, 0 = rclpy default
+
+    Returns:
+        The executor
+    """
+    if mode not in EXECUTOR_MODES:
+        raise ValueError(f"Unknown executor mode '{mode}', expected one of {EXECUTOR_MODES}")
+    if mode == "multi":
+        return MultiThreadedExecutor(num_threads=num_threads or None)
+    return SingleThreadedExecutor()
+
+
+async def spin_in_thread(executor: Executor) -> None:
+    """Spin the executor in a daemon thread until rclpy shuts down"""
+    def spin_thread():
+        try:
+            executor.spin()
+        except Exception as e:
+            logger.error(f"Error in ROS2 spin: {e}")
+        finally:
+            executor.shutdown()
+
+    thread = threading.Thread(target=spin_thread, daemon=True)
+    thread.start()
+
+    try:
+        while rclpy.ok():
+            await asyncio.sleep(0.1)
+    finally:
+        thread.join(timeout=1.0)
+
+
+class _LoopSpinner:
+    """Runs an executor's ready callbacks on an event loop, woken by a wait thread"""
+
+    def __init__(self, executor: Executor, loop: asyncio.AbstractEventLoop,
+                 wait_timeout: float) -> None:
+        self.executor = executor
+        self.loop = loop
+        self.wait_timeout = wait_timeout
+        self.finished = loop.create_future()
+        self.stopped = threading.Event()
+
+    async def spin(self) -> None:
+        thread = threading.Thread(target=self._wait, name="ros-wait", daemon=True)
+        thread.start()
+        try:
+            await self.finished
+        finally:
+            self.stopped.set()
+            await self.loop.run_in_executor(None, thread.join, 2 * self.wait_timeout)
+
+    def _wait(self) -> None:
+        """Wait thread: block until callbacks are ready and hand them to the loop"""
+        error = None
+        try:
+            while rclpy.ok() and not self.stopped.is_set():
+                try:
+                    handler, _, _ = self.executor.wait_for_ready_callbacks(
+                        timeout_sec=self.wait_timeout)
+                except TimeoutException:
+                    continue
+                self.loop.call_soon_threadsafe(self._run, handler)
+        except ShutdownException:
+            pass
+        except Exception as e:
+            error = e
+        try:
+            self.loop.call_soon_threadsafe(self._finish, error)
+        except RuntimeError:
+            pass  # the loop is already closed
+
+    def _run(self, handler) -> None:
+        # The entity is not waited on again until its handler has run
+        handler()
+        if handler.exception() is not None:
+            self._finish(handler.exception())
+
+    def _finish(self, error: Optional[BaseException] = None) -> None:
+        if self.finished.done():
+            return
+        if error is not None:
+            self.finished.set_exception(error)
+        else:
+            self.finished.set_result(None)
+
+
+async def spin_on_loop(executor: Executor, wait_timeout: float = 0.5) -> None:
+    """
+    Run the executor's callbacks on the running event loop until rclpy shuts down.
+
+    Args:
+        executor: A single-threaded executor
+        wait_timeout: Seconds the wait thread blocks before re-checking for shutdown
+    """
+    try:
+        await _LoopSpinner(executor, asyncio.get_running_loop(), wait_timeout).spin()
+    except Exception as e:
+        logger.error(f"Error in ROS2 spin: {e}")
+    finally:
+        executor.shutdown()
+
+
+async def spin_node(node: Node, mode: str = "thread", num_threads: int = 0,
+                    executor: Optional[Executor] = None) -> None:
+    """
+    Run a node's callbacks until rclpy shuts down.
+
+    Args:
+        node: Node to spin
+        mode: One of EXECUTOR_MODES
+        num_threads: Worker threads of the multi mode, 0 = rclpy default
+        executor: Executor to use instead of creating one for the mode
+    """
+    executor = executor or create_executor(mode, num_threads)
+    executor.add_node(node)
+    logger.info(f"Spinning {node.get_name()} with executor mode '{mode}'")
+    if mode == "asyncio":
+        await spin_on_loop(executor)
+    else:
+        await spin_in_thread(executor)
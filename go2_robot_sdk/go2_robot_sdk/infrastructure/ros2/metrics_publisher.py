@@ -0,0 +1,83 @@
+# Copyright (c) 2024, RoboVerse community
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+Publishes the metrics registry as diagnostic_msgs/DiagnosticArray and,
+optionally, as a Prometheus text file.
+"""
+
+import logging
+import time
+from typing import Dict, List, Tuple
+
+from rclpy.node import Node
+from diagnostic_msgs.msg import DiagnosticArray, DiagnosticStatus, KeyValue
+
+from ...application.utils.metrics import Counter, Histogram, Labels, MetricsRegistry
+
+logger = logging.getLogger(__name__)
+
+
+class MetricsPublisher:
+    """Periodic export of a MetricsRegistry"""
+
+    def __init__(self, node: Node, registry: MetricsRegistry, topic: str = '/diagnostics',
+                 prometheus_file: str = '') -> None:
+        """
+        Initialize the metrics publisher.
+
+        Args:
+            node: Node that owns the publisher
+            registry: Metrics to export
+            topic: DiagnosticArray topic
+            prometheus_file: Prometheus text file path, '' to disable
+        """
+        self.node = node
+        self.registry = registry
+        self.prometheus_file = prometheus_file
+        self.publisher = node.create_publisher(DiagnosticArray, topic, 10)
+        # Previous counter values, for per-second rates
+        self._previous: Dict[Tuple[str, Labels], float] = {}
+        self._previous_time = time.monotonic()
+
+    def publish(self) -> None:
+        """Publish one DiagnosticArray (one status per metric) and write the text file"""
+        now = time.monotonic()
+        elapsed = max(now - self._previous_time, 1e-9)
+        self._previous_time = now
+
+        statuses: Dict[str, List[KeyValue]] = {}
+        for name, labels, metric in self.registry.collect():
+            key = ",".join(f"{k}={v}" for k, v in labels) or "value"
+            if isinstance(metric, Histogram):
+                value = (
+                    f"n={metric.count} mean={metric.mean * 1e3:.3f}ms "
+                    f"p50<={metric.quantile(0.5) * 1e3:g}ms "
+                    f"p95<={metric.quantile(0.95) * 1e3:g}ms "
+                    f"p99<={metric.quantile(0.99) * 1e3:g}ms"
+                )
+            elif isinstance(metric, Counter):
+                previous = self._previous.get((name, labels), 0.0)
+                self._previous[(name, labels)] = metric.value
+                value = f"{metric.value:.0f} ({(metric.value - previous) / elapsed:.1f}/s)"
+            else:
+                value = f"{metric.value:g}"
+            statuses.setdefault(name, []).append(KeyValue(key=key, value=value))
+
+        array = DiagnosticArray()
+        array.header.stamp = self.node.get_clock().now().to_msg()
+        for name, values in statuses.items():
+            status = DiagnosticStatus()
+            status.level = DiagnosticStatus.OK
+            status.name = f"{self.node.get_name()}: {name}"
+            status.hardware_id = self.node.get_name()
+            status.message = f"{len(values)} series"
+            status.values = values
+            array.status.append(status)
+        self.publisher.publish(array)
+
+        if self.prometheus_file:
+            try:
+                self.registry.write_prometheus(self.prometheus_file)
+            except OSError as e:
+                logger.warning(f"Failed to write {self.prometheus_file}: {e}")
@@ -2,27 +2,61 @@
 # Copyright (c) 2024, RoboVerse community
 # SPDX-License-Identifier: BSD-3-Clause
 
+import array
+import functools
 import logging
+import time
+from typing import Dict, Tuple
+
+import cv2
+import numpy as np
 
 from rclpy.node import Node
 from tf2_ros import TransformBroadcaster
 from geometry_msgs.msg import TransformStamped
 from go2_interfaces.msg import Go2State, IMU
 from go2_interfaces.msg import VoxelMapCompressed
-from sensor_msgs.msg import PointCloud2, PointField, JointState
-from sensor_msgs_py import point_cloud2
+from sensor_msgs.msg import PointCloud2, JointState, Image, CameraInfo, CompressedImage
 from std_msgs.msg import Header
+from builtin_interfaces.msg import Time
 from nav_msgs.msg import Odometry
 from cv_bridge import CvBridge
+from go2_common.frame_ring import FrameRingError, FrameRingWriter
+from go2_common.point_cloud_builder import PointCloud2Builder
 
 from ...domain.interfaces import IRobotDataPublisher
-from ...domain.entities import RobotData, RobotConfig
+from ...domain.entities import RobotData, RobotConfig, CameraData
 from ..sensors.lidar_decoder import update_meshes_for_cloud2
-from ..sensors.camera_config import load_camera_info
+from ..sensors.voxel_delta import VoxelDelta, VoxelDeltaEngine
+from ..sensors.camera_config import load_camera_info, scale_camera_info
+from ..sensors.jpeg_encoder import JpegEncodePool
+from ...application.utils.metrics import Histogram, get_metrics_registry
+
+try:
+    from foxglove_msgs.msg import CompressedVideo
+except ImportError:
+    CompressedVideo = None
+
+# Message type of the H.264 passthrough topic
+VideoPacket = CompressedVideo if CompressedVideo is not None else CompressedImage
 
 logger = logging.getLogger(__name__)
 
 
+def _timed(kind: str):
+    """Record the duration of a publish_* method in go2_publish_seconds{kind=...}"""
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, robot_data: RobotData) -> None:
+            start = time.perf_counter()
+            try:
+                return method(self, robot_data)
+            finally:
+                self._publish_time(kind).observe(time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+
 class ROS2Publisher(IRobotDataPublisher):
     """ROS2 adapter for publishing robot data"""
 
@@ -33,28 +67,62 @@ class ROS2Publisher(IRobotDataPublisher):
         self.broadcaster = broadcaster
         self.bridge = CvBridge()
         self.camera_info = load_camera_info()
-
+        self._scaled_camera_info: Dict[Tuple[int, int], CameraInfo] = {}
+        # Per-robot voxel delta state and last full cloud message
+        self.delta_engines: Dict[str, VoxelDeltaEngine] = {}
+        self._last_cloud: Dict[str, PointCloud2] = {}
+        self.cloud_builder = PointCloud2Builder(('x', 'y', 'z', 'intensity'))
+        # Delta clouds add a 'delta' field: 1 added, -1 removed, 0 keyframe point
+        self.delta_builder = PointCloud2Builder(('x', 'y', 'z', 'intensity', 'delta'))
+        self.metrics = get_metrics_registry()
+        self._publish_times: Dict[str, Histogram] = {}
+        # Shared-memory camera frame rings per robot, created on the first frame
+        self.frame_rings: Dict[str, FrameRingWriter] = {}
+        self.jpeg_pool = JpegEncodePool(
+            workers=config.jpeg_workers, quality=config.jpeg_quality,
+            max_fps=config.jpeg_max_fps) if config.publish_compressed else None
+
+    def _header_stamp(self, robot_data: RobotData) -> Time:
+        """Offset-corrected robot stamp when use_robot_stamp is set and known, else now"""
+        if self.config.use_robot_stamp and robot_data.timestamp > 0:
+            sec = int(robot_data.timestamp)
+            return Time(sec=sec, nanosec=int((robot_data.timestamp - sec) * 1e9))
+        return self.node.get_clock().now().to_msg()
+
+    @staticmethod
+    def _mark_built(robot_data: RobotData) -> None:
+        if robot_data.trace is not None:
+            robot_data.trace.mark("build")
+
+    def _publish_time(self, kind: str) -> Histogram:
+        histogram = self._publish_times.get(kind)
+        if histogram is None:
+            histogram = self._publish_times[kind] = self.metrics.histogram(
+                "go2_publish_seconds", "ROS message build and publish time", kind=kind)
+        return histogram
+
+    @_timed('odometry')
     def publish_odometry(self, robot_data: RobotData) -> None:
         """Publish odometry data"""
         if not robot_data.odometry_data:
             return
 
         try:
-            robot_idx = int(robot_data.robot_id)
+            robot_id = robot_data.robot_id
             
             # Publish transform
-            self._publish_transform(robot_data, robot_idx)
+            self._publish_transform(robot_data, robot_id)
             
             # Publish odometry topic
-            self._publish_odometry_topic(robot_data, robot_idx)
+            self._publish_odometry_topic(robot_data, robot_id)
             
         except Exception as e:
             logger.error(f"Error publishing odometry: {e}")
 
-    def _publish_transform(self, robot_data: RobotData, robot_idx: int) -> None:
+    def _publish_transform(self, robot_data: RobotData, robot_id: str) -> None:
         """Publish TF transform"""
         odom_trans = TransformStamped()
-        odom_trans.header.stamp = self.node.get_clock().now().to_msg()
+        odom_trans.header.stamp = self._header_stamp(robot_data)
         odom_trans.header.frame_id = 'odom'
 
         if self.config.conn_mode == 'single':
@@ -76,10 +144,10 @@ class ROS2Publisher(IRobotDataPublisher):
 
         self.broadcaster.sendTransform(odom_trans)
 
-    def _publish_odometry_topic(self, robot_data: RobotData, robot_idx: int) -> None:
+    def _publish_odometry_topic(self, robot_data: RobotData, robot_id: str) -> None:
         """Publish Odometry topic"""
         odom_msg = Odometry()
-        odom_msg.header.stamp = self.node.get_clock().now().to_msg()
+        odom_msg.header.stamp = self._header_stamp(robot_data)
         odom_msg.header.frame_id = 'odom'
 
         if self.config.conn_mode == 'single':
@@ -99,17 +167,19 @@ class ROS2Publisher(IRobotDataPublisher):
         odom_msg.pose.pose.orientation.z = float(orientation['z'])
         odom_msg.pose.pose.orientation.w = float(orientation['w'])
 
-        self.publishers['odometry'][robot_idx].publish(odom_msg)
+        self._mark_built(robot_data)
+        self.publishers['odometry'][robot_id].publish(odom_msg)
 
+    @_timed('joint_state')
     def publish_joint_state(self, robot_data: RobotData) -> None:
         """Publish joint state data"""
         if not robot_data.joint_data:
             return
 
         try:
-            robot_idx = int(robot_data.robot_id)
+            robot_id = robot_data.robot_id
             joint_state = JointState()
-            joint_state.header.stamp = self.node.get_clock().now().to_msg()
+            joint_state.header.stamp = self._header_stamp(robot_data)
 
             # Define joint names
             if self.config.conn_mode == 'single':
@@ -135,18 +205,20 @@ class ROS2Publisher(IRobotDataPublisher):
                 motor_state[6]['q'], motor_state[7]['q'], motor_state[8]['q'],  # RR leg
             ]
 
-            self.publishers['joint_state'][robot_idx].publish(joint_state)
+            self._mark_built(robot_data)
+            self.publishers['joint_state'][robot_id].publish(joint_state)
 
         except Exception as e:
             logger.error(f"Error publishing joint state: {e}")
 
+    @_timed('robot_state')
     def publish_robot_state(self, robot_data: RobotData) -> None:
         """Publish robot state and IMU data"""
         if not robot_data.robot_state:
             return
 
         try:
-            robot_idx = int(robot_data.robot_id)
+            robot_id = robot_data.robot_id
 
             # Publish Go2State
             go2_state = Go2State()
@@ -162,7 +234,8 @@ class ROS2Publisher(IRobotDataPublisher):
             go2_state.foot_position_body = list(map(float, state.foot_position_body))
             go2_state.foot_speed_body = list(map(float, state.foot_speed_body))
             
-            self.publishers['robot_state'][robot_idx].publish(go2_state)
+            self._mark_built(robot_data)
+            self.publishers['robot_state'][robot_id].publish(go2_state)
 
             # Publish IMU
             if robot_data.imu_data:
@@ -174,83 +247,233 @@ class ROS2Publisher(IRobotDataPublisher):
                 imu.rpy = list(map(float, imu_data.rpy))
                 imu.temperature = imu_data.temperature
                 
-                self.publishers['imu'][robot_idx].publish(imu)
+                self.publishers['imu'][robot_id].publish(imu)
 
         except Exception as e:
             logger.error(f"Error publishing robot state: {e}")
 
+    @_timed('lidar')
     def publish_lidar_data(self, robot_data: RobotData) -> None:
-        """Publish lidar data"""
+        """
+        Publish lidar data.
+
+        The full cloud goes out on keyframes (every `lidar_keyframe_interval`
+        frames); while the delta topic has subscribers, every frame publishes
+        the added/removed voxels there. Byte-identical payloads reuse the
+        previous cloud.
+        """
         if not robot_data.lidar_data or not self.config.decode_lidar:
             return
 
         try:
-            robot_idx = int(robot_data.robot_id)
+            robot_id = robot_data.robot_id
             lidar = robot_data.lidar_data
-
-            points = update_meshes_for_cloud2(
-                lidar.positions,
-                lidar.uvs,
-                lidar.resolution,
-                lidar.origin,
-                0
-            )
-
-            point_cloud = PointCloud2()
-            point_cloud.header = Header(frame_id="odom")
-            point_cloud.header.stamp = self.node.get_clock().now().to_msg()
-            
-            fields = [
-                PointField(name='x', offset=0, datatype=PointField.FLOAT32, count=1),
-                PointField(name='y', offset=4, datatype=PointField.FLOAT32, count=1),
-                PointField(name='z', offset=8, datatype=PointField.FLOAT32, count=1),
-                PointField(name='intensity', offset=12, datatype=PointField.FLOAT32, count=1),
-            ]
-            
-            point_cloud = point_cloud2.create_cloud(point_cloud.header, fields, points)
-            self.publishers['lidar'][robot_idx].publish(point_cloud)
+            engine = self.delta_engines.get(robot_id)
+            if engine is None:
+                engine = VoxelDeltaEngine(self.config.lidar_keyframe_interval)
+                self.delta_engines[robot_id] = engine
+
+            points = None
+            if not (lidar.unchanged and engine.has_state):
+                points = update_meshes_for_cloud2(
+                    lidar.positions,
+                    lidar.uvs,
+                    lidar.resolution,
+                    lidar.origin,
+                    0
+                )
+
+            # Voxel keys and delta clouds only for delta subscribers
+            deltas_wanted = self._has_subscribers('lidar_delta', robot_id)
+            delta = engine.update(points, lidar.resolution, lidar.origin,
+                                  unchanged=lidar.unchanged, diff=deltas_wanted)
+            stamp = self._header_stamp(robot_data)
+            self._mark_built(robot_data)
+
+            if delta.keyframe:
+                point_cloud = self._last_cloud.get(robot_id)
+                if not delta.unchanged or point_cloud is None:
+                    header = Header(frame_id="odom")
+                    point_cloud = self.cloud_builder.build(header, delta.points)
+                    self._last_cloud[robot_id] = point_cloud
+                point_cloud.header.stamp = stamp
+                self.publishers['lidar'][robot_id].publish(point_cloud)
+
+            if deltas_wanted:
+                self._publish_lidar_delta(robot_id, delta, stamp)
 
         except Exception as e:
             logger.error(f"Error publishing lidar data: {e}")
 
+    def _publish_lidar_delta(self, robot_id: str, delta: VoxelDelta, stamp) -> None:
+        """Publish added/removed voxels (or the keyframe cloud) on the delta topic"""
+        if delta.empty:
+            return
+
+        if delta.keyframe:
+            rows = np.hstack((delta.points, np.zeros((len(delta.points), 1), np.float32)))
+        else:
+            rows = np.vstack((
+                np.hstack((delta.added, np.ones((len(delta.added), 1), np.float32))),
+                np.hstack((delta.removed, np.full((len(delta.removed), 1), -1.0, np.float32))),
+            ))
+
+        header = Header(frame_id="odom")
+        header.stamp = stamp
+        delta_cloud = self.delta_builder.build(header, rows)
+        self.publishers['lidar_delta'][robot_id].publish(delta_cloud)
+
+    @_timed('camera')
     def publish_camera_data(self, robot_data: RobotData) -> None:
-        """Publish camera data"""
+        """Publish camera data to the outputs that have subscribers"""
         if not robot_data.camera_data:
             return
 
         try:
-            robot_idx = int(robot_data.robot_id)
+            robot_id = robot_data.robot_id
             camera = robot_data.camera_data
 
-            # Convert to ROS Image
-            ros_image = self.bridge.cv2_to_imgmsg(camera.image, encoding=camera.encoding)
-            ros_image.header.stamp = self.node.get_clock().now().to_msg()
+            header = Header()
+            header.stamp = self.node.get_clock().now().to_msg()
+            header.frame_id = self._camera_frame_id(robot_id)
 
-            # Camera info
-            camera_info = self.camera_info[camera.height]
-            camera_info.header.stamp = ros_image.header.stamp
+            # Convert to ROS Image only for subscribers
+            if self._has_subscribers('camera', robot_id):
+                ros_image = self._to_imgmsg(camera)
+                ros_image.header = header
+                self.publishers['camera'][robot_id].publish(ros_image)
 
-            if self.config.conn_mode == 'single':
-                camera_info.header.frame_id = 'front_camera'
-                ros_image.header.frame_id = 'front_camera'
-            else:
-                camera_info.header.frame_id = f'robot{robot_data.robot_id}/front_camera'
-                ros_image.header.frame_id = f'robot{robot_data.robot_id}/front_camera'
+            if self.jpeg_pool is not None and self._has_subscribers('camera_compressed', robot_id):
+                self.jpeg_pool.submit(
+                    robot_id, camera,
+                    lambda jpeg: self._publish_jpeg(robot_id, header, jpeg))
+
+            # Camera info
+            if self._has_subscribers('camera_info', robot_id):
+                camera_info = self._camera_info_for(camera.width, camera.height)
+                camera_info.header = header
+                self.publishers['camera_info'][robot_id].publish(camera_info)
 
-            # Publish
-            self.publishers['camera'][robot_idx].publish(ros_image)
-            self.publishers['camera_info'][robot_idx].publish(camera_info)
+            if self.config.camera_shm:
+                self._write_frame_ring(robot_id, camera, header)
 
         except Exception as e:
             logger.error(f"Error publishing camera data: {e}")
 
+    def publish_video_packet(self, robot_id: str, data: bytes, rtp_timestamp: int,
+                             keyframe: bool) -> None:
+        """
+        Publish one encoded H.264 access unit (Annex B) as received from the robot.
+
+        Published as foxglove_msgs/CompressedVideo when available, otherwise as
+        sensor_msgs/CompressedImage with format 'h264'.
+        """
+        publisher = self.publishers['camera_h264'].get(robot_id)
+        if publisher is None or publisher.get_subscription_count() == 0:
+            return
+        stamp = self.node.get_clock().now().to_msg()
+        frame_id = self._camera_frame_id(robot_id)
+        if CompressedVideo is not None:
+            msg = CompressedVideo()
+            msg.timestamp = stamp
+            msg.frame_id = frame_id
+        else:
+            msg = CompressedImage()
+            msg.header.stamp = stamp
+            msg.header.frame_id = frame_id
+        msg.format = 'h264'
+        payload = array.array('B')
+        payload.frombytes(data)
+        msg.data = payload
+        publisher.publish(msg)
+
+    def _camera_frame_id(self, robot_id: str) -> str:
+        if self.config.conn_mode == 'single':
+            return 'front_camera'
+        return f'robot{robot_id}/front_camera'
+
+    def camera_in_demand(self, robot_id: str) -> bool:
+        """True if a camera frame of the robot would be used by any output"""
+        return self.config.camera_shm or any(
+            self._has_subscribers(kind, robot_id)
+            for kind in ('camera', 'camera_compressed', 'camera_info'))
+
+    def _has_subscribers(self, kind: str, robot_id: str) -> bool:
+        publisher = self.publishers.get(kind, {}).get(robot_id)
+        return publisher is not None and publisher.get_subscription_count() > 0
+
+    def _publish_jpeg(self, robot_id: str, header: Header, jpeg: bytes) -> None:
+        """Publish an encoded frame; called on a JPEG encoder thread"""
+        msg = CompressedImage()
+        msg.header = header
+        msg.format = 'jpeg'
+        data = array.array('B')
+        data.frombytes(jpeg)
+        msg.data = data
+        self.publishers['camera_compressed'][robot_id].publish(msg)
+
+    def _to_imgmsg(self, camera: CameraData) -> Image:
+        """
+        ROS Image of a camera frame.
+
+        I420 has no sensor_msgs image encoding, so cv_bridge, rviz and
+        image_transport could not read it; image_raw is always bgr8. I420
+        frames stay I420 for the frame ring and the JPEG encoder and are
+        converted here only when image_raw has subscribers.
+        """
+        if camera.encoding == 'i420':
+            image = cv2.cvtColor(camera.image, cv2.COLOR_YUV2BGR_I420)
+            return self.bridge.cv2_to_imgmsg(image, encoding='bgr8')
+        return self.bridge.cv2_to_imgmsg(camera.image, encoding=camera.encoding)
+
+    def _camera_info_for(self, width: int, height: int) -> CameraInfo:
+        """Calibration of the frame size; downscaled frames get a scaled calibration"""
+        camera_info = self.camera_info.get(height)
+        if camera_info is not None and camera_info.width == width:
+            return camera_info
+        camera_info = self._scaled_camera_info.get((width, height))
+        if camera_info is not None:
+            return camera_info
+        # Sizes are rounded to even numbers, so compare aspect ratios loosely
+        for native in sorted(self.camera_info.values(), key=lambda info: -info.height):
+            if abs(native.width / native.height - width / height) < 0.02:
+                camera_info = scale_camera_info(native, width, height)
+                self._scaled_camera_info[(width, height)] = camera_info
+                return camera_info
+        raise KeyError(f"No camera calibration for {width}x{height}")
+
+    def _write_frame_ring(self, robot_id: str, camera: CameraData, header: Header) -> None:
+        """Write a frame into the robot's shared-memory ring and announce it"""
+        ring = self.frame_rings.get(robot_id)
+        if ring is None:
+            ring = self.frame_rings[robot_id] = FrameRingWriter(
+                f"go2_camera_{robot_id}", slots=self.config.camera_shm_slots)
+        try:
+            ring.write(camera.image, (header.stamp.sec, header.stamp.nanosec),
+                       camera.encoding, header.frame_id)
+        except FrameRingError as e:
+            logger.warning(f"Frame not written to {ring.name}: {e}")
+            return
+        notifier = self.publishers['camera_frame_ready'].get(robot_id)
+        if notifier is not None:
+            notifier.publish(header)
+
+    def close(self) -> None:
+        """Stop the JPEG encoder and remove the shared-memory frame rings"""
+        if self.jpeg_pool is not None:
+            self.jpeg_pool.shutdown()
+        for ring in self.frame_rings.values():
+            ring.close()
+        self.frame_rings.clear()
+
+    @_timed('voxel')
     def publish_voxel_data(self, robot_data: RobotData) -> None:
         """Publish voxel data"""
         if not robot_data.lidar_data or not self.config.publish_raw_voxel:
             return
 
         try:
-            robot_idx = int(robot_data.robot_id)
+            robot_id = robot_data.robot_id
             lidar = robot_data.lidar_data
 
             voxel_msg = VoxelMapCompressed()
@@ -260,9 +483,13 @@ class ROS2Publisher(IRobotDataPublisher):
             voxel_msg.origin = lidar.origin
             voxel_msg.width = lidar.width or []
             voxel_msg.src_size = lidar.src_size or 0
-            voxel_msg.data = lidar.compressed_data or b''
+            # array('B') is the fast path of the uint8[] setter (payload may be a memoryview)
+            voxel_data = array.array('B')
+            if lidar.compressed_data is not None:
+                voxel_data.frombytes(lidar.compressed_data)
+            voxel_msg.data = voxel_data
 
-            self.publishers['voxel'][robot_idx].publish(voxel_msg)
+            self.publishers['voxel'][robot_id].publish(voxel_msg)
 
         except Exception as e:
             logger.error(f"Error publishing voxel data: {e}") 
\ No newline at end of file
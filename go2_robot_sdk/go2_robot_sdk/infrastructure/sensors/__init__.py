@@ -1,10 +1,25 @@
 """
 Infrastructure sensors - sensor data processing and configuration
 """
-from .lidar_decoder import decode_lidar_data, update_meshes_for_cloud2, get_voxel_decoder, LidarDecoder
-from .camera_config import load_camera_info, CameraConfigLoader, get_camera_loader
+from .lidar_decoder import (
+    decode_lidar_data, update_meshes_for_cloud2, get_voxel_decoder, LidarDecoder,
+    NativeLidarDecoder, lz4_block_decompress, LIDAR_DECODER_BACKENDS
+)
+from .camera_config import (
+    load_camera_info, scale_camera_info, CameraConfigLoader, get_camera_loader
+)
+from .wasm_memory import WasmMemoryBridge
+from .wasm_module_cache import get_wasm_engine, load_wasm_module
+from .lidar_decode_pool import LidarDecodePool
+from .voxel_delta import VoxelDelta, VoxelDeltaEngine
+from .video_worker import VideoWorker, VIDEO_OUTPUT_FORMATS
+from .jpeg_encoder import JpegEncodePool
 
 __all__ = [
     'decode_lidar_data', 'update_meshes_for_cloud2', 'get_voxel_decoder', 'LidarDecoder',
-    'load_camera_info', 'CameraConfigLoader', 'get_camera_loader'
+    'NativeLidarDecoder', 'lz4_block_decompress', 'LIDAR_DECODER_BACKENDS',
+    'WasmMemoryBridge', 'LidarDecodePool', 'get_wasm_engine', 'load_wasm_module',
+    'VoxelDelta', 'VoxelDeltaEngine', 'VideoWorker', 'VIDEO_OUTPUT_FORMATS',
+    'JpegEncodePool',
+    'load_camera_info', 'scale_camera_info', 'CameraConfigLoader', 'get_camera_loader'
 ] 
\ No newline at end of file
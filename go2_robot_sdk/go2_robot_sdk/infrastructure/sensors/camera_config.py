@@ -130,6 +130,42 @@ class CameraConfigLoader:
         return self._camera_info_cache.get(height)
 
 
+def scale_camera_info(camera_info: CameraInfo, width: int, height: int) -> CameraInfo:
+    """
+    Scale a calibration to a resized image of the same aspect ratio.
+
+    Args:
+        camera_info: Calibration at its native resolution
+        width: Resized image width
+        height: Resized image height
+
+    Returns:
+        New CameraInfo with scaled intrinsics and projection
+    """
+    sx = width / camera_info.width
+    sy = height / camera_info.height
+    scaled = CameraInfo()
+    scaled.width = width
+    scaled.height = height
+    scaled.distortion_model = camera_info.distortion_model
+    scaled.d = list(camera_info.d)
+    scaled.r = list(camera_info.r)
+    k = list(camera_info.k)
+    k[0] *= sx  # fx
+    k[2] *= sx  # cx
+    k[4] *= sy  # fy
+    k[5] *= sy  # cy
+    scaled.k = k
+    p = list(camera_info.p)
+    p[0] *= sx
+    p[2] *= sx
+    p[3] *= sx  # Tx
+    p[5] *= sy
+    p[6] *= sy
+    scaled.p = p
+    return scaled
+
+
 # Global loader instance for backward compatibility
 _camera_loader: Optional[CameraConfigLoader] = None
 
@@ -0,0 +1,138 @@
+# Copyright (c) 2024, RoboVerse community
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+JPEG encoding of camera frames on a small thread pool.
+
+cv2.imencode (and the I420 to BGR conversion) release the GIL, so a few
+threads encode in parallel with the driver's Python work. A robot never
+has more frames in flight than there are workers; extra frames are
+dropped rather than queued, and results that finish out of order are
+discarded so viewers never see time go backwards. A robot's results are
+checked and published under its own lock, so two encoder threads can not
+publish them in reverse order.
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict
+
+import cv2
+
+from ...domain.entities import CameraData
+from ...application.utils.metrics import get_metrics_registry
+
+logger = logging.getLogger(__name__)
+
+
+class JpegEncodePool:
+    """Rate-capped, drop-when-busy JPEG encoder shared by all robots"""
+
+    def __init__(self, workers: int = 2, quality: int = 80, max_fps: float = 0.0) -> None:
+        """
+        Initialize the encoder pool.
+
+        Args:
+            workers: Encoder threads
+            quality: JPEG quality 1-100
+            max_fps: Encoded frames per second and robot, 0 = every frame
+        """
+        self.workers = max(1, workers)
+        self.quality = min(max(quality, 1), 100)
+        self.period = 1.0 / max_fps if max_fps > 0 else 0.0
+        self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="jpeg")
+        self._lock = threading.Lock()
+        self._in_flight: Dict[str, int] = {}
+        self._next_due: Dict[str, float] = {}
+        self._sequence: Dict[str, int] = {}
+        self._published: Dict[str, int] = {}
+        self._publish_locks: Dict[str, threading.Lock] = {}
+
+        # Statistics
+        self.encoded = 0
+        self.dropped = 0  # all workers busy with this robot's frames
+        self.skipped = 0  # above max_fps
+        self.stale = 0  # finished after a newer frame
+        self._encode_time = get_metrics_registry().histogram(
+            "go2_jpeg_seconds", "JPEG encode time per frame")
+
+    def submit(self, robot_id: str, camera: CameraData,
+               publish: Callable[[bytes], None]) -> bool:
+        """
+        Encode a frame in the pool unless it is rate capped or the pool is busy.
+
+        Args:
+            robot_id: Robot the frame belongs to
+            camera: Frame in bgr8 or i420
+            publish: Called with the JPEG bytes on the encoder thread
+
+        Returns:
+            True if the frame was queued
+        """
+        now = time.monotonic()
+        with self._lock:
+            if self.period:
+                next_due = self._next_due.get(robot_id, 0.0)
+                if now < next_due:
+                    self.skipped += 1
+                    return False
+            if self._in_flight.get(robot_id, 0) >= self.workers:
+                self.dropped += 1
+                return False
+            if self.period:
+                # Stay on the rate grid unless we fell behind it
+                next_due += self.period
+                self._next_due[robot_id] = next_due if next_due > now else now + self.period
+            self._in_flight[robot_id] = self._in_flight.get(robot_id, 0) + 1
+            sequence = self._sequence[robot_id] = self._sequence.get(robot_id, 0) + 1
+            publish_lock = self._publish_locks.setdefault(robot_id, threading.Lock())
+        self.executor.submit(self._encode, robot_id, sequence, camera, publish, publish_lock)
+        return True
+
+    def encode(self, camera: CameraData) -> bytes:
+        """Encode one frame to JPEG"""
+        image = camera.image
+        if camera.encoding == "i420":
+            image = cv2.cvtColor(image, cv2.COLOR_YUV2BGR_I420)
+        ok, jpeg = cv2.imencode(".jpg", image, [cv2.IMWRITE_JPEG_QUALITY, self.quality])
+        if not ok:
+            raise RuntimeError("cv2.imencode failed")
+        return jpeg.tobytes()
+
+    def _encode(self, robot_id: str, sequence: int, camera: CameraData,
+                publish: Callable[[bytes], None], publish_lock: threading.Lock) -> None:
+        try:
+            with self._encode_time.time():
+                jpeg = self.encode(camera)
+            # Held until published: a newer frame can not be published in between
+            with publish_lock:
+                with self._lock:
+                    if sequence < self._published.get(robot_id, 0):
+                        self.stale += 1
+                        return
+                    self._published[robot_id] = sequence
+                    self.encoded += 1
+                publish(jpeg)
+        except Exception as e:
+            logger.error(f"Error encoding JPEG frame of robot {robot_id}: {e}")
+        finally:
+            with self._lock:
+                self._in_flight[robot_id] -= 1
+
+    def stats(self) -> Dict[str, float]:
+        """Return frame counts and the mean encode time in milliseconds"""
+        with self._lock:
+            return {
+                "encoded": self.encoded,
+                "dropped": self.dropped,
+                "skipped": self.skipped,
+                "stale": self.stale,
+                "in_flight": sum(self._in_flight.values()),
+                "encode_ms": self._encode_time.mean * 1e3,
+            }
+
+    def shutdown(self) -> None:
+        """Stop the encoder threads; queued frames are discarded"""
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,239 @@
+# Copyright (c) 2024, RoboVerse community
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+Process pool for voxel map decoding.
+Keeps LZ4 decompression and meshing off the asyncio loop that services
+SCTP, video and command sends.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Deque, Dict, Optional, Tuple
+
+from .lidar_decoder import get_voxel_decoder
+from ...application.utils.metrics import get_metrics_registry
+
+logger = logging.getLogger(__name__)
+
+# Decoder owned by each worker process
+_worker_decoder = None
+
+
+def _init_worker(backend: str) -> None:
+    """Create the per-process decoder once, when the worker starts"""
+    global _worker_decoder
+    _worker_decoder = get_voxel_decoder(backend)
+
+
+def _decode_in_worker(compressed_data: bytes, header: Dict[str, Any]) -> Dict[str, Any]:
+    """Decode one voxel map frame inside a worker process"""
+    return _worker_decoder.decode(compressed_data, header)
+
+
+class LidarDecodePool:
+    """
+    Decode voxel map frames in N worker processes, each with its own decoder.
+
+    At most `max_in_flight` frames are being decoded at any time. Further
+    frames wait in a short pending queue; when that is full the oldest
+    pending frame is dropped. Results are delivered as asyncio futures on
+    the loop that submitted them. A result that arrives after a newer frame
+    of the same source was already delivered resolves to None. When a worker
+    dies, the frames it broke fail and the pool is rebuilt with fresh workers.
+    """
+
+    def __init__(self, workers: int, backend: str = "wasm",
+                 max_in_flight: Optional[int] = None, max_pending: int = 1) -> None:
+        """
+        Initialize the decode pool.
+
+        Args:
+            workers: Number of worker processes
+            backend: Decoder backend for the workers, 'wasm' or 'native'
+            max_in_flight: Frames decoded concurrently (default: one per worker)
+            max_pending: Frames queued while all workers are busy
+        """
+        if workers < 1:
+            raise ValueError("LidarDecodePool needs at least one worker")
+
+        self.workers = workers
+        self.backend = backend
+        self.max_in_flight = max_in_flight or workers
+        self.max_pending = max(0, max_pending)
+
+        self._executor = self._create_executor()
+
+        self._in_flight = 0
+        self._pending: Deque[Tuple[str, int, bytes, Dict[str, Any], asyncio.Future]] = deque()
+        self._sequence: Dict[str, int] = {}
+        self._delivered: Dict[str, int] = {}
+        self._closed = False
+
+        # Statistics
+        self.submitted = 0
+        self.decoded = 0
+        self.dropped = 0
+        self.stale = 0
+        self.failed = 0
+        self.restarts = 0
+
+        self._restart_count = get_metrics_registry().counter(
+            "go2_decode_pool_restarts_total", "LiDAR decode pools rebuilt after a worker died")
+        self._decode_time = get_metrics_registry().histogram(
+            "go2_decode_seconds", "Binary message decode time", stage="lidar_pool", backend=backend)
+
+        logger.info(f"LiDAR decode pool started: {workers} workers, {backend} backend")
+
+    def _create_executor(self) -> ProcessPoolExecutor:
+        # forkserver avoids forking the threaded ROS2/aiortc parent process
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(self.backend,),
+        )
+
+    def _restart(self, broken: ProcessPoolExecutor) -> None:
+        """Replace a broken executor, once, however many frames report it"""
+        if self._closed or broken is not self._executor:
+            return
+        self.restarts += 1
+        self._restart_count.inc()
+        logger.warning(f"LiDAR decode worker died, restarting the pool (restart {self.restarts})")
+        broken.shutdown(wait=False, cancel_futures=True)
+        self._executor = self._create_executor()
+
+    def submit(self, compressed_data: bytes, header: Dict[str, Any],
+               source: str = "") -> asyncio.Future:
+        """
+        Queue a frame for decoding. Must be called from the event loop thread.
+
+        Args:
+            compressed_data: Compressed voxel map payload
+            header: Frame "data" header (origin, resolution, ...)
+            source: Frame source, e.g. the robot id; staleness is tracked per source
+
+        Returns:
+            Future resolving to the decoded dict, or None if the frame was
+            dropped or superseded by a newer frame
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        if self._closed:
+            future.set_result(None)
+            return future
+
+        sequence = self._sequence.get(source, 0) + 1
+        self._sequence[source] = sequence
+        self.submitted += 1
+
+        item = (source, sequence, compressed_data, header, future)
+        if self._in_flight < self.max_in_flight:
+            self._start(loop, item)
+        elif self.max_pending:
+            if len(self._pending) >= self.max_pending:
+                self._drop(self._pending.popleft())
+            self._pending.append(item)
+        else:
+            self._drop(item)
+        return future
+
+    def _start(self, loop: asyncio.AbstractEventLoop,
+               item: Tuple[str, int, bytes, Dict[str, Any], asyncio.Future]) -> None:
+        """Hand a frame to a worker process"""
+        source, sequence, compressed_data, header, future = item
+        self._in_flight += 1
+        if isinstance(compressed_data, memoryview):
+            # Pickled to the worker anyway; memoryviews cannot be pickled
+            compressed_data = compressed_data.tobytes()
+        try:
+            executor, decode = self._run(loop, compressed_data, header)
+        except RuntimeError as e:
+            # Executor already shut down
+            self._in_flight -= 1
+            self.failed += 1
+            if not future.done():
+                future.set_exception(e)
+            return
+        started = time.perf_counter()
+        decode.add_done_callback(
+            lambda done: self._on_decoded(loop, executor, source, sequence, future, done, started)
+        )
+
+    def _run(self, loop: asyncio.AbstractEventLoop, compressed_data: bytes,
+             header: Dict[str, Any]) -> Tuple[ProcessPoolExecutor, asyncio.Future]:
+        """Submit to the executor, replacing it first if it is already broken"""
+        executor = self._executor
+        try:
+            return executor, loop.run_in_executor(
+                executor, _decode_in_worker, compressed_data, header)
+        except BrokenProcessPool:
+            # Broke before an in-flight frame reported it
+            self._restart(executor)
+            executor = self._executor
+            return executor, loop.run_in_executor(
+                executor, _decode_in_worker, compressed_data, header)
+
+    def _on_decoded(self, loop: asyncio.AbstractEventLoop, executor: ProcessPoolExecutor,
+                    source: str, sequence: int, future: asyncio.Future, done: asyncio.Future,
+                    started: float) -> None:
+        """Resolve the caller's future and start the next pending frame"""
+        self._in_flight -= 1
+        if not done.cancelled() and isinstance(done.exception(), BrokenProcessPool):
+            self._restart(executor)
+        # Worker round trip: pickling, executor queue and the decode itself
+        self._decode_time.observe(time.perf_counter() - started)
+
+        if not future.done():
+            if done.cancelled():
+                future.set_result(None)
+            elif done.exception() is not None:
+                self.failed += 1
+                future.set_exception(done.exception())
+            elif sequence < self._delivered.get(source, 0):
+                self.stale += 1
+                future.set_result(None)
+            else:
+                self.decoded += 1
+                self._delivered[source] = sequence
+                future.set_result(done.result())
+
+        if self._pending and not self._closed:
+            self._start(loop, self._pending.popleft())
+
+    def _drop(self, item: Tuple[str, int, bytes, Dict[str, Any], asyncio.Future]) -> None:
+        """Discard a frame that never reached a worker"""
+        self.dropped += 1
+        future = item[-1]
+        if not future.done():
+            future.set_result(None)
+
+    def stats(self) -> Dict[str, int]:
+        """Return pool counters"""
+        return {
+            "workers": self.workers,
+            "in_flight": self._in_flight,
+            "pending": len(self._pending),
+            "submitted": self.submitted,
+            "decoded": self.decoded,
+            "dropped": self.dropped,
+            "stale": self.stale,
+            "failed": self.failed,
+            "restarts": self.restarts,
+        }
+
+    def shutdown(self) -> None:
+        """Drop pending frames and stop the worker processes"""
+        self._closed = True
+        while self._pending:
+            self._drop(self._pending.popleft())
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        logger.info(f"LiDAR decode pool stopped: {self.stats()}")
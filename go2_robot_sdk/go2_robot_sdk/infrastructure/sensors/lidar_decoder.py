@@ -6,17 +6,45 @@ LiDAR data decoder for Go2 robot.
 Handles decoding of compressed voxel map data from WebRTC stream.
 """
 
-import ctypes
 import numpy as np
 import os
 import math
-from typing import Dict, Any
+from typing import Dict, Any, Tuple, Union
 
-from wasmtime import Config, Engine, Store, Module, Instance, Func, FuncType, ValType
 from ament_index_python import get_package_share_directory
 
+from .wasm_memory import WasmMemoryBridge
+from .wasm_module_cache import get_wasm_engine, load_wasm_module
 
-def update_meshes_for_cloud2(
+try:
+    from wasmtime import Store, Instance, Func, FuncType, ValType
+except ImportError:
+    # Only the WASM backend needs wasmtime; the native backend works without it
+    Store = None
+
+try:
+    from lz4.block import decompress as lz4_block_decompress_c
+except ImportError:
+    lz4_block_decompress_c = None
+
+# Size of the WASM-side input buffer for compressed voxel data (128 x 128 x 30 bits)
+INPUT_BUFFER_SIZE = 61440
+
+# Decompression buffer size used by both backends
+DECOMPRESS_BUFFER_SIZE = 80000
+
+# Voxel grid layout of voxel_map_compressed: 128 x 128 columns, 30 layers,
+# one bit per voxel, most significant bit first, x fastest
+GRID_X = 128
+GRID_Y = 128
+GRID_Z = 30
+LAYER_BYTES = GRID_X * GRID_Y // 8
+
+# Available decoder backends
+LIDAR_DECODER_BACKENDS = ('wasm', 'native')
+
+
+def update_meshes_for_cloud2_reference(
     positions: list, 
     uvs: list, 
     res: float, 
@@ -24,7 +52,10 @@ def update_meshes_for_cloud2(
     intense_limiter: float
 ) -> np.ndarray:
     """
-    Process LiDAR point cloud data for ROS2 PointCloud2 message.
+    Reference implementation of update_meshes_for_cloud2.
+
+    Float rows deduplicated with np.unique(axis=0); kept for parity tests
+    and benchmarks.
     
     Args:
         positions: Raw position data from LiDAR
@@ -65,21 +96,81 @@ def update_meshes_for_cloud2(
     return unique_points
 
 
+def update_meshes_for_cloud2(
+    positions: list,
+    uvs: list,
+    res: float,
+    origin: list,
+    intense_limiter: float
+) -> np.ndarray:
+    """
+    Process LiDAR point cloud data for ROS2 PointCloud2 message.
+
+    Positions are uint8 voxel corner indices, so each vertex is packed into
+    a uint32 key (x, y, z, intensity, one byte each). Filtering and dedup
+    run on the keys; only the unique points are scaled by `res` and shifted
+    by `origin`. Output matches update_meshes_for_cloud2_reference,
+    including the lexicographic row order.
+
+    Args:
+        positions: Raw position data from LiDAR
+        uvs: UV coordinate data
+        res: Resolution factor
+        origin: Origin offset coordinates
+        intense_limiter: Intensity threshold filter
+
+    Returns:
+        Processed point cloud array with x,y,z,intensity
+    """
+    position_array = np.asarray(positions)
+    uv_array = np.asarray(uvs)
+    if position_array.dtype != np.uint8 or uv_array.dtype != np.uint8 or res <= 0:
+        return update_meshes_for_cloud2_reference(positions, uvs, res, origin, intense_limiter)
+
+    position_array = position_array.reshape(-1, 3)
+    uv_array = uv_array.reshape(-1, 2)
+
+    # Intensity is the smaller UV coordinate of each vertex
+    intensities = np.minimum(uv_array[:, 0], uv_array[:, 1])
+    keep = intensities > intense_limiter
+
+    # Byte order x, y, z, intensity makes integer order equal to row order
+    keys = position_array[keep].astype(np.uint32)
+    keys = (keys[:, 0] << 24) | (keys[:, 1] << 16) | (keys[:, 2] << 8) | intensities[keep]
+
+    # Sort + adjacent compare; cheaper than np.unique for 1-D integer keys
+    keys.sort()
+    first = np.empty(len(keys), dtype=bool)
+    first[:1] = True
+    np.not_equal(keys[1:], keys[:-1], out=first[1:])
+    keys = keys[first]
+
+    points = np.empty((len(keys), 4), dtype=np.float32)
+    points[:, 0] = keys >> 24
+    points[:, 1] = (keys >> 16) & 0xFF
+    points[:, 2] = (keys >> 8) & 0xFF
+    points[:, 3] = keys & 0xFF
+
+    # Same float32 operations as the reference, on unique points only
+    xyz = points[:, :3]
+    xyz *= res
+    xyz += origin
+    return points
+
+
 class LidarDecoder:
     """Original WASM-based LiDAR decoder - the working implementation"""
     
     def __init__(self) -> None:
-        config = Config()
-        config.wasm_multi_value = True
-        config.debug_info = True
-        self.store = Store(Engine(config))
+        # Engine and compiled module are shared; each decoder owns its Store
+        self.store = Store(get_wasm_engine())
 
         libvoxel_path = os.path.join(
             get_package_share_directory('go2_robot_sdk'),
             "external_lib",
             'libvoxel.wasm')
 
-        self.module = Module.from_file(self.store.engine, libvoxel_path)
+        self.module = load_wasm_module(libvoxel_path)
 
         self.a_callback_type = FuncType([ValType.i32()], [ValType.i32()])
         self.b_callback_type = FuncType([ValType.i32(), ValType.i32(), ValType.i32()], [])
@@ -94,69 +185,80 @@ class LidarDecoder:
         self.free = self.instance.exports(self.store)["g"]
         self.wasm_memory = self.instance.exports(self.store)["c"]
 
-        self.buffer = self.wasm_memory.data_ptr(self.store)
-        self.memory_size = self.wasm_memory.data_len(self.store)
-
-        self.buffer_ptr = int.from_bytes(self.buffer, "little")
+        # Bulk NumPy/memoryview access to linear memory (replaces per-byte ctypes loops)
+        self.memory = WasmMemoryBridge(self.store, self.wasm_memory)
 
-        self.HEAP8 = (ctypes.c_int8 * self.memory_size).from_address(self.buffer_ptr)
-        self.HEAP16 = (ctypes.c_int16 * (self.memory_size // 2)).from_address(self.buffer_ptr)
-        self.HEAP32 = (ctypes.c_int32 * (self.memory_size // 4)).from_address(self.buffer_ptr)
-        self.HEAPU8 = (ctypes.c_uint8 * self.memory_size).from_address(self.buffer_ptr)
-        self.HEAPU16 = (ctypes.c_uint16 * (self.memory_size // 2)).from_address(self.buffer_ptr)
-        self.HEAPU32 = (ctypes.c_uint32 * (self.memory_size // 4)).from_address(self.buffer_ptr)
-        self.HEAPF32 = (ctypes.c_float * (self.memory_size // 4)).from_address(self.buffer_ptr)
-        self.HEAPF64 = (ctypes.c_double * (self.memory_size // 8)).from_address(self.buffer_ptr)
-
-        self.input = self.malloc(self.store, 61440)
-        self.decompressBuffer = self.malloc(self.store, 80000)
+        self.input = self.malloc(self.store, INPUT_BUFFER_SIZE)
+        self.decompressBuffer = self.malloc(self.store, DECOMPRESS_BUFFER_SIZE)
         self.positions = self.malloc(self.store, 2880000)
         self.uvs = self.malloc(self.store, 1920000)
         self.indices = self.malloc(self.store, 5760000)
         self.decompressedSize = self.malloc(self.store, 4)
         self.faceCount = self.malloc(self.store, 4)
         self.pointCount = self.malloc(self.store, 4)
-        self.decompressBufferSize = 80000
+        self.decompressBufferSize = DECOMPRESS_BUFFER_SIZE
+
+    @property
+    def HEAPU8(self) -> np.ndarray:
+        """Unsigned byte view of linear memory (kept for backward compatibility)"""
+        return self.memory.u8
 
     def adjust_memory_size(self, t):
-        return len(self.HEAPU8)
+        """
+        emscripten_resize_heap import: grow linear memory to hold `t` bytes.
+
+        Returns 1 on success and 0 when the module's maximum size is reached,
+        which makes the module's sbrk/malloc fail cleanly instead of writing
+        past the end of memory.
+        """
+        return 1 if self.memory.grow_to(t) else 0
 
     def copy_within(self, target, start, end):
-        sublist = self.HEAPU8[start:end]
-        for i in range(len(sublist)):
-            if target + i < len(self.HEAPU8):
-                self.HEAPU8[target + i] = sublist[i]
+        self.memory.move(target, start, end - start)
 
     def copy_memory_region(self, t, n, a):
-        self.copy_within(t, n, n + a)
+        """emscripten_memcpy_big import: copy `a` bytes from `n` to `t`"""
+        self.memory.move(t, n, a)
+
+    def callback_stats(self) -> Dict[str, int]:
+        """
+        Counters for the WASM import callbacks.
+
+        Returns:
+            Dictionary with copy_memory_region call count and bytes moved,
+            and the number of successful memory grows
+        """
+        return {
+            "copy_calls": self.memory.move_calls,
+            "copy_bytes": self.memory.moved_bytes,
+            "memory_grows": self.memory.grow_count,
+        }
 
     def get_value(self, t, n="i8"):
         if n.endswith("*"):
             n = "*"
         if n == "i1" or n == "i8":
-            return self.HEAP8[t]
+            return int(self.memory.i8[t])
         elif n == "i16":
-            return self.HEAP16[t >> 1]
+            return int(self.memory.i16[t >> 1])
         elif n == "i32" or n == "i64":
-            return self.HEAP32[t >> 2]
+            return int(self.memory.i32[t >> 2])
         elif n == "float":
-            return self.HEAPF32[t >> 2]
+            return float(self.memory.f32[t >> 2])
         elif n == "double":
-            return self.HEAPF64[t >> 3]
+            return float(self.memory.f64[t >> 3])
         elif n == "*":
-            return self.HEAPU32[t >> 2]
+            return int(self.memory.u32[t >> 2])
         else:
             raise ValueError(f"invalid type for getValue: {n}")
 
     def add_value_arr(self, start, value):
-        if start + len(value) <= len(self.HEAPU8):
-            for i, byte in enumerate(value):
-                self.HEAPU8[start + i] = byte
-        else:
-            raise ValueError("Not enough space to insert bytes at the specified index.")
+        self.memory.write(start, value)
 
     def decode(self, compressed_data, data):
-        """Original decode method that actually works with the WASM module"""
+        """Decode a compressed voxel map using the WASM module"""
+        if len(compressed_data) > INPUT_BUFFER_SIZE:
+            raise ValueError("Compressed data does not fit into the WASM input buffer.")
         self.add_value_arr(self.input, compressed_data)
 
         some_v = math.floor(data["origin"][2] / data["resolution"])
@@ -176,21 +278,13 @@ class LidarDecoder:
             some_v
         )
 
-        self.get_value(self.decompressedSize, "i32")
         c = self.get_value(self.pointCount, "i32")
         u = self.get_value(self.faceCount, "i32")
 
-        positions_slice = self.HEAPU8[self.positions:self.positions + u * 12]
-        positions_copy = bytearray(positions_slice)
-        p = np.frombuffer(positions_copy, dtype=np.uint8)
-
-        uvs_slice = self.HEAPU8[self.uvs:self.uvs + u * 8]
-        uvs_copy = bytearray(uvs_slice)
-        r = np.frombuffer(uvs_copy, dtype=np.uint8)
-
-        indices_slice = self.HEAPU8[self.indices:self.indices + u * 24]
-        indices_copy = bytearray(indices_slice)
-        o = np.frombuffer(indices_copy, dtype=np.uint32)
+        # Bulk copies out of linear memory; the WASM buffers are reused next frame
+        p = self.memory.read(self.positions, u * 12)
+        r = self.memory.read(self.uvs, u * 8)
+        o = self.memory.read(self.indices, u * 6, np.uint32)
 
         return {
             "point_count": c,
@@ -201,14 +295,209 @@ class LidarDecoder:
         }
 
 
-def get_voxel_decoder() -> LidarDecoder:
+def lz4_block_decompress(src: Union[bytes, memoryview], max_size: int) -> bytes:
     """
-    Get a LidarDecoder instance.
-    
+    Decompress a raw LZ4 block (no frame header).
+
+    Uses the python-lz4 C extension when installed, otherwise a pure Python
+    implementation that copies whole literal runs and matches per sequence.
+
+    Args:
+        src: Compressed block
+        max_size: Maximum decompressed size
+
+    Returns:
+        Decompressed bytes
+
+    Raises:
+        ValueError: If the block is malformed or exceeds max_size
+    """
+    if lz4_block_decompress_c is not None:
+        try:
+            return lz4_block_decompress_c(src, uncompressed_size=max_size)
+        except Exception as e:
+            raise ValueError(f"Invalid LZ4 block: {e}")
+
+    src = bytes(src)
+    n = len(src)
+    dst = bytearray()
+    i = 0
+    try:
+        while True:
+            token = src[i]
+            i = _copy_literals(src, i + 1, token >> 4, dst)
+            if i >= n:
+                break
+            i = _copy_match(src, i, token & 15, dst)
+            if len(dst) > max_size:
+                raise ValueError("decompressed data exceeds buffer size")
+    except IndexError:
+        raise ValueError("truncated LZ4 block")
+
+    if len(dst) > max_size:
+        raise ValueError("decompressed data exceeds buffer size")
+    return bytes(dst)
+
+
+def _lz4_length(src: bytes, i: int, length: int) -> Tuple[int, int]:
+    """Add the 255-continued extension bytes of a 4-bit length of 15; return (length, i)"""
+    if length == 15:
+        while True:
+            b = src[i]
+            i += 1
+            length += b
+            if b != 255:
+                break
+    return length, i
+
+
+def _copy_literals(src: bytes, i: int, literal_len: int, dst: bytearray) -> int:
+    """Append one sequence's literal run to dst; return the input position after it"""
+    literal_len, i = _lz4_length(src, i, literal_len)
+    if i + literal_len > len(src):
+        raise ValueError("literal run past end of input")
+    dst += src[i:i + literal_len]
+    return i + literal_len
+
+
+def _copy_match(src: bytes, i: int, match_len: int, dst: bytearray) -> int:
+    """Append one sequence's match copy to dst; return the input position after it"""
+    offset = src[i] | (src[i + 1] << 8)
+    match_len, i = _lz4_length(src, i + 2, match_len)
+    match_len += 4
+
+    start = len(dst) - offset
+    if offset == 0 or start < 0:
+        raise ValueError("match offset outside of output")
+    if offset >= match_len:
+        dst += dst[start:start + match_len]
+    else:
+        # Overlapping match repeats the last `offset` bytes
+        pattern = dst[start:]
+        repeats, rest = divmod(match_len, offset)
+        dst += pattern * repeats + pattern[:rest]
+    return i
+
+
+class NativeLidarDecoder:
+    """
+    Pure Python/NumPy reimplementation of libvoxel.wasm.
+
+    Decompresses the LZ4 voxel bitmap and emits one quad per exposed voxel
+    face, producing the same positions/uvs/indices buffers as LidarDecoder
+    without wasmtime or fixed WASM heap allocations.
+    """
+
+    # Neighbour offset (dx, dy, dz) checked for each of the six faces
+    FACE_NEIGHBOURS = np.array([
+        [-1, 0, 0], [1, 0, 0],
+        [0, -1, 0], [0, 1, 0],
+        [0, 0, -1], [0, 0, 1],
+    ], dtype=np.int64)
+
+    # Quad corner offsets (x, y, z) per face, in the WASM module's vertex order
+    FACE_VERTICES = np.array([
+        [[0, 1, 0], [0, 0, 0], [0, 1, 1], [0, 0, 1]],
+        [[1, 1, 1], [1, 0, 1], [1, 1, 0], [1, 0, 0]],
+        [[1, 0, 1], [0, 0, 1], [1, 0, 0], [0, 0, 0]],
+        [[0, 1, 1], [1, 1, 1], [0, 1, 0], [1, 1, 0]],
+        [[1, 0, 0], [0, 0, 0], [1, 1, 0], [0, 1, 0]],
+        [[0, 0, 1], [1, 0, 1], [0, 1, 1], [1, 1, 1]],
+    ], dtype=np.uint8)
+
+    # Two triangles per quad
+    QUAD_INDICES = np.array([0, 1, 2, 2, 1, 3], dtype=np.uint32)
+
+    def decode(self, compressed_data, data):
+        """Decode a compressed voxel map (same interface as LidarDecoder.decode)"""
+        try:
+            raw = lz4_block_decompress(compressed_data, DECOMPRESS_BUFFER_SIZE)
+        except ValueError:
+            raw = b""
+
+        if not raw:
+            return self._result(0, np.empty((0, 3), np.uint8), np.empty(0, np.intp), data)
+
+        occupancy = self._unpack(raw)
+        point_count = int(np.count_nonzero(occupancy))
+
+        # Occupied voxels in raster order (z, y, x), the order of the WASM scan
+        occupied = np.flatnonzero(occupancy)
+        z, rest = np.divmod(occupied, GRID_X * GRID_Y)
+        y, x = np.divmod(rest, GRID_X)
+
+        # Zero border so out-of-grid neighbours read as empty, exactly like
+        # the WASM bounds check (x/y outside 0..127, z outside 0..29)
+        layers = occupancy.shape[0]
+        padded = np.zeros((layers + 2, GRID_Y + 2, GRID_X + 2), dtype=bool)
+        padded[1:min(layers, GRID_Z) + 1, 1:-1, 1:-1] = occupancy[:GRID_Z]
+        row, plane = GRID_X + 2, (GRID_X + 2) * (GRID_Y + 2)
+        centre = (z + 1) * plane + (y + 1) * row + (x + 1)
+        offsets = self.FACE_NEIGHBOURS @ np.array([1, row, plane])
+
+        # Faces of each voxel in order, voxels in scan order
+        exposed = ~padded.reshape(-1)[centre[:, None] + offsets]
+        voxel, face = np.nonzero(exposed)
+        voxels = np.stack((x[voxel], y[voxel], z[voxel]), axis=1).astype(np.uint8)
+        return self._result(point_count, voxels, face, data)
+
+    @staticmethod
+    def _unpack(raw: bytes) -> np.ndarray:
+        """Expand the bitmap to a (z, y, x) boolean grid, padding the last layer"""
+        layers = -(-len(raw) // LAYER_BYTES)
+        bits = np.zeros(layers * LAYER_BYTES, dtype=np.uint8)
+        bits[:len(raw)] = np.frombuffer(raw, dtype=np.uint8)
+        return np.unpackbits(bits).view(bool).reshape(layers, GRID_Y, GRID_X)
+
+    def _result(self, point_count: int, voxels: np.ndarray, face: np.ndarray,
+                data: Dict[str, Any]) -> Dict[str, Any]:
+        """Build positions/uvs/indices buffers for the exposed faces"""
+        face_count = len(face)
+
+        # Four corners per face: voxel position plus the face's corner offsets
+        positions = np.tile(voxels, 4) + self.FACE_VERTICES.reshape(6, 12).take(face, axis=0)
+
+        # Texture coordinates depend only on the layer: [u1, 0, u1, 255, u2, 0, u2, 255]
+        some_v = math.floor(data["origin"][2] / data["resolution"])
+        layer = np.clip(np.arange(256) + some_v, -10, 20) * 6
+        u_near = (layer + 66) & 0xFF
+        u_far = (layer + 60) & 0xFF
+        u_near[0], u_far[0] = 6, 0
+        uv_table = np.zeros((256, 8), dtype=np.uint8)
+        uv_table[:, 0] = uv_table[:, 2] = u_near
+        uv_table[:, 4] = uv_table[:, 6] = u_far
+        uv_table[:, 3] = uv_table[:, 7] = 255
+        uvs = uv_table[voxels[:, 2]]
+
+        base = np.arange(face_count, dtype=np.uint32)[:, None] * 4
+        indices = base + self.QUAD_INDICES
+
+        return {
+            "point_count": point_count,
+            "face_count": face_count,
+            "positions": positions.reshape(-1),
+            "uvs": uvs.reshape(-1),
+            "indices": indices.reshape(-1)
+        }
+
+
+def get_voxel_decoder(backend: str = 'wasm'):
+    """
+    Get a voxel map decoder instance.
+
+    Args:
+        backend: 'wasm' for libvoxel.wasm via wasmtime, 'native' for NumPy
+
     Returns:
-        Initialized LidarDecoder (the working implementation)
+        Initialized decoder exposing decode(compressed_data, data)
     """
-    return LidarDecoder()
+    if backend == 'native':
+        return NativeLidarDecoder()
+    if backend == 'wasm':
+        return LidarDecoder()
+    raise ValueError(
+        f"Unknown LiDAR decoder backend '{backend}', expected one of {LIDAR_DECODER_BACKENDS}"
+    )
 
 
 def decode_lidar_data(
@@ -0,0 +1,177 @@
+# Copyright (c) 2024, RoboVerse community
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+Video frame worker of one robot.
+
+The event loop only awaits track.recv() and drops the decoded frame into a
+single-slot mailbox; a worker thread converts and publishes it. When the
+worker falls behind, the mailbox keeps only the newest frame, so a slow
+publish costs frames instead of delaying LiDAR, commands and SCTP on the
+loop. Options:
+
+- max_fps: frames arriving faster than this are skipped before conversion
+- scale: output size factor, applied by swscale in the same pass as the
+  colorspace conversion
+- output_format: 'bgr8' (converted) or 'i420', the decoder's native planar
+  YUV 4:2:0 layout, which skips the colorspace conversion for the frame
+  ring and the JPEG encoder; image_raw is still published as bgr8, converted
+  only while it has subscribers
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from ...domain.entities import CameraData, RobotData
+from ...application.utils.metrics import get_metrics_registry
+
+logger = logging.getLogger(__name__)
+
+VIDEO_OUTPUT_FORMATS = ("bgr8", "i420")
+
+
+class VideoWorker:
+    """Latest-frame mailbox and conversion thread of one robot's video track"""
+
+    def __init__(self, robot_id: str, publish: Callable[[RobotData], None], max_fps: float = 0.0,
+                 scale: float = 1.0, output_format: str = "bgr8",
+                 demand: Optional[Callable[[], bool]] = None) -> None:
+        """
+        Initialize the video worker.
+
+        Args:
+            robot_id: Robot the video comes from
+            publish: Called with the converted frame on the worker thread
+            max_fps: Output frame rate cap, 0 = every frame
+            scale: Output size factor in (0, 1]
+            output_format: One of VIDEO_OUTPUT_FORMATS
+            demand: Returns whether anyone uses the output; frames are not
+                converted while it returns False
+        """
+        if output_format not in VIDEO_OUTPUT_FORMATS:
+            raise ValueError(
+                f"Unknown video format '{output_format}', expected one of {VIDEO_OUTPUT_FORMATS}")
+        self.robot_id = robot_id
+        self.publish = publish
+        self.period = 1.0 / max_fps if max_fps > 0 else 0.0
+        self.scale = min(max(scale, 0.05), 1.0)
+        self.output_format = output_format
+        self.demand = demand
+
+        self._frame: Optional[Any] = None
+        self._next_due = 0.0
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+
+        # Statistics
+        self.received = 0
+        self.published = 0
+        self.dropped = 0  # replaced in the mailbox before the worker got to it
+        self.skipped = 0  # above max_fps
+        self.unwatched = 0  # not converted, nobody uses the output
+        metrics = get_metrics_registry()
+        self._convert_time = metrics.histogram(
+            "go2_video_seconds", "Video frame conversion and publish time",
+            robot=robot_id, stage="convert")
+        self._publish_time = metrics.histogram(
+            "go2_video_seconds", "Video frame conversion and publish time",
+            robot=robot_id, stage="publish")
+
+    def start(self) -> None:
+        """Start the conversion thread"""
+        if self._thread is not None:
+            return
+        self._running = True
+        self._thread = threading.Thread(
+            target=self._run, name=f"video-{self.robot_id}", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 1.0) -> None:
+        """Stop the conversion thread; a pending frame is discarded"""
+        with self._cond:
+            self._running = False
+            self._frame = None
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+
+    def submit(self, frame: Any) -> None:
+        """
+        Hand a decoded frame to the worker. Never blocks.
+
+        Args:
+            frame: av.VideoFrame from track.recv()
+        """
+        now = time.monotonic()
+        with self._cond:
+            self.received += 1
+            if self.period:
+                if now < self._next_due:
+                    self.skipped += 1
+                    return
+                # Stay on the rate grid unless we fell behind it
+                next_due = self._next_due + self.period
+                self._next_due = next_due if next_due > now else now + self.period
+            if self._frame is not None:
+                self.dropped += 1
+            self._frame = frame
+            self._cond.notify()
+
+    def convert(self, frame: Any) -> CameraData:
+        """Convert an av.VideoFrame to the configured size and format"""
+        width, height = frame.width, frame.height
+        if self.scale < 1.0:
+            # Even sizes keep the 4:2:0 chroma planes whole
+            width = max(2, int(width * self.scale) // 2 * 2)
+            height = max(2, int(height * self.scale) // 2 * 2)
+        resize = {} if (width, height) == (frame.width, frame.height) else {
+            "width": width, "height": height}
+
+        if self.output_format == "i420":
+            if not resize and frame.format.name == "yuv420p":
+                image = frame.to_ndarray()  # planes as decoded, no conversion
+            else:
+                image = frame.to_ndarray(format="yuv420p", **resize)
+        else:
+            image = frame.to_ndarray(format="bgr24", **resize)
+        return CameraData(image=image, height=height, width=width,
+                          encoding=self.output_format)
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while self._running and self._frame is None:
+                    self._cond.wait()
+                if not self._running:
+                    return
+                frame, self._frame = self._frame, None
+            try:
+                if self.demand is not None and not self.demand():
+                    self.unwatched += 1
+                    continue
+                with self._convert_time.time():
+                    camera_data = self.convert(frame)
+                del frame
+                robot_data = RobotData(robot_id=self.robot_id, timestamp=0.0,
+                                       camera_data=camera_data)
+                with self._publish_time.time():
+                    self.publish(robot_data)
+                self.published += 1
+            except Exception as e:
+                logger.error(f"Error processing video frame of robot {self.robot_id}: {e}")
+
+    def stats(self) -> Dict[str, float]:
+        """Return frame counts and mean convert/publish milliseconds"""
+        return {
+            "received": self.received,
+            "published": self.published,
+            "dropped": self.dropped,
+            "skipped": self.skipped,
+            "unwatched": self.unwatched,
+            "convert_ms": self._convert_time.mean * 1e3,
+            "publish_ms": self._publish_time.mean * 1e3,
+        }
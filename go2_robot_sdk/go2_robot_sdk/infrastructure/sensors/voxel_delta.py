@@ -0,0 +1,151 @@
+# Copyright (c) 2024, RoboVerse community
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+Voxel-level delta engine for consecutive voxel map frames.
+The robot resends its whole local map every frame; this computes which
+points appeared and disappeared in integer voxel space so consumers can
+apply small deltas between periodic full keyframes.
+"""
+
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+import numpy as np
+
+# Packed key layout (int64): 18 bits each for x, y, z (signed, biased) and
+# 8 bits intensity. +-131072 voxels is +-6.5 km at 5 cm resolution.
+_AXIS_BITS = 18
+_AXIS_BIAS = 1 << (_AXIS_BITS - 1)
+_AXIS_MASK = (1 << _AXIS_BITS) - 1
+
+EMPTY_POINTS = np.empty((0, 4), dtype=np.float32)
+
+
+@dataclass
+class VoxelDelta:
+    """Result of one engine update"""
+    keyframe: bool
+    unchanged: bool = False
+    points: np.ndarray = field(default_factory=lambda: EMPTY_POINTS)  # full cloud
+    added: np.ndarray = field(default_factory=lambda: EMPTY_POINTS)
+    removed: np.ndarray = field(default_factory=lambda: EMPTY_POINTS)
+
+    @property
+    def empty(self) -> bool:
+        """True if a non-keyframe carries no changes"""
+        return not self.keyframe and len(self.added) == 0 and len(self.removed) == 0
+
+
+def voxel_keys(points: np.ndarray, resolution: float, origin: List[float]) -> np.ndarray:
+    """
+    Pack x, y, z, intensity points into int64 keys in world voxel space.
+
+    Points are local voxel coordinates * resolution + origin; the origin is
+    snapped to the voxel grid so the same world voxel keeps its key when
+    the robot's local map window moves.
+    """
+    origin = np.asarray(origin, dtype=np.float64)
+    local = np.rint((points[:, :3] - origin) / resolution).astype(np.int64)
+    world = local + np.rint(origin / resolution).astype(np.int64) + _AXIS_BIAS
+    np.clip(world, 0, _AXIS_MASK, out=world)
+    intensity = np.clip(np.rint(points[:, 3]), 0, 255).astype(np.int64)
+    return (
+        (world[:, 0] << (2 * _AXIS_BITS + 8))
+        | (world[:, 1] << (_AXIS_BITS + 8))
+        | (world[:, 2] << 8)
+        | intensity
+    )
+
+
+class VoxelDeltaEngine:
+    """Per-robot frame differencing with periodic keyframes"""
+
+    def __init__(self, keyframe_interval: int = 1) -> None:
+        """
+        Args:
+            keyframe_interval: Emit a full keyframe every N frames (1 = every frame)
+        """
+        self.keyframe_interval = max(1, int(keyframe_interval))
+        self.points: Optional[np.ndarray] = None
+        self._keys: Optional[np.ndarray] = None
+        self._resolution: Optional[float] = None
+        self._frames_since_keyframe = 0
+
+        # Statistics
+        self.frames = 0
+        self.keyframes = 0
+        self.unchanged_frames = 0
+
+    @property
+    def has_state(self) -> bool:
+        return self.points is not None
+
+    def reset(self) -> None:
+        """Forget the previous frame; the next update is a keyframe"""
+        self.points = None
+        self._keys = None
+        self._resolution = None
+
+    def update(self, points: Optional[np.ndarray], resolution: float,
+               origin: List[float], unchanged: bool = False, diff: bool = True) -> VoxelDelta:
+        """
+        Diff a frame against the previous one.
+
+        Args:
+            points: (N, 4) float32 x, y, z, intensity cloud; may be None when
+                `unchanged` is set and a previous frame exists
+            resolution: Voxel size in meters
+            origin: Map origin of this frame
+            unchanged: Payload is byte-identical to the previous frame
+            diff: Compute added/removed points; without it no voxel keys are
+                packed, non-keyframes carry no changes and the next frame
+                diffed again is a keyframe
+
+        Returns:
+            VoxelDelta with the full cloud on keyframes and added/removed
+            points otherwise
+        """
+        self.frames += 1
+        self._frames_since_keyframe += 1
+        due = self._frames_since_keyframe >= self.keyframe_interval
+
+        if unchanged and self.has_state:
+            self.unchanged_frames += 1
+            if due:
+                return self._keyframe(unchanged=True)
+            return VoxelDelta(keyframe=False, unchanged=True)
+
+        if not diff or self.keyframe_interval == 1:
+            # Every frame a keyframe, or nobody uses the changes: no keys needed
+            first = not self.has_state or resolution != self._resolution
+            self._store(points, None, resolution)
+            if first or due:
+                return self._keyframe()
+            return VoxelDelta(keyframe=False, points=points)
+
+        keys = voxel_keys(points, resolution, origin)
+        if self._keys is None or resolution != self._resolution or due:
+            self._store(points, keys, resolution)
+            return self._keyframe()
+
+        added = ~np.isin(keys, self._keys, assume_unique=True)
+        removed = ~np.isin(self._keys, keys, assume_unique=True)
+        delta = VoxelDelta(
+            keyframe=False,
+            points=points,
+            added=points[added],
+            removed=self.points[removed],
+        )
+        self._store(points, keys, resolution)
+        return delta
+
+    def _store(self, points: np.ndarray, keys: Optional[np.ndarray], resolution: float) -> None:
+        self.points = points
+        self._keys = keys
+        self._resolution = resolution
+
+    def _keyframe(self, unchanged: bool = False) -> VoxelDelta:
+        self._frames_since_keyframe = 0
+        self.keyframes += 1
+        return VoxelDelta(keyframe=True, unchanged=unchanged, points=self.points)
@@ -0,0 +1,139 @@
+# Copyright (c) 2024, RoboVerse community
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+Bulk memory bridge for wasmtime linear memory.
+Exposes WASM memory as NumPy/memoryview buffers so data moves with slice copies.
+"""
+
+import ctypes
+from typing import Union
+
+import numpy as np
+
+try:
+    from wasmtime import Memory, Store, WasmtimeError
+except ImportError:
+    # Lets the module import without wasmtime; the bridge itself needs it
+    Memory = Store = None
+    WasmtimeError = RuntimeError
+
+WASM_PAGE_SIZE = 65536
+
+BufferLike = Union[bytes, bytearray, memoryview, np.ndarray]
+
+
+class WasmMemoryBridge:
+    """Zero-copy NumPy view onto a wasmtime Memory with bulk read/write helpers"""
+
+    def __init__(self, store: "Store", memory: "Memory") -> None:
+        self.store = store
+        self.memory = memory
+        self.size = 0
+        self.grow_count = 0
+        # copy_memory_region callback statistics
+        self.move_calls = 0
+        self.moved_bytes = 0
+        self.refresh()
+
+    def refresh(self) -> bool:
+        """
+        Rebind the views after the linear memory changed size or moved.
+
+        Returns:
+            True if the views were rebuilt
+        """
+        size = self.memory.data_len(self.store)
+        address = ctypes.cast(self.memory.data_ptr(self.store), ctypes.c_void_p).value
+        if size == self.size and address == getattr(self, "address", None):
+            return False
+
+        self.size = size
+        self.address = address
+        self._raw = (ctypes.c_uint8 * size).from_address(address)
+
+        self.u8 = np.frombuffer(self._raw, dtype=np.uint8)
+        self.i8 = self.u8.view(np.int8)
+        self.i16 = self.u8.view(np.int16)
+        self.u16 = self.u8.view(np.uint16)
+        self.i32 = self.u8.view(np.int32)
+        self.u32 = self.u8.view(np.uint32)
+        self.f32 = self.u8.view(np.float32)
+        self.f64 = self.u8.view(np.float64)
+        return True
+
+    def view(self) -> memoryview:
+        """Return a writable memoryview over the whole linear memory"""
+        return memoryview(self._raw).cast("B")
+
+    def write(self, offset: int, data: BufferLike) -> int:
+        """
+        Copy a buffer into linear memory with a single slice assignment.
+
+        Args:
+            offset: Destination address in WASM memory
+            data: Any contiguous buffer (bytes, memoryview, uint8 array)
+
+        Returns:
+            Number of bytes written
+
+        Raises:
+            ValueError: If the data does not fit at the given offset
+        """
+        src = np.frombuffer(data, dtype=np.uint8)
+        end = offset + src.size
+        if offset < 0 or end > self.size:
+            raise ValueError("Not enough space to insert bytes at the specified index.")
+        self.u8[offset:end] = src
+        return src.size
+
+    def read(self, offset: int, count: int, dtype=np.uint8) -> np.ndarray:
+        """
+        Copy `count` elements of `dtype` out of linear memory.
+
+        The result owns its data, so it stays valid after the WASM module
+        reuses the region on the next call.
+        """
+        nbytes = count * np.dtype(dtype).itemsize
+        if offset < 0 or offset + nbytes > self.size:
+            raise ValueError(f"Read of {nbytes} bytes at {offset} is out of bounds")
+        return np.frombuffer(self._raw, dtype=dtype, count=count, offset=offset).copy()
+
+    def move(self, dest: int, src: int, count: int) -> int:
+        """
+        Overlap-safe bulk move inside linear memory (C memmove semantics).
+
+        Ranges are clipped to the end of memory once up front instead of
+        bounds-checking every byte.
+
+        Returns:
+            Number of bytes moved
+        """
+        count = min(count, self.size - dest, self.size - src)
+        self.move_calls += 1
+        if count <= 0 or dest < 0 or src < 0:
+            return 0
+        ctypes.memmove(self.address + dest, self.address + src, count)
+        self.moved_bytes += count
+        return count
+
+    def grow_to(self, min_size: int) -> bool:
+        """
+        Grow linear memory so it holds at least `min_size` bytes.
+
+        Returns:
+            True if memory is large enough afterwards, False if the module's
+            maximum prevents growing
+        """
+        if min_size <= self.size:
+            return True
+
+        delta_pages = -(-(min_size - self.size) // WASM_PAGE_SIZE)
+        try:
+            self.memory.grow(self.store, delta_pages)
+        except WasmtimeError:
+            return False
+
+        self.grow_count += 1
+        self.refresh()
+        return True
@@ -0,0 +1,147 @@
+# Copyright (c) 2024, RoboVerse community
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+Shared wasmtime engine and on-disk cache of compiled WASM modules.
+The first start compiles libvoxel.wasm and serializes the result; later
+starts deserialize it instead of compiling again.
+"""
+
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+import time
+from importlib import metadata
+from typing import Dict, Optional
+
+try:
+    from wasmtime import Config, Engine, Module
+except ImportError:
+    Config = Engine = Module = None
+
+logger = logging.getLogger(__name__)
+
+# Bump when the cache file layout or engine configuration changes
+CACHE_FORMAT_VERSION = 1
+
+# Environment overrides
+CACHE_DIR_ENV = "GO2_WASM_CACHE_DIR"
+DEBUG_INFO_ENV = "GO2_WASM_DEBUG_INFO"
+
+_lock = threading.Lock()
+_engine: Optional["Engine"] = None
+_modules: Dict[str, "Module"] = {}
+
+
+def debug_info_enabled() -> bool:
+    """DWARF debug info is off unless GO2_WASM_DEBUG_INFO=1"""
+    return os.getenv(DEBUG_INFO_ENV, "0").lower() in ("1", "true", "yes")
+
+
+def get_wasm_engine() -> "Engine":
+    """
+    Return the process-wide wasmtime engine, creating it on first use.
+
+    Raises:
+        ImportError: If wasmtime is not installed
+    """
+    global _engine
+    if Config is None:
+        raise ImportError("wasmtime is required for the WASM LiDAR decoder")
+
+    with _lock:
+        if _engine is None:
+            config = Config()
+            config.wasm_multi_value = True
+            config.debug_info = debug_info_enabled()
+            _engine = Engine(config)
+        return _engine
+
+
+def wasmtime_version() -> str:
+    """Installed wasmtime package version (part of the cache key)"""
+    try:
+        return metadata.version("wasmtime")
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def default_cache_dir() -> str:
+    """$GO2_WASM_CACHE_DIR, else $XDG_CACHE_HOME/go2_robot_sdk/wasm (~/.cache by default)"""
+    override = os.getenv(CACHE_DIR_ENV)
+    if override:
+        return override
+    base = os.getenv("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "go2_robot_sdk", "wasm")
+
+
+def cache_path(wasm_bytes: bytes, name: str, cache_dir: str) -> str:
+    """
+    Cache file for a module, keyed by wasm content hash, wasmtime version
+    and engine settings so stale artifacts are never loaded.
+    """
+    digest = hashlib.sha256(wasm_bytes).hexdigest()[:16]
+    flavour = "debug" if debug_info_enabled() else "release"
+    key = f"{digest}-wasmtime{wasmtime_version()}-{flavour}-v{CACHE_FORMAT_VERSION}"
+    return os.path.join(cache_dir, f"{name}-{key}.cwasm")
+
+
+def load_wasm_module(wasm_path: str, cache_dir: Optional[str] = None) -> "Module":
+    """
+    Load a compiled module, from memory, the on-disk cache or by compiling.
+
+    Args:
+        wasm_path: Path to the .wasm file
+        cache_dir: Cache directory (default: default_cache_dir())
+
+    Returns:
+        Module bound to the shared engine
+    """
+    engine = get_wasm_engine()
+
+    with _lock:
+        module = _modules.get(wasm_path)
+    if module is not None:
+        return module
+
+    start = time.perf_counter()
+    with open(wasm_path, "rb") as f:
+        wasm_bytes = f.read()
+
+    name = os.path.splitext(os.path.basename(wasm_path))[0]
+    path = cache_path(wasm_bytes, name, cache_dir or default_cache_dir())
+
+    module = None
+    if os.path.exists(path):
+        try:
+            module = Module.deserialize_file(engine, path)
+            logger.info(f"Loaded compiled {name} from cache in "
+                        f"{(time.perf_counter() - start) * 1e3:.1f} ms")
+        except Exception as e:
+            logger.warning(f"Ignoring unusable module cache {path}: {e}")
+
+    if module is None:
+        module = Module(engine, wasm_bytes)
+        logger.info(f"Compiled {name} in {(time.perf_counter() - start) * 1e3:.1f} ms")
+        _write_cache(path, module)
+
+    with _lock:
+        return _modules.setdefault(wasm_path, module)
+
+
+def _write_cache(path: str, module: "Module") -> None:
+    """Atomically store a serialized module; a read-only cache is not an error"""
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(module.serialize())
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except OSError as e:
+        logger.warning(f"Could not write module cache {path}: {e}")
@@ -5,11 +5,21 @@ from .webrtc_adapter import WebRTCAdapter
 from .go2_connection import Go2Connection, Go2ConnectionError
 from .http_client import HttpClient, WebRTCHttpError, make_local_request
 from .data_decoder import WebRTCDataDecoder, DataDecodingError, deal_array_buffer
+from .framing import BinaryFrame, FramingError, parse_frame
+from .message_codec import MessageCodec, peek_topic
+from .command_queue import CommandQueue, LatencyStats
+from .velocity_channel import VelocityChannel
+from .reconnect import ReconnectManager, SignalingCache, ConnectionTimings
+from .video_passthrough import EncodedVideoTap, install_video_tap, is_h264_keyframe
 from .crypto import CryptoUtils, ValidationCrypto, PathCalculator, EncryptionError
 
 __all__ = [
     'WebRTCAdapter', 'Go2Connection', 'Go2ConnectionError',
     'HttpClient', 'WebRTCHttpError', 'make_local_request',
     'WebRTCDataDecoder', 'DataDecodingError', 'deal_array_buffer',
+    'BinaryFrame', 'FramingError', 'parse_frame', 'MessageCodec', 'peek_topic',
+    'CommandQueue', 'LatencyStats', 'VelocityChannel',
+    'ReconnectManager', 'SignalingCache', 'ConnectionTimings',
+    'EncodedVideoTap', 'install_video_tap', 'is_h264_keyframe',
     'CryptoUtils', 'ValidationCrypto', 'PathCalculator', 'EncryptionError'
 ] 
\ No newline at end of file
@@ -0,0 +1,119 @@
+# Copyright (c) 2024, RoboVerse community
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+Per-robot command queues for data channel requests.
+Commands are put from the rclpy executor thread and awaited by a sender
+task on the event loop, so they go out as soon as they arrive. Priority
+commands (WebRtcReq.priority = 1) overtake queued normal ones.
+"""
+
+import asyncio
+import itertools
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, Optional
+
+
+@dataclass(order=True)
+class QueuedCommand:
+    """Command waiting to be sent; ordered by priority, then FIFO"""
+    sort_key: tuple
+    payload: str = field(compare=False)
+    enqueued_at: float = field(compare=False)  # time.perf_counter() in the ROS callback
+
+
+class LatencyStats:
+    """Rolling latency statistics over the last `window` samples"""
+
+    def __init__(self, window: int = 256) -> None:
+        self.samples: Deque[float] = deque(maxlen=window)
+        self.count = 0
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        self.samples.append(seconds)
+        self.count += 1
+        self.max = max(self.max, seconds)
+
+    def summary(self) -> Dict[str, float]:
+        """Return count, mean/p50/p95/max in milliseconds"""
+        if not self.samples:
+            return {"count": self.count}
+        ordered = sorted(self.samples)
+        return {
+            "count": self.count,
+            "mean_ms": sum(ordered) / len(ordered) * 1e3,
+            "p50_ms": ordered[len(ordered) // 2] * 1e3,
+            "p95_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1e3,
+            "max_ms": self.max * 1e3,
+        }
+
+
+class CommandQueue:
+    """Thread-safe priority queue of one robot's outgoing commands"""
+
+    def __init__(self, loop: Optional[asyncio.AbstractEventLoop] = None) -> None:
+        """
+        Args:
+            loop: Event loop the sender task runs on; puts from other threads
+                are handed to it with call_soon_threadsafe
+        """
+        self.loop = loop
+        self._queue: asyncio.PriorityQueue = asyncio.PriorityQueue()
+        self._sequence = itertools.count()
+        self.latency = LatencyStats()
+        self.dropped = 0
+
+    def put(self, payload: str, priority: int = 0) -> None:
+        """
+        Queue a command. Safe to call from any thread.
+
+        Args:
+            payload: JSON command string
+            priority: Higher values are sent first
+        """
+        command = QueuedCommand(
+            sort_key=(-priority, next(self._sequence)),
+            payload=payload,
+            enqueued_at=time.perf_counter(),
+        )
+        loop = self.loop
+        if loop is not None and loop.is_running() and not self._on_loop(loop):
+            loop.call_soon_threadsafe(self._queue.put_nowait, command)
+        else:
+            self._queue.put_nowait(command)
+
+    async def get(self) -> QueuedCommand:
+        """Wait for the next command"""
+        return await self._queue.get()
+
+    def task_done(self, command: QueuedCommand, sent: bool = True) -> float:
+        """
+        Mark a command as handled.
+
+        Args:
+            command: Command returned by get()
+            sent: The command reached data_channel.send; only these are timed
+
+        Returns:
+            Seconds from put() to now
+        """
+        self._queue.task_done()
+        latency = time.perf_counter() - command.enqueued_at
+        if sent:
+            self.latency.record(latency)
+        else:
+            self.dropped += 1
+        return latency
+
+    def qsize(self) -> int:
+        return self._queue.qsize()
+
+    @staticmethod
+    def _on_loop(loop: asyncio.AbstractEventLoop) -> bool:
+        try:
+            return asyncio.get_running_loop() is loop
+        except RuntimeError:
+            return False
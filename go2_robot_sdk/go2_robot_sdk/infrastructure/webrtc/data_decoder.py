@@ -6,15 +6,17 @@ Data decoder for Go2 WebRTC binary messages.
 Handles decoding of compressed LiDAR data and other binary messages from WebRTC.
 """
 
-import json
-import struct
+import hashlib
 import logging
-from typing import Optional, Dict, Any, Union
+import time
+from typing import Optional, Dict, Any
+
+from .framing import BufferLike, FramingError, parse_frame
+from ...application.utils.metrics import get_metrics_registry
 try:
-    # Use the working LidarDecoder from infrastructure
-    from ..sensors.lidar_decoder import LidarDecoder as OriginalLidarDecoder
+    from ..sensors.lidar_decoder import get_voxel_decoder
 except ImportError:
-    OriginalLidarDecoder = None
+    get_voxel_decoder = None
 
 
 logger = logging.getLogger(__name__)
@@ -28,105 +30,140 @@ class DataDecodingError(Exception):
 class WebRTCDataDecoder:
     """Decoder for WebRTC binary data messages"""
     
-    def __init__(self, enable_lidar_decoding: bool = True):
+    def __init__(self, enable_lidar_decoding: bool = True, lidar_backend: str = "wasm"):
         """
         Initialize data decoder.
         
         Args:
             enable_lidar_decoding: Whether to decode LiDAR data or keep it compressed
+            lidar_backend: Voxel map decoder backend, 'wasm' (libvoxel.wasm) or 'native' (NumPy)
         """
         self.enable_lidar_decoding = enable_lidar_decoding
+        self.lidar_backend = lidar_backend
         self._lidar_decoder = None
         
+        # Last voxel payload digest and its decode, to skip identical frames
+        self._last_digest: Optional[bytes] = None
+        self._last_decoded: Optional[Dict[str, Any]] = None
+        self.unchanged_frames = 0
+
+        metrics = get_metrics_registry()
+        self._frame_time = metrics.histogram(
+            "go2_decode_seconds", "Binary message decode time", stage="frame")
+        self._lidar_time = metrics.histogram(
+            "go2_decode_seconds", "Binary message decode time",
+            stage="lidar", backend=lidar_backend)
+
         if enable_lidar_decoding:
-            try:
-                if OriginalLidarDecoder:
-                    self._lidar_decoder = OriginalLidarDecoder()
-                    logger.info("Using LidarDecoder")
-                else:
-                    raise ImportError("LiDAR decoder not available")
-            except Exception as e:
-                logger.warning(f"Failed to initialize LiDAR decoder: {e}")
-                self.enable_lidar_decoding = False
+            self._init_lidar_decoder()
+
+    def _init_lidar_decoder(self) -> None:
+        """Create the LiDAR decoder for the configured backend"""
+        try:
+            if get_voxel_decoder:
+                self._lidar_decoder = get_voxel_decoder(self.lidar_backend)
+                decoder_name = type(self._lidar_decoder).__name__
+                logger.info(f"Using {decoder_name} ({self.lidar_backend} backend)")
+            else:
+                raise ImportError("LiDAR decoder not available")
+        except Exception as e:
+            logger.warning(f"Failed to initialize LiDAR decoder: {e}")
+            self.enable_lidar_decoding = False
     
-    def decode_array_buffer(self, buffer: bytes) -> Optional[Dict[str, Any]]:
+    def decode_array_buffer(self, buffer: BufferLike) -> Optional[Dict[str, Any]]:
         """
         Decode binary array buffer from WebRTC data channel.
         
-        The buffer format is:
-        - First 2 bytes: Length of JSON segment (little-endian uint16)
-        - Next 2 bytes: Reserved/padding
-        - Next <length> bytes: JSON metadata
-        - Remaining bytes: Compressed data
+        The frame is parsed by framing.parse_frame; the compressed payload
+        stays a memoryview into `buffer` all the way into the decoder.
         
         Args:
             buffer: Binary data from WebRTC data channel
             
         Returns:
-            Dictionary containing decoded data or None if decoding fails
+            Dictionary containing decoded data or None if decoding fails.
+            Undecoded payloads are returned as memoryview under "compressed_data".
         """
-        if not isinstance(buffer, bytes):
-            logger.error("Buffer must be bytes type")
+        if not isinstance(buffer, (bytes, bytearray, memoryview)):
+            logger.error("Buffer must be a bytes-like object")
             return None
         
-        if len(buffer) < 4:
-            logger.error("Buffer too short, minimum 4 bytes required")
+        start = time.perf_counter()
+        try:
+            frame = parse_frame(buffer)
+        except FramingError as e:
+            logger.error(str(e))
             return None
+        self._frame_time.observe(time.perf_counter() - start)
         
         try:
-            # Extract length of JSON segment (first 2 bytes, little-endian)
-            json_length = struct.unpack("<H", buffer[:2])[0]
-            
-            logger.debug(f"JSON segment length: {json_length}")
-            
-            # Validate buffer length
-            if len(buffer) < 4 + json_length:
-                logger.error(f"Buffer too short for JSON segment. Expected {4 + json_length}, got {len(buffer)}")
-                return None
+            result = frame.metadata
+            compressed_data = frame.payload
             
-            # Extract JSON segment (skip 2 bytes header + 2 bytes padding)
-            json_segment = buffer[4:4 + json_length]
-            
-            # Extract compressed data (remaining bytes)
-            compressed_data = buffer[4 + json_length:]
-            
-            # Decode JSON metadata
-            try:
-                json_str = json_segment.decode("utf-8")
-                metadata = json.loads(json_str)
-            except (UnicodeDecodeError, json.JSONDecodeError) as e:
-                logger.error(f"Failed to decode JSON segment: {e}")
-                return None
-            
-            logger.debug(f"Decoded metadata: {metadata}")
-            
-            # Add compressed data to result
-            result = metadata.copy()
+            logger.debug(f"Decoded metadata: {result}")
             
+            if compressed_data:
+                digest = self.payload_digest(compressed_data, result)
+                result["payload_digest"] = digest
+                if digest == self._last_digest and self._last_decoded is not None:
+                    # Byte-identical to the previous frame: reuse its decode
+                    self.unchanged_frames += 1
+                    result["decoded_data"] = self._last_decoded
+                    result["unchanged"] = True
+                    return result
+
             # Decode LiDAR data if enabled and decoder is available
             if self.enable_lidar_decoding and self._lidar_decoder and compressed_data:
-                try:
-                    decoded_data = self._decode_lidar_data(compressed_data, metadata)
-                    result["decoded_data"] = decoded_data
-                    logger.debug("Successfully decoded LiDAR data")
-                except Exception as e:
-                    logger.warning(f"Failed to decode LiDAR data: {e}")
-                    result["compressed_data"] = compressed_data
+                self._decode_into(result, compressed_data, digest)
             else:
                 result["compressed_data"] = compressed_data
             
             return result
             
-        except struct.error as e:
-            logger.error(f"Failed to unpack buffer header: {e}")
-            return None
         except Exception as e:
             logger.error(f"Unexpected error decoding array buffer: {e}")
             return None
     
-    def _decode_lidar_data(self, compressed_data: bytes, metadata: Dict[str, Any]) -> Dict[str, Any]:
+    def _decode_into(self, result: Dict[str, Any], compressed_data: BufferLike,
+                     digest: bytes) -> None:
+        """Decode a voxel payload into result, keeping it compressed on failure"""
+        try:
+            start = time.perf_counter()
+            decoded_data = self._decode_lidar_data(compressed_data, result)
+            self._lidar_time.observe(time.perf_counter() - start)
+            result["decoded_data"] = decoded_data
+            self.remember_decoded(digest, decoded_data)
+            logger.debug("Successfully decoded LiDAR data")
+        except Exception as e:
+            logger.warning(f"Failed to decode LiDAR data: {e}")
+            result["compressed_data"] = compressed_data
+
+    @staticmethod
+    def payload_digest(compressed_data: BufferLike, metadata: Dict[str, Any]) -> bytes:
         """
-        Decode compressed LiDAR data using WASM decoder.
+        Digest of a voxel payload plus the header fields that affect decoding.
+
+        Args:
+            compressed_data: Compressed voxel map data
+            metadata: Message metadata containing the "data" header
+
+        Returns:
+            16-byte BLAKE2b digest
+        """
+        header = metadata.get("data", {})
+        hasher = hashlib.blake2b(compressed_data, digest_size=16)
+        hasher.update(repr((header.get("origin"), header.get("resolution"))).encode())
+        return hasher.digest()
+
+    def remember_decoded(self, digest: bytes, decoded_data: Dict[str, Any]) -> None:
+        """Cache the decode of a payload so an identical next frame can skip decoding"""
+        self._last_digest = digest
+        self._last_decoded = decoded_data
+
+    def _decode_lidar_data(self, compressed_data: BufferLike,
+                           metadata: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Decode compressed LiDAR data using the configured decoder backend.
         
         Args:
             compressed_data: Compressed voxel map data
@@ -145,8 +182,9 @@ class WebRTCDataDecoder:
             raise DataDecodingError("No compressed data to decode")
         
         try:
-            # Use the original LidarDecoder interface
-            decoded_result = self._lidar_decoder.decode(compressed_data, metadata)
+            # Decoders take the inner "data" header (origin, resolution, ...)
+            header = metadata.get("data", metadata)
+            decoded_result = self._lidar_decoder.decode(compressed_data, header)
             
             return decoded_result
             
@@ -163,50 +201,42 @@ class WebRTCDataDecoder:
         self.enable_lidar_decoding = enabled
         
         if enabled and self._lidar_decoder is None:
-            try:
-                if OriginalLidarDecoder:
-                    self._lidar_decoder = OriginalLidarDecoder()
-                else:
-                    raise ImportError("LiDAR decoder not available")
-            except Exception as e:
-                logger.warning(f"Failed to initialize LiDAR decoder: {e}")
-                self.enable_lidar_decoding = False
+            self._init_lidar_decoder()
 
 
 # Global decoder instance for backward compatibility
 _global_decoder: Optional[WebRTCDataDecoder] = None
 
 
-def get_data_decoder(enable_lidar: bool = True) -> WebRTCDataDecoder:
+def get_data_decoder(enable_lidar: bool = True, lidar_backend: str = "wasm") -> WebRTCDataDecoder:
     """
     Get global data decoder instance.
     
     Args:
         enable_lidar: Whether to enable LiDAR decoding
+        lidar_backend: Voxel map decoder backend, 'wasm' or 'native'
         
     Returns:
         WebRTCDataDecoder instance
     """
     global _global_decoder
     
-    if _global_decoder is None or _global_decoder.enable_lidar_decoding != enable_lidar:
-        _global_decoder = WebRTCDataDecoder(enable_lidar)
+    if (_global_decoder is None
+            or _global_decoder.enable_lidar_decoding != enable_lidar
+            or _global_decoder.lidar_backend != lidar_backend):
+        _global_decoder = WebRTCDataDecoder(enable_lidar, lidar_backend)
     
     return _global_decoder
 
 
-# Create a global decoder instance for backward compatibility
-try:
-    _global_lidar_decoder = OriginalLidarDecoder() if OriginalLidarDecoder else None
-except:
-    _global_lidar_decoder = None
-
-
 # Backward compatibility function
-def deal_array_buffer(buffer: bytes, perform_decode: bool = True) -> Optional[Dict[str, Any]]:
+def deal_array_buffer(buffer: BufferLike, perform_decode: bool = True) -> Optional[Dict[str, Any]]:
     """
     Legacy function for backward compatibility.
     
+    The decoder (and its compiled WASM module) is created lazily on first
+    use instead of at import time.
+
     Args:
         buffer: Binary data buffer
         perform_decode: Whether to decode LiDAR data
@@ -214,32 +244,12 @@ def deal_array_buffer(buffer: bytes, perform_decode: bool = True) -> Optional[Di
     Returns:
         Decoded data dictionary or None
     """
-    if not isinstance(buffer, bytes):
+    if not isinstance(buffer, (bytes, bytearray, memoryview)):
         return None
     
     try:
-        # Use original implementation for full compatibility
-        if _global_lidar_decoder and perform_decode:
-            import struct
-            import json
-            
-            length = struct.unpack("H", buffer[:2])[0]
-            json_segment = buffer[4: 4 + length]
-            compressed_data = buffer[4 + length:]
-            json_str = json_segment.decode("utf-8")
-            obj = json.loads(json_str)
-            
-            if compressed_data:
-                decoded_data = _global_lidar_decoder.decode(compressed_data, obj['data'])
-                obj["decoded_data"] = decoded_data
-            else:
-                obj["compressed_data"] = compressed_data
-            return obj
-        else:
-            # Fallback to new decoder
-            decoder = get_data_decoder(enable_lidar=perform_decode)
-            return decoder.decode_array_buffer(buffer)
-            
+        decoder = get_data_decoder(enable_lidar=perform_decode)
+        return decoder.decode_array_buffer(buffer)
     except Exception as e:
         logger.error(f"Error in deal_array_buffer: {e}")
-        return None 
\ No newline at end of file
+        return None
@@ -0,0 +1,78 @@
+# Copyright (c) 2024, RoboVerse community
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+Zero-copy framing parser for binary data channel messages.
+
+Frame layout:
+- 2 bytes: length of the JSON header (little-endian uint16)
+- 2 bytes: reserved/padding
+- <length> bytes: UTF-8 JSON header
+- remaining bytes: payload (e.g. LZ4-compressed voxel map)
+
+The payload is returned as a memoryview into the received message, so it
+reaches the decoder without intermediate bytes objects.
+"""
+
+import json
+from dataclasses import dataclass
+from typing import Any, Dict, Union
+
+FRAME_HEADER_SIZE = 4
+
+BufferLike = Union[bytes, bytearray, memoryview]
+
+
+class FramingError(Exception):
+    """Custom exception for malformed binary frames"""
+    pass
+
+
+@dataclass
+class BinaryFrame:
+    """Parsed binary message: JSON header plus a view of the payload"""
+    metadata: Dict[str, Any]
+    payload: memoryview
+
+    @property
+    def topic(self) -> str:
+        return self.metadata.get("topic", "")
+
+
+def parse_frame(buffer: BufferLike) -> BinaryFrame:
+    """
+    Parse a binary data channel message without copying the payload.
+
+    Args:
+        buffer: Received message (bytes, bytearray or memoryview)
+
+    Returns:
+        BinaryFrame with the decoded JSON header and a payload memoryview
+
+    Raises:
+        FramingError: If the buffer is truncated or the header is not valid JSON
+    """
+    view = memoryview(buffer)
+    if view.ndim != 1 or view.itemsize != 1:
+        view = view.cast("B")
+
+    if len(view) < FRAME_HEADER_SIZE:
+        raise FramingError(f"Buffer too short, minimum {FRAME_HEADER_SIZE} bytes required")
+
+    json_length = view[0] | (view[1] << 8)
+    payload_start = FRAME_HEADER_SIZE + json_length
+    if len(view) < payload_start:
+        raise FramingError(
+            f"Buffer too short for JSON segment. Expected {payload_start}, got {len(view)}"
+        )
+
+    try:
+        # str() decodes straight from the buffer, no intermediate bytes slice
+        metadata = json.loads(str(view[FRAME_HEADER_SIZE:payload_start], "utf-8"))
+    except (UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise FramingError(f"Failed to decode JSON segment: {e}")
+
+    if not isinstance(metadata, dict):
+        raise FramingError("JSON segment is not an object")
+
+    return BinaryFrame(metadata=metadata, payload=view[payload_start:])
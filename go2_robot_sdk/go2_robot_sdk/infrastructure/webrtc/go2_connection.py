@@ -13,12 +13,18 @@ import asyncio
 import json
 import logging
 import base64
-from typing import Callable, Optional, Any, Dict, Union
+from typing import Callable, Optional, Any, Dict, Tuple, Union
 from aiortc import RTCPeerConnection, RTCSessionDescription, MediaStreamTrack
 
 from .crypto.encryption import CryptoUtils, ValidationCrypto, PathCalculator, EncryptionError
 from .http_client import HttpClient, WebRTCHttpError
 from .data_decoder import WebRTCDataDecoder, DataDecodingError
+from .message_codec import MessageCodec, peek_topic
+from .reconnect import ConnectionTimings, SignalingCache, SignalingMaterial
+from .video_passthrough import EncodedVideoTap, install_video_tap
+from ..sensors.lidar_decode_pool import LidarDecodePool
+from ...application.utils.metrics import get_metrics_registry
+from ...application.utils.tracing import Trace
 from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 
 logger = logging.getLogger(__name__)
@@ -42,6 +48,14 @@ class Go2Connection:
         on_open: Optional[Callable] = None,
         on_video_frame: Optional[Callable] = None,
         decode_lidar: bool = True,
+        lidar_decoder: str = "wasm",
+        decode_pool: Optional[LidarDecodePool] = None,
+        topic_filter: Optional[Callable[[str], bool]] = None,
+        signaling_cache: Optional[SignalingCache] = None,
+        on_closed: Optional[Callable[[str], None]] = None,
+        trace: bool = False,
+        on_encoded_video: Optional[Callable[[str, bytes, int, bool], None]] = None,
+        decode_video: Optional[Callable[[str], bool]] = None,
     ):
         # 使用預設 RTCPeerConnection 配置（不帶 STUN）
         # 在同一 LAN 內，host candidates 通常足夠；STUN 可能在某些 aiortc 版本導致 SCTP 握手問題
@@ -60,10 +74,36 @@ class Go2Connection:
         self.on_open = on_open
         self.on_video_frame = on_video_frame
         self.decode_lidar = decode_lidar
+        # Voxel maps are decoded in the pool when given, inline otherwise
+        self.decode_pool = decode_pool if decode_lidar else None
+        # Text messages whose topic is rejected are dropped before parsing
+        self.topic_filter = topic_filter
+        # Public key and path ending per IP, reused on reconnect
+        self.signaling_cache = signaling_cache
+        # Called once with robot_num when an established connection is lost
+        self.on_closed = on_closed
+        # Attach a stage Trace ("_trace") to every parsed message
+        self.trace = trace
+        # H.264 passthrough: encoded frames go to on_encoded_video, and are
+        # decoded for on_video_frame only while decode_video(robot_num) is True
+        self.on_encoded_video = on_encoded_video
+        self.decode_video = decode_video
+        self.video_tap: Optional[EncodedVideoTap] = None
+        self._channel_open = asyncio.Event()
+        self._closing = False
+        self._closed_notified = False
+        self.timings = ConnectionTimings()
         
         # Initialize components
         self.http_client = HttpClient(timeout=10.0)
-        self.data_decoder = WebRTCDataDecoder(enable_lidar_decoding=decode_lidar)
+        self.data_decoder = WebRTCDataDecoder(
+            enable_lidar_decoding=decode_lidar and self.decode_pool is None,
+            lidar_backend=lidar_decoder
+        )
+        self.message_codec = MessageCodec()
+        self.metrics = get_metrics_registry()
+        # (messages, bytes) counters per topic, looked up once per topic
+        self._rx_metrics: Dict[str, tuple] = {}
         
         # Setup data channel
         self.data_channel = self.pc.createDataChannel("data", id=0)
@@ -87,6 +127,10 @@ class Go2Connection:
     def on_connection_state_change(self) -> None:
         """Handle peer connection state changes"""
         logger.info(f"[診斷] Connection state: {self.pc.connectionState}")
+        if self.pc.connectionState == "connected":
+            self.timings.mark("dtls")
+        elif self.pc.connectionState in ("failed", "closed"):
+            self._notify_closed()
 
         # Note: Validation is handled after successful WebRTC connection
         # in the original implementation, not here
@@ -94,6 +138,8 @@ class Go2Connection:
     def on_ice_connection_state_change(self) -> None:
         """Handle ICE connection state changes"""
         logger.info(f"[診斷] ICE connection state: {self.pc.iceConnectionState}")
+        if self.pc.iceConnectionState in ("completed", "connected"):
+            self.timings.mark("ice")
 
     def on_signaling_state_change(self) -> None:
         """Handle signaling state changes"""
@@ -110,6 +156,7 @@ class Go2Connection:
     def on_data_channel_close(self) -> None:
         """Handle data channel close event"""
         logger.warning(f"[診斷] Data channel closed. State: {self.data_channel.readyState}")
+        self._notify_closed()
 
     def on_data_channel_error(self, error: Exception) -> None:
         """Handle data channel error event"""
@@ -127,54 +174,165 @@ class Go2Connection:
             logger.warning(f"[診斷] ⚠️  Data channel readyState was {self.data_channel.readyState}, forcing to open")
             self.data_channel._setReadyState("open")
 
+        self.timings.mark("sctp_open")
+        self._channel_open.set()
+
         if self.on_open:
             self.on_open()
+
+    def _notify_closed(self) -> None:
+        """Report the loss of an established connection once; not for disconnect()"""
+        if self._closing or self._closed_notified or not self._channel_open.is_set():
+            return
+        self._closed_notified = True
+        logger.warning(f"Connection to robot {self.robot_num} lost")
+        if self.on_closed:
+            try:
+                self.on_closed(self.robot_num)
+            except Exception as e:
+                logger.error(f"Error in connection closed callback: {e}")
     
     def on_data_channel_message(self, message: Union[str, bytes]) -> None:
         """Handle incoming data channel messages"""
+        trace = Trace() if self.trace else None
         try:
-            # 避免在 DEBUG 模式下把整個二進位封包 dump 出來（voxel_map 會非常大）
-            if isinstance(message, bytes):
-                logger.debug("Received binary message (%d bytes)", len(message))
-            else:
-                logger.debug(f"Received message: {message}")
-            
-            # Ensure data channel is marked as open
-            if self.data_channel.readyState != "open":
-                self.data_channel._setReadyState("open")
-            
-            msgobj = None
-            
+            self._mark_channel_open()
             if isinstance(message, str):
-                # Text message - likely JSON
-                try:
-                    msgobj = json.loads(message)
-                    if msgobj.get("type") == "validation":
-                        self.validate_robot_conn(msgobj)
-                except json.JSONDecodeError:
-                    logger.warning("Failed to decode JSON message")
-                    
+                self._handle_text(message, trace)
             elif isinstance(message, bytes):
-                # Binary message - likely compressed data
-                msgobj = legacy_deal_array_buffer(message, perform_decode=self.decode_lidar)
-            
-            # Forward message to callback
-            if self.on_message:
-                self.on_message(message, msgobj, self.robot_num)
-                
+                self._handle_binary(message, trace)
+            else:
+                self._forward(message, None)
         except Exception as e:
             logger.error(f"Error processing data channel message: {e}")
-    
+
+    def _mark_channel_open(self) -> None:
+        """A message arrived, so the data channel is open whatever aiortc reports"""
+        if self.data_channel.readyState != "open":
+            self.data_channel._setReadyState("open")
+        if not self._channel_open.is_set():
+            self.timings.mark("sctp_open")
+            self._channel_open.set()
+
+    def _handle_text(self, message: str, trace: Optional[Trace]) -> None:
+        """JSON message: topic filter, decode, robot validation, then forward"""
+        logger.debug(f"Received message: {message}")
+        topic = peek_topic(message)
+        if topic is not None:
+            self._count_rx(topic, len(message))
+        if self._filtered_out(topic):
+            return
+        msgobj = None
+        try:
+            msgobj = self.message_codec.decode(message)
+        except json.JSONDecodeError:
+            logger.warning("Failed to decode JSON message")
+        else:
+            if topic is None:
+                self._count_rx(msgobj.get("topic", ""), len(message))
+            self._attach_trace(msgobj, trace)
+            if msgobj.get("type") == "validation":
+                self.validate_robot_conn(msgobj)
+        self._forward(message, msgobj)
+
+    def _filtered_out(self, topic: Optional[str]) -> bool:
+        """True if the topic filter drops the message before it is parsed"""
+        if topic is None or self.topic_filter is None:
+            return False
+        return not self.topic_filter(topic)
+
+    def _handle_binary(self, message: bytes, trace: Optional[Trace]) -> None:
+        """Binary frame: decode, hand undecoded voxel maps to the decode pool, else forward"""
+        # 避免在 DEBUG 模式下把整個二進位封包 dump 出來（voxel_map 會非常大）
+        logger.debug("Received binary message (%d bytes)", len(message))
+        msgobj = self.data_decoder.decode_array_buffer(message)
+        self._count_rx(msgobj.get("topic", "") if msgobj else "", len(message))
+        self._attach_trace(msgobj, trace)
+        if self.decode_pool and msgobj and msgobj.get("compressed_data"):
+            self._submit_lidar_decode(message, msgobj)
+            return
+        self._forward(message, msgobj)
+
+    @staticmethod
+    def _attach_trace(msgobj: Optional[Dict[str, Any]], trace: Optional[Trace]) -> None:
+        """Mark the end of parsing and carry the trace with the message"""
+        if trace is not None and msgobj:
+            trace.mark("parse")
+            msgobj["_trace"] = trace
+
+    def _forward(self, message: Union[str, bytes], msgobj: Optional[Dict[str, Any]]) -> None:
+        if self.on_message:
+            self.on_message(message, msgobj, self.robot_num)
+
+    def _count_rx(self, topic: str, size: int) -> None:
+        """Count a received message and its bytes per topic"""
+        counters = self._rx_metrics.get(topic)
+        if counters is None:
+            counters = self._rx_metrics[topic] = (
+                self.metrics.counter("go2_rx_messages_total", "Data channel messages received",
+                                     robot=self.robot_num, topic=topic),
+                self.metrics.counter("go2_rx_bytes_total", "Data channel bytes received",
+                                     robot=self.robot_num, topic=topic),
+            )
+        counters[0].value += 1
+        counters[1].value += size
+
+    def _submit_lidar_decode(self, message: bytes, msgobj: Dict[str, Any]) -> None:
+        """Decode a voxel map in the pool and forward it when the result is ready"""
+        compressed_data = msgobj.pop("compressed_data")
+        future = self.decode_pool.submit(
+            compressed_data, msgobj.get("data", {}), source=self.robot_num
+        )
+
+        def on_decoded(done: asyncio.Future) -> None:
+            try:
+                decoded_data = done.result()
+            except Exception as e:
+                logger.warning(f"Failed to decode LiDAR data: {e}")
+                return
+            # None: dropped under load or superseded by a newer frame
+            if decoded_data is None:
+                return
+            msgobj["decoded_data"] = decoded_data
+            if msgobj.get("_trace") is not None:
+                msgobj["_trace"].mark("decode")
+            if msgobj.get("payload_digest"):
+                self.data_decoder.remember_decoded(msgobj["payload_digest"], decoded_data)
+            try:
+                self._forward(message, msgobj)
+            except Exception as e:
+                logger.error(f"Error processing data channel message: {e}")
+
+        future.add_done_callback(on_decoded)
+
     async def on_track(self, track: MediaStreamTrack) -> None:
         """Handle incoming media tracks (video)"""
         logger.info("Receiving video")
         
         if track.kind == "video" and self.on_video_frame:
+            if self.on_encoded_video:
+                self._install_video_tap(track)
             try:
                 await self.on_video_frame(track, self.robot_num)
             except Exception as e:
                 logger.error(f"Error in video frame callback: {e}")
     
+    def _install_video_tap(self, track: MediaStreamTrack) -> None:
+        """Tap the encoded frames of the video track's receiver"""
+        receiver = next(
+            (t.receiver for t in self.pc.getTransceivers() if t.receiver.track is track), None)
+        if receiver is None:
+            logger.warning("No receiver for the video track, H.264 passthrough disabled")
+            return
+        robot_num = self.robot_num
+        decode_video = self.decode_video
+        self.video_tap = install_video_tap(
+            receiver,
+            on_frame=lambda data, timestamp, keyframe: self.on_encoded_video(
+                robot_num, data, timestamp, keyframe),
+            decode_wanted=(lambda: decode_video(robot_num)) if decode_video else (lambda: True),
+        )
+
     def validate_robot_conn(self, message: Dict[str, Any]) -> None:
         """Handle robot validation response"""
         try:
@@ -267,6 +425,7 @@ class Go2Connection:
 
     async def connect(self) -> None:
         """Establish WebRTC connection to robot with full encryption"""
+        self.timings = ConnectionTimings()
         try:
             logger.info("[診斷] 開始 WebRTC 握手...")
             logger.info(f"[診斷] Connection state: {self.pc.connectionState}")
@@ -277,6 +436,7 @@ class Go2Connection:
             logger.info("[診斷] 步驟 1: 建立 WebRTC Offer...")
             offer = await self.pc.createOffer()
             await self.pc.setLocalDescription(offer)
+            self.timings.mark("offer")
             logger.info(f"[診斷] ✅ Local description set")
             logger.info(f"[診斷] Signaling state after setLocalDescription: {self.pc.signalingState}")
             
@@ -290,34 +450,10 @@ class Go2Connection:
             
             new_sdp = json.dumps(sdp_offer_json)
 
-            # Step 2: Get robot's public key
-            logger.info("[診斷] 步驟 2: 取得機器人公鑰...")
-            try:
-                response = self.http_client.get_robot_public_key(self.robot_ip)
-                if not response:
-                    raise Go2ConnectionError("Failed to get public key response")
-                logger.info(f"[診斷] ✅ 取得公鑰成功")
-                
-                # Decode the response text from base64
-                decoded_response = base64.b64decode(response.text).decode('utf-8')
-                decoded_json = json.loads(decoded_response)
-                
-                # Extract the 'data1' and 'data2' fields from the JSON
-                data1 = decoded_json.get('data1')
-                data2 = decoded_json.get('data2')
-                if not data1:
-                    raise Go2ConnectionError("No data1 field in public key response")
-
-                if data2 == 2:
-                    data1 = self.decrypt_con_notify_data(data1)
-                # Extract the public key from 'data1'
-                public_key_pem = data1[10:len(data1)-10]
-                path_ending = PathCalculator.calc_local_path_ending(data1)
-                
-                logger.info(f"Extracted path ending: {path_ending}")
-                
-            except (WebRTCHttpError, EncryptionError) as e:
-                raise Go2ConnectionError(f"Failed to get robot public key: {e}")
+            # Step 2: Get robot's public key, cached per IP after the first connect
+            material, cached = await self._signaling_material()
+            self.timings.mark("key_fetch")
+            path_ending = material.path_ending
             
             # Step 3: Encrypt and send SDP
             logger.info("[診斷] 步驟 3: 加密並發送 SDP...")
@@ -326,9 +462,7 @@ class Go2Connection:
                 aes_key = CryptoUtils.generate_aes_key()
                 logger.info(f"[診斷] ✅ AES 金鑰已生成")
 
-                # Load Public Key
-                public_key = CryptoUtils.rsa_load_public_key(public_key_pem)
-                logger.info(f"[診斷] ✅ RSA 公鑰已載入")
+                public_key = material.public_key
 
                 # Encrypt the SDP and AES key
                 encrypted_body = {
@@ -339,7 +473,7 @@ class Go2Connection:
 
                 # Send the encrypted data
                 logger.info(f"[診斷] 發送加密 SDP 到機器人...")
-                response = self.http_client.send_encrypted_sdp(
+                response = await self.http_client.async_send_encrypted_sdp(
                     self.robot_ip, path_ending, encrypted_body
                 )
 
@@ -359,31 +493,97 @@ class Go2Connection:
                     type=peer_answer['type']
                 )
                 await self.pc.setRemoteDescription(answer)
-                logger.info(f"[診斷] ✅ Remote description set")
-                logger.info(f"[診斷] Signaling state after setRemoteDescription: {self.pc.signalingState}")
-                logger.info(f"[診斷] ICE connection state after remote desc: {self.pc.iceConnectionState}")
-
-                logger.info(f"[診斷] ✅ WebRTC 握手完成（SDP 交換成功）")
-                logger.info(f"[診斷] ⏳ 等待 data channel 開啟... 這需要 ICE 候選項交換和 DTLS 握手完成")
-                logger.info(f"[診斷] 注意：如果在此步驟卡住超過 30 秒，可能是 SCTP 握手失敗")
-                logger.info(f"Successfully established WebRTC connection to robot {self.robot_num}")
+                self.timings.mark("sdp_exchange")
+            except Exception as e:
+                if cached:
+                    # Rejected, empty or undecryptable answer: the robot may have new
+                    # key material (e.g. after a reboot); fetch it on the next attempt
+                    self.signaling_cache.invalidate(self.robot_ip)
+                if isinstance(e, (WebRTCHttpError, EncryptionError)):
+                    raise Go2ConnectionError(f"Failed to complete encrypted handshake: {e}")
+                raise
+
+            logger.info("[診斷] ✅ Remote description set")
+            logger.info(
+                f"[診斷] Signaling state after setRemoteDescription: {self.pc.signalingState}")
+            logger.info(
+                f"[診斷] ICE connection state after remote desc: {self.pc.iceConnectionState}")
+
+            logger.info("[診斷] ✅ WebRTC 握手完成（SDP 交換成功）")
+            logger.info("[診斷] ⏳ 等待 data channel 開啟... 這需要 ICE 候選項交換和 DTLS 握手完成")
+            logger.info("[診斷] 注意：如果在此步驟卡住超過 30 秒，可能是 SCTP 握手失敗")
+            logger.info(f"Successfully established WebRTC connection to robot {self.robot_num}")
+
+            # Monitor SCTP handshake with timeout
+            await self._monitor_sctp_handshake()
+            logger.info(f"Robot {self.robot_num} connection timings: {self.timings}")
 
-                # Monitor SCTP handshake with timeout
-                await self._monitor_sctp_handshake()
-                
-            except (WebRTCHttpError, EncryptionError) as e:
-                raise Go2ConnectionError(f"Failed to complete encrypted handshake: {e}")
-            
         except Go2ConnectionError:
             raise
         except Exception as e:
             raise Go2ConnectionError(f"Unexpected error during connection: {e}")
 
+    async def _signaling_material(self) -> Tuple[SignalingMaterial, bool]:
+        """Return the robot's signaling material and whether it came from the cache"""
+        material = self.signaling_cache.get(self.robot_ip) if self.signaling_cache else None
+        if material is not None:
+            logger.info("[診斷] 步驟 2: 使用快取的機器人公鑰")
+            return material, True
+        logger.info("[診斷] 步驟 2: 取得機器人公鑰...")
+        material = await self._fetch_signaling_material()
+        if self.signaling_cache is not None:
+            self.signaling_cache.put(self.robot_ip, material)
+        return material, False
+
+    async def _fetch_signaling_material(self) -> SignalingMaterial:
+        """
+        Fetch and decode the robot's public key and connection path ending.
+
+        Returns:
+            Signaling material with the RSA public key loaded
+
+        Raises:
+            Go2ConnectionError: If the key cannot be fetched or decoded
+        """
+        try:
+            response = await self.http_client.async_get_robot_public_key(self.robot_ip)
+            if not response:
+                raise Go2ConnectionError("Failed to get public key response")
+            logger.info("[診斷] ✅ 取得公鑰成功")
+
+            # Decode the response text from base64
+            decoded_response = base64.b64decode(response.text).decode('utf-8')
+            decoded_json = json.loads(decoded_response)
+
+            # Extract the 'data1' and 'data2' fields from the JSON
+            data1 = decoded_json.get('data1')
+            data2 = decoded_json.get('data2')
+            if not data1:
+                raise Go2ConnectionError("No data1 field in public key response")
+
+            if data2 == 2:
+                data1 = self.decrypt_con_notify_data(data1)
+            # Extract the public key from 'data1'
+            public_key_pem = data1[10:len(data1)-10]
+            path_ending = PathCalculator.calc_local_path_ending(data1)
+
+            logger.info(f"Extracted path ending: {path_ending}")
+
+            # Load Public Key
+            public_key = CryptoUtils.rsa_load_public_key(public_key_pem)
+            logger.info("[診斷] ✅ RSA 公鑰已載入")
+
+        except (WebRTCHttpError, EncryptionError) as e:
+            raise Go2ConnectionError(f"Failed to get robot public key: {e}")
+
+        return SignalingMaterial(
+            public_key_pem=public_key_pem, path_ending=path_ending, public_key=public_key
+        )
+
     async def _monitor_sctp_handshake(self, timeout: float = 30.0) -> None:
         """
-        Monitor SCTP handshake completion with timeout.
+        Wait for the data channel open event with timeout.
 
-        This method waits for the data channel to open within the specified timeout.
         If timeout occurs, it indicates SCTP InitChunk failure (Go2 not responding).
 
         Args:
@@ -392,16 +592,13 @@ class Go2Connection:
         import time
 
         start_time = time.time()
-        check_interval = 0.5  # Check every 500ms
-
-        while time.time() - start_time < timeout:
-            # Check if data channel opened
-            if self.data_channel.readyState == "open":
-                elapsed = time.time() - start_time
-                logger.info(f"[診斷] ✅ SCTP 握手成功！Data channel 在 {elapsed:.1f} 秒後開啟")
-                return
-
-            await asyncio.sleep(check_interval)
+        try:
+            await asyncio.wait_for(self._channel_open.wait(), timeout)
+            elapsed = time.time() - start_time
+            logger.info(f"[診斷] ✅ SCTP 握手成功！Data channel 在 {elapsed:.1f} 秒後開啟")
+            return
+        except asyncio.TimeoutError:
+            pass
 
         # Timeout - SCTP handshake failed
         elapsed = time.time() - start_time
@@ -426,6 +623,7 @@ class Go2Connection:
 
     async def disconnect(self) -> None:
         """Close WebRTC connection and cleanup resources"""
+        self._closing = True
         try:
             # Close peer connection
             await self.pc.close()
@@ -451,7 +649,3 @@ class Go2Connection:
 Go2Connection.hex_to_base64 = ValidationCrypto.hex_to_base64
 Go2Connection.encrypt_key = ValidationCrypto.encrypt_key
 Go2Connection.encrypt_by_md5 = ValidationCrypto.encrypt_by_md5
-
-# Use the legacy deal_array_buffer function for full compatibility
-from .data_decoder import deal_array_buffer as legacy_deal_array_buffer
-Go2Connection.deal_array_buffer = staticmethod(legacy_deal_array_buffer) 
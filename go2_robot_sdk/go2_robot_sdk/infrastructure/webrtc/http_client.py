@@ -4,8 +4,11 @@
 """
 HTTP client for Go2 WebRTC signaling.
 Handles HTTP communication with robot for establishing WebRTC connections.
+The async_* variants run the blocking requests calls in a worker thread so
+the event loop keeps serving already-connected robots during signaling.
 """
 
+import asyncio
 import logging
 import requests
 from typing import Optional, Dict, Any
@@ -155,6 +158,21 @@ class HttpClient:
             logger.error(f"Failed to send encrypted SDP: {e}")
             raise
     
+    async def async_get_robot_public_key(self, robot_ip: str) -> Optional[requests.Response]:
+        """get_robot_public_key() without blocking the event loop"""
+        return await asyncio.to_thread(self.get_robot_public_key, robot_ip)
+
+    async def async_send_encrypted_sdp(
+        self,
+        robot_ip: str,
+        path_ending: str,
+        encrypted_data: Dict[str, str]
+    ) -> Optional[requests.Response]:
+        """send_encrypted_sdp() without blocking the event loop"""
+        return await asyncio.to_thread(
+            self.send_encrypted_sdp, robot_ip, path_ending, encrypted_data
+        )
+
     def close(self):
         """Close the HTTP session"""
         if self.session:
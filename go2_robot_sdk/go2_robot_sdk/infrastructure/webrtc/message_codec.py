@@ -0,0 +1,207 @@
+# Copyright (c) 2024, RoboVerse community
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+Typed decoding of text data channel messages.
+
+rt/lf/sportmodestate and rt/lf/lowstate arrive at high rate. With msgspec
+installed their "data" objects are decoded straight into typed structs:
+field types are checked during decoding, unknown fields are skipped without
+being materialized, and msgspec's JSON decoder rejects NaN, Infinity and
+out-of-range numbers, so every float is finite. Decoded messages carry
+`"typed": True` and need no further validation.
+
+Without msgspec, or when a message does not match its schema, messages are
+decoded with json.loads and validated by RobotDataService as before.
+
+peek_topic() reads the topic of a message without parsing it, so messages
+of topics nobody handles can be dropped before any JSON decoding.
+"""
+
+import json
+import logging
+import re
+from typing import Any, Dict, List, Optional, Union
+
+from ...domain.constants import RTC_TOPIC
+from ...domain.entities import IMUData, JointData, RobotState
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+logger = logging.getLogger(__name__)
+
+_TOPIC_KEY = '"topic"'
+_DATA_KEY = '"data"'
+_TOPIC_VALUE = re.compile(r'\s*:\s*"([^"\\]*)"')
+
+
+def peek_topic(message: Union[str, bytes]) -> Optional[str]:
+    """
+    Read the top-level "topic" of a JSON text message without parsing it.
+
+    Only trusted when the "topic" key precedes "data", so a key nested in
+    the payload is never mistaken for the message topic.
+
+    Args:
+        message: JSON text received on the data channel
+
+    Returns:
+        The topic, or None if it cannot be read cheaply and the message
+        has to be parsed
+    """
+    if not isinstance(message, str):
+        return None
+    start = message.find(_TOPIC_KEY)
+    if start < 0:
+        return None
+    data = message.find(_DATA_KEY, 0, start)
+    if data >= 0:
+        return None
+    match = _TOPIC_VALUE.match(message, start + len(_TOPIC_KEY))
+    if match is None:
+        return None
+    return match.group(1) or None
+
+
+if msgspec is not None:
+
+    class ImuState(msgspec.Struct):
+        """imu_state object of rt/lf/sportmodestate"""
+        quaternion: List[float]
+        gyroscope: List[float]
+        accelerometer: List[float]
+        rpy: List[float]
+        temperature: int
+
+        def to_imu_data(self) -> IMUData:
+            return IMUData(
+                quaternion=self.quaternion,
+                accelerometer=self.accelerometer,
+                gyroscope=self.gyroscope,
+                rpy=self.rpy,
+                temperature=self.temperature
+            )
+
+    class SportModeState(msgspec.Struct):
+        """data object of rt/lf/sportmodestate; types follow go2_interfaces/Go2State"""
+        mode: int
+        progress: int
+        gait_type: int
+        position: List[float]
+        body_height: float
+        velocity: List[float]
+        range_obstacle: List[float]
+        foot_force: List[int]
+        foot_position_body: List[float]
+        foot_speed_body: List[float]
+        imu_state: ImuState
+        stamp: Any = None  # robot stamp, if the firmware sends one
+
+        def to_robot_state(self) -> RobotState:
+            return RobotState(
+                mode=self.mode,
+                progress=self.progress,
+                gait_type=self.gait_type,
+                position=self.position,
+                body_height=self.body_height,
+                velocity=self.velocity,
+                range_obstacle=self.range_obstacle,
+                foot_force=self.foot_force,
+                foot_position_body=self.foot_position_body,
+                foot_speed_body=self.foot_speed_body
+            )
+
+    class LowState(msgspec.Struct):
+        """data object of rt/lf/lowstate; only motor_state is decoded"""
+        motor_state: List[Dict[str, Any]]
+
+        def to_joint_data(self) -> JointData:
+            return JointData(motor_state=self.motor_state)
+
+    class _Envelope(msgspec.Struct):
+        """Message envelope; data is kept raw until the topic is known"""
+        type: str = ""
+        topic: str = ""
+        data: msgspec.Raw = msgspec.Raw()
+
+    TYPED_SCHEMAS = {
+        RTC_TOPIC["LF_SPORT_MOD_STATE"]: SportModeState,
+        RTC_TOPIC["LOW_STATE"]: LowState,
+    }
+else:
+    TYPED_SCHEMAS = {}
+
+
+class MessageCodec:
+    """Decode text data channel messages, typed where a schema exists"""
+
+    def __init__(self, typed: bool = True) -> None:
+        """
+        Initialize the codec.
+
+        Args:
+            typed: Use the compiled msgspec decoders when msgspec is installed
+        """
+        self.typed = typed and msgspec is not None
+        if typed and msgspec is None:
+            logger.info("msgspec not installed, state messages use json.loads")
+
+        if self.typed:
+            self._envelope_decoder = msgspec.json.Decoder(_Envelope)
+            self._generic_decoder = msgspec.json.Decoder()
+            self._data_decoders = {
+                topic: msgspec.json.Decoder(schema) for topic, schema in TYPED_SCHEMAS.items()
+            }
+
+        # Statistics
+        self.typed_messages = 0
+        self.schema_mismatches = 0
+
+    def decode(self, message: Union[str, bytes]) -> Any:
+        """
+        Decode one text message.
+
+        Args:
+            message: JSON text received on the data channel
+
+        Returns:
+            Decoded message; for typed topics a dict with "type", "topic",
+            "typed" and a typed "data" struct
+
+        Raises:
+            json.JSONDecodeError: If the message is not valid JSON
+        """
+        if not self.typed:
+            return json.loads(message)
+
+        try:
+            envelope = self._envelope_decoder.decode(message)
+        except msgspec.DecodeError:
+            # Not an object with string type/topic, or json-only syntax (NaN)
+            return json.loads(message)
+
+        data_decoder = self._data_decoders.get(envelope.topic)
+        if data_decoder is not None:
+            try:
+                data = data_decoder.decode(envelope.data)
+            except msgspec.DecodeError as e:
+                self.schema_mismatches += 1
+                logger.debug(f"{envelope.topic} does not match its schema: {e}")
+                return json.loads(message)
+            self.typed_messages += 1
+            return {"type": envelope.type, "topic": envelope.topic, "data": data, "typed": True}
+
+        try:
+            return self._generic_decoder.decode(message)
+        except msgspec.DecodeError:
+            return json.loads(message)
+
+    def stats(self) -> Dict[str, int]:
+        """Return codec counters"""
+        return {
+            "typed": self.typed_messages,
+            "schema_mismatches": self.schema_mismatches,
+        }
@@ -0,0 +1,154 @@
+# Copyright (c) 2024, RoboVerse community
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+Fast reconnect support for Go2 WebRTC connections.
+
+- SignalingCache keeps each robot's public key and path ending per IP, so
+  a reconnect skips the con_notify request, the RSA key load and the path
+  calculation.
+- ConnectionTimings records when each connection phase finished.
+- ReconnectManager retries a lost connection with exponential backoff.
+"""
+
+import asyncio
+import logging
+import random
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SignalingMaterial:
+    """Per-robot signaling data that survives reconnects"""
+    public_key_pem: str
+    path_ending: str
+    public_key: Any = None  # loaded RSA key
+
+
+class SignalingCache:
+    """Signaling material keyed by robot IP"""
+
+    def __init__(self) -> None:
+        self._entries: Dict[str, SignalingMaterial] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, robot_ip: str) -> Optional[SignalingMaterial]:
+        entry = self._entries.get(robot_ip)
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return entry
+
+    def put(self, robot_ip: str, material: SignalingMaterial) -> None:
+        self._entries[robot_ip] = material
+
+    def invalidate(self, robot_ip: str) -> None:
+        """Forget a robot's material, e.g. after the robot rejected it"""
+        self._entries.pop(robot_ip, None)
+
+
+class ConnectionTimings:
+    """Completion times of the phases of one connection attempt"""
+
+    PHASES = ("offer", "key_fetch", "sdp_exchange", "ice", "dtls", "sctp_open")
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.marks: Dict[str, float] = {}
+
+    def mark(self, phase: str) -> None:
+        """Record that `phase` finished; later marks of the same phase are ignored"""
+        self.marks.setdefault(phase, time.perf_counter())
+
+    def durations(self) -> Dict[str, float]:
+        """Return {phase: ms since the previous finished phase} plus "total" """
+        result: Dict[str, float] = {}
+        previous = self.started
+        for phase in self.PHASES:
+            mark = self.marks.get(phase)
+            if mark is None:
+                continue
+            result[phase] = (mark - previous) * 1e3
+            previous = mark
+        result["total"] = (previous - self.started) * 1e3
+        return result
+
+    def __str__(self) -> str:
+        return ", ".join(f"{phase}={ms:.0f}ms" for phase, ms in self.durations().items())
+
+
+class ReconnectManager:
+    """Reconnect lost robots with exponential backoff"""
+
+    def __init__(self, connect: Callable[[str], Awaitable[None]], initial_delay: float = 0.2,
+                 max_delay: float = 10.0, factor: float = 2.0, jitter: float = 0.1) -> None:
+        """
+        Initialize the reconnect manager.
+
+        Args:
+            connect: Coroutine function reconnecting one robot; raises on failure
+            initial_delay: Delay before the first retry in seconds
+            max_delay: Upper bound of the retry delay in seconds
+            factor: Delay multiplier after each failed attempt
+            jitter: Relative random spread of each delay
+        """
+        self.connect = connect
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.factor = factor
+        self.jitter = jitter
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+        # Statistics
+        self.reconnects = 0
+        self.failed_attempts = 0
+        self.last_outage: Dict[str, float] = {}  # seconds without connection, per robot
+
+    def delay(self, attempt: int) -> float:
+        """Backoff delay before retry number `attempt` (0-based)"""
+        delay = min(self.max_delay, self.initial_delay * self.factor ** attempt)
+        return delay * (1.0 + random.uniform(-self.jitter, self.jitter))
+
+    def is_reconnecting(self, robot_id: str) -> bool:
+        task = self._tasks.get(robot_id)
+        return task is not None and not task.done()
+
+    def schedule(self, robot_id: str) -> None:
+        """Start reconnecting a robot unless already in progress. Call on the event loop"""
+        if self.is_reconnecting(robot_id):
+            return
+        self._tasks[robot_id] = asyncio.ensure_future(self.run(robot_id))
+
+    async def run(self, robot_id: str) -> None:
+        """Retry until the robot is connected again"""
+        lost_at = time.perf_counter()
+        attempt = 0
+        while True:
+            await asyncio.sleep(self.delay(attempt))
+            try:
+                await self.connect(robot_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.failed_attempts += 1
+                attempt += 1
+                logger.warning(f"Reconnect attempt {attempt} to robot {robot_id} failed: {e}")
+                continue
+            outage = time.perf_counter() - lost_at
+            self.reconnects += 1
+            self.last_outage[robot_id] = outage
+            logger.info(
+                f"Robot {robot_id} reconnected after {outage:.2f}s ({attempt + 1} attempts)")
+            return
+
+    def cancel(self) -> None:
+        """Stop all reconnect attempts"""
+        for task in self._tasks.values():
+            task.cancel()
+        self._tasks.clear()
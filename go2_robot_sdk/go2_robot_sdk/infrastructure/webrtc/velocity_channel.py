@@ -0,0 +1,117 @@
+# Copyright (c) 2024, RoboVerse community
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+Fixed-rate velocity channel for cmd_vel.
+The ROS side only stores the latest Twist; a task on the event loop sends
+it at a fixed rate, so bursts from Nav2/teleop never turn into bursts of
+data channel messages or cross-thread scheduling.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Callable, Optional, Tuple
+
+from ...application.utils.command_generator import MoveCommandTemplate
+
+logger = logging.getLogger(__name__)
+
+Velocity = Tuple[float, float, float]
+ZERO_VELOCITY: Velocity = (0.0, 0.0, 0.0)
+
+
+class VelocityChannel:
+    """Latest-value velocity command sender of one robot"""
+
+    def __init__(self, send: Callable[[str], None], rate: float = 20.0, timeout: float = 0.5,
+                 keepalive: float = 0.25) -> None:
+        """
+        Initialize the velocity channel.
+
+        Args:
+            send: Sends a command string on the data channel (event loop thread)
+            rate: Send rate in Hz
+            timeout: Seconds without a new Twist after which the velocity is zeroed
+            keepalive: Identical non-zero commands are re-sent at this interval
+                so the robot keeps moving; identical zero commands are not re-sent
+        """
+        self.send = send
+        self.period = 1.0 / max(rate, 1e-3)
+        self.timeout = timeout
+        self.keepalive = keepalive
+        self._templates = {False: MoveCommandTemplate(False), True: MoveCommandTemplate(True)}
+
+        # Written by the ROS thread as a single tuple assignment
+        self._latest: Optional[Tuple[Velocity, bool, float]] = None
+        self._last_sent: Optional[Tuple[Velocity, bool]] = None
+        self._last_sent_at = 0.0
+
+        # Statistics
+        self.received = 0
+        self.sent = 0
+        self.skipped = 0
+        self.timeouts = 0
+
+    def set(self, x: float, y: float, z: float, obstacle_avoidance: bool = False) -> None:
+        """
+        Store the latest velocity. Safe to call from any thread.
+
+        Args:
+            x: Forward/backward velocity
+            y: Left/right velocity
+            z: Rotation velocity
+            obstacle_avoidance: Use the obstacle avoidance move command
+        """
+        velocity = (round(x, 2), round(y, 2), round(z, 2))
+        self._latest = (velocity, obstacle_avoidance, time.monotonic())
+        self.received += 1
+
+    def tick(self, now: float) -> Optional[str]:
+        """
+        Decide what to send at `now`.
+
+        Returns:
+            The command to send, or None
+        """
+        latest = self._latest
+        if latest is None:
+            return None
+        velocity, obstacle_avoidance, stamp = latest
+        if now - stamp > self.timeout and velocity != ZERO_VELOCITY:
+            # Safety stop: the publisher went quiet while the robot was moving.
+            # _latest is left alone so a concurrent set() is never overwritten.
+            velocity = ZERO_VELOCITY
+            if self._last_sent is not None and self._last_sent[0] != ZERO_VELOCITY:
+                self.timeouts += 1
+                logger.warning(f"cmd_vel timed out after {self.timeout}s, stopping")
+
+        command = (velocity, obstacle_avoidance)
+        if command == self._last_sent:
+            if velocity == ZERO_VELOCITY or now - self._last_sent_at < self.keepalive:
+                self.skipped += 1
+                return None
+
+        self._last_sent = command
+        self._last_sent_at = now
+        return self._templates[obstacle_avoidance].render(*velocity)
+
+    async def run(self) -> None:
+        """Send the latest velocity at the configured rate"""
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time()
+        while True:
+            try:
+                payload = self.tick(time.monotonic())
+                if payload is not None:
+                    self.send(payload)
+                    self.sent += 1
+            except Exception as e:
+                logger.error(f"Error sending velocity command: {e}")
+            next_tick += self.period
+            delay = next_tick - loop.time()
+            if delay < 0:
+                # Fell behind (blocked loop); restart the schedule instead of bursting
+                next_tick = loop.time()
+                delay = 0
+            await asyncio.sleep(delay)
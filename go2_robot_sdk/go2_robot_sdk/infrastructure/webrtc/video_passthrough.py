@@ -0,0 +1,124 @@
+# Copyright (c) 2024, RoboVerse community
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+H.264 passthrough: encoded frames straight from the aiortc receiver.
+
+aiortc's RTCRtpReceiver reassembles every encoded frame on the event loop
+and puts it on a queue.Queue that its decoder thread drains. EncodedVideoTap
+takes the place of that queue: each reassembled frame (Annex B NAL units)
+is handed to a callback first and forwarded to the decoder only while
+decoded frames are wanted, so an unwatched raw image costs no decoding.
+When decoding is switched on mid-stream, forwarding starts at the next
+keyframe so the decoder never sees a frame without its references.
+
+The queue is a private attribute of RTCRtpReceiver (aiortc 1.9); with
+other versions install_video_tap logs a warning and leaves decoding as is.
+"""
+
+import logging
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+DECODER_QUEUE_ATTR = "_RTCRtpReceiver__decoder_queue"
+
+# H.264 NAL unit types that start a decodable sequence: IDR slice, SPS
+H264_KEYFRAME_NAL_TYPES = (5, 7)
+
+
+def is_h264_keyframe(data: bytes) -> bool:
+    """True if the Annex B access unit contains an IDR slice or an SPS"""
+    start = data.find(b"\x00\x00\x01")
+    while start >= 0 and start + 3 < len(data):
+        if data[start + 3] & 0x1F in H264_KEYFRAME_NAL_TYPES:
+            return True
+        start = data.find(b"\x00\x00\x01", start + 3)
+    return False
+
+
+class EncodedVideoTap:
+    """Stand-in for the receiver's decoder queue that taps encoded frames"""
+
+    def __init__(self, queue: Any, on_frame: Callable[[bytes, int, bool], None],
+                 decode_wanted: Callable[[], bool]) -> None:
+        """
+        Initialize the tap.
+
+        Args:
+            queue: The receiver's original decoder queue
+            on_frame: Called as on_frame(data, rtp_timestamp, keyframe) on the event loop
+            decode_wanted: Returns whether decoded frames are needed right now
+        """
+        self._queue = queue
+        self.on_frame = on_frame
+        self.decode_wanted = decode_wanted
+        self._decoding = False
+
+        # Statistics
+        self.frames = 0
+        self.keyframes = 0
+        self.decoded = 0  # forwarded to the decoder
+        self.waiting = 0  # not forwarded while waiting for a keyframe
+
+    def put(self, item: Any, *args: Any, **kwargs: Any) -> None:
+        if item is None:
+            # Receiver stopped: let the decoder thread exit
+            self._queue.put(item, *args, **kwargs)
+            return
+        _, encoded_frame = item
+        data = encoded_frame.data
+        keyframe = is_h264_keyframe(data)
+        self.frames += 1
+        self.keyframes += keyframe
+        try:
+            self.on_frame(data, encoded_frame.timestamp, keyframe)
+        except Exception as e:
+            logger.error(f"Error in encoded video callback: {e}")
+
+        if not self.decode_wanted():
+            self._decoding = False
+            return
+        if not self._decoding:
+            if not keyframe:
+                self.waiting += 1
+                return
+            self._decoding = True
+        self.decoded += 1
+        self._queue.put(item, *args, **kwargs)
+
+    def __getattr__(self, name: str) -> Any:
+        # get() and the rest of the queue.Queue interface for the decoder thread
+        return getattr(self._queue, name)
+
+    def stats(self) -> dict:
+        return {
+            "frames": self.frames,
+            "keyframes": self.keyframes,
+            "decoded": self.decoded,
+            "waiting": self.waiting,
+        }
+
+
+def install_video_tap(receiver: Any, on_frame: Callable[[bytes, int, bool], None],
+                      decode_wanted: Callable[[], bool]) -> Optional[EncodedVideoTap]:
+    """
+    Put an EncodedVideoTap between an RTCRtpReceiver and its decoder.
+
+    Args:
+        receiver: aiortc RTCRtpReceiver of the video track
+        on_frame: Called with every encoded frame
+        decode_wanted: Returns whether decoded frames are needed
+
+    Returns:
+        The tap, or None if this aiortc version has no decoder queue to tap
+    """
+    queue = getattr(receiver, DECODER_QUEUE_ATTR, None)
+    if queue is None or not hasattr(queue, "put"):
+        logger.warning("aiortc receiver has no decoder queue, H.264 passthrough disabled")
+        return None
+    if isinstance(queue, EncodedVideoTap):
+        return queue
+    tap = EncodedVideoTap(queue, on_frame, decode_wanted)
+    setattr(receiver, DECODER_QUEUE_ATTR, tap)
+    return tap
@@ -2,15 +2,18 @@
 # SPDX-License-Identifier: BSD-3-Clause
 
 import asyncio
-import json
 import logging
-from typing import Callable, Dict, Any
+from typing import Callable, Dict, Any, Optional
 
 from ...domain.interfaces import IRobotDataReceiver, IRobotController
 from ...domain.entities import RobotData, RobotConfig
 from .go2_connection import Go2Connection
-from ...application.utils.command_generator import gen_command, gen_mov_command
-from ...domain.constants import ROBOT_CMD, RTC_TOPIC
+from .command_queue import CommandQueue
+from .velocity_channel import VelocityChannel
+from .reconnect import ReconnectManager, SignalingCache
+from ..sensors.lidar_decode_pool import LidarDecodePool
+from ...application.utils.command_generator import gen_command
+from ...domain.constants import ROBOT_CMD
 
 logger = logging.getLogger(__name__)
 
@@ -18,13 +21,23 @@ logger = logging.getLogger(__name__)
 class WebRTCAdapter(IRobotDataReceiver, IRobotController):
     """WebRTC adapter for robot communication"""
 
-    def __init__(self, config: RobotConfig, on_validated_callback: Callable, on_video_frame_callback: Callable = None, event_loop=None):
+    def __init__(self, config: RobotConfig, on_validated_callback: Callable,
+                 on_video_frame_callback: Callable = None, event_loop=None,
+                 on_encoded_video_callback: Optional[
+                     Callable[[str, bytes, int, bool], None]] = None,
+                 decode_video_callback: Optional[Callable[[str], bool]] = None):
         self.config = config
         self.connections: Dict[str, Go2Connection] = {}
         self.data_callback: Callable[[RobotData], None] = None
-        self.webrtc_msgs = asyncio.Queue()
+        self.topic_filter: Optional[Callable[[str], bool]] = None
         self.on_validated_callback = on_validated_callback
         self.on_video_frame_callback = on_video_frame_callback
+        # H.264 passthrough (video_passthrough): encoded frames, decoded only on demand
+        self.on_encoded_video_callback = on_encoded_video_callback
+        self.decode_video_callback = decode_video_callback
+        # One decode pool shared by all robots, created on first connect and
+        # kept through reconnects until close()
+        self.decode_pool: Optional[LidarDecodePool] = None
         # Store the event loop (passed from main thread or detect current)
         if event_loop:
             self.main_loop = event_loop
@@ -33,6 +46,22 @@ class WebRTCAdapter(IRobotDataReceiver, IRobotController):
                 self.main_loop = asyncio.get_running_loop()
             except RuntimeError:
                 self.main_loop = None
+        # One command queue per robot, filled from the ROS thread, drained on the loop
+        self.command_queues: Dict[str, CommandQueue] = {
+            robot_id: CommandQueue(self.main_loop) for robot_id in config.robot_ids
+        }
+        # Lost connections are re-established with cached signaling material
+        self.signaling_cache = SignalingCache()
+        self.reconnect_manager = ReconnectManager(self.reconnect)
+        # Latest cmd_vel per robot, sent at a fixed rate by run_velocity_channel
+        self.velocity_channels: Dict[str, VelocityChannel] = {
+            robot_id: VelocityChannel(
+                send=lambda command, robot_id=robot_id: self._send_on_loop(robot_id, command),
+                rate=config.cmd_vel_rate,
+                timeout=config.cmd_vel_timeout,
+            )
+            for robot_id in config.robot_ids
+        }
 
     async def connect(self, robot_id: str) -> None:
         """Connect to robot via WebRTC"""
@@ -40,6 +69,13 @@ class WebRTCAdapter(IRobotDataReceiver, IRobotController):
             robot_idx = int(robot_id)
             robot_ip = self.config.robot_ip_list[robot_idx]
             
+            if (self.decode_pool is None and self.config.decode_lidar
+                    and self.config.lidar_decode_workers > 0):
+                self.decode_pool = LidarDecodePool(
+                    workers=self.config.lidar_decode_workers,
+                    backend=self.config.lidar_decoder,
+                )
+
             conn = Go2Connection(
                 robot_ip=robot_ip,
                 robot_num=robot_id,
@@ -48,18 +84,45 @@ class WebRTCAdapter(IRobotDataReceiver, IRobotController):
                 on_message=self._on_data_channel_message,
                 on_video_frame=self.on_video_frame_callback if self.config.enable_video else None,
                 decode_lidar=self.config.decode_lidar,
+                lidar_decoder=self.config.lidar_decoder,
+                decode_pool=self.decode_pool,
+                topic_filter=self.topic_filter,
+                signaling_cache=self.signaling_cache,
+                on_closed=self._on_connection_lost,
+                trace=self.config.trace_stamps or self.config.use_robot_stamp,
+                on_encoded_video=(
+                    self.on_encoded_video_callback if self.config.video_passthrough else None),
+                decode_video=self.decode_video_callback,
             )
             
             self.connections[robot_id] = conn
             await conn.connect()
             await conn.disableTrafficSaving(True)
             
-            logger.info(f"Connected to robot {robot_id} at {robot_ip}")
+            logger.info(f"Connected to robot {robot_id} at {robot_ip} ({conn.timings})")
             
         except Exception as e:
             logger.error(f"Failed to connect to robot {robot_id}: {e}")
+            # Don't leave a half-open connection behind for senders to use
+            await self.disconnect(robot_id)
             raise
 
+    async def reconnect(self, robot_id: str) -> None:
+        """Replace a robot's connection with a fresh one"""
+        old = self.connections.pop(robot_id, None)
+        if old is not None:
+            await old.disconnect()
+        await self.connect(robot_id)
+
+    def _on_connection_lost(self, robot_id: str) -> None:
+        """Start reconnecting a robot whose established connection dropped"""
+        self.reconnect_manager.schedule(robot_id)
+
+    def connection_timings(self, robot_id: str) -> Dict[str, float]:
+        """Per-phase durations in ms of the robot's last connection attempt"""
+        connection = self.connections.get(robot_id)
+        return connection.timings.durations() if connection else {}
+
     async def disconnect(self, robot_id: str) -> None:
         """Disconnect from robot"""
         if robot_id in self.connections:
@@ -75,10 +138,30 @@ class WebRTCAdapter(IRobotDataReceiver, IRobotController):
             except Exception as e:
                 logger.error(f"Error disconnecting from robot {robot_id}: {e}")
 
+    async def close(self) -> None:
+        """Stop reconnecting, disconnect every robot and stop the decode workers"""
+        self.reconnect_manager.cancel()
+        for robot_id in list(self.connections):
+            await self.disconnect(robot_id)
+        if self.decode_pool:
+            self.decode_pool.shutdown()
+            self.decode_pool = None
+
     def set_data_callback(self, callback: Callable[[RobotData], None]) -> None:
         """Set callback for data reception"""
         self.data_callback = callback
 
+    def set_topic_filter(self, topic_filter: Optional[Callable[[str], bool]]) -> None:
+        """
+        Set the predicate deciding which topics are parsed at all.
+
+        Applies to all current and future connections. Text messages whose
+        topic is rejected are dropped before JSON decoding.
+        """
+        self.topic_filter = topic_filter
+        for connection in self.connections.values():
+            connection.topic_filter = topic_filter
+
     def send_command(self, robot_id: str, command: str) -> None:
         """Send command to robot"""
         if robot_id in self.connections:
@@ -87,14 +170,14 @@ class WebRTCAdapter(IRobotDataReceiver, IRobotController):
                 if hasattr(connection, 'data_channel') and connection.data_channel:
                     # Use asyncio.run_coroutine_threadsafe to handle cross-thread calls
                     loop = self._get_or_create_event_loop()
-                    if loop and loop.is_running():
+                    if loop and loop.is_running() and not self._on_event_loop(loop):
                         # Schedule the coroutine in the existing loop
                         asyncio.run_coroutine_threadsafe(
                             self._async_send_command(connection, command),
                             loop
                         )
                     else:
-                        # Fallback to synchronous send
+                        # Already on the loop (asyncio executor mode) or no loop: send directly
                         connection.data_channel.send(command)
                     logger.debug(f"Command sent to robot {robot_id}: {command[:50]}")
                 else:
@@ -111,6 +194,13 @@ class WebRTCAdapter(IRobotDataReceiver, IRobotController):
             # If no current loop, return the main loop stored during init
             return self.main_loop
 
+    @staticmethod
+    def _on_event_loop(loop: asyncio.AbstractEventLoop) -> bool:
+        try:
+            return asyncio.get_running_loop() is loop
+        except RuntimeError:
+            return False
+
     async def _async_send_command(self, connection, command: str):
         """Async wrapper for sending commands"""
         try:
@@ -120,17 +210,12 @@ class WebRTCAdapter(IRobotDataReceiver, IRobotController):
             logger.error(f"Error in async send command: {e}")
 
     def send_movement_command(self, robot_id: str, x: float, y: float, z: float) -> None:
-        """Send movement command to robot"""
-        try:
-            command = gen_mov_command(
-                round(x, 2), 
-                round(y, 2), 
-                round(z, 2), 
-                self.config.obstacle_avoidance
-            )
-            self.send_command(robot_id, command)
-        except Exception as e:
-            logger.error(f"Error sending movement command: {e}")
+        """Store the latest velocity; the robot's velocity channel sends it"""
+        channel = self.velocity_channels.get(robot_id)
+        if channel is None:
+            logger.warning(f"No velocity channel for robot {robot_id}")
+            return
+        channel.set(x, y, z, self.config.obstacle_avoidance)
 
     def send_stand_up_command(self, robot_id: str) -> None:
         """Send stand up command"""
@@ -151,35 +236,59 @@ class WebRTCAdapter(IRobotDataReceiver, IRobotController):
         except Exception as e:
             logger.error(f"Error sending stand down command: {e}")
 
-    def send_webrtc_request(self, robot_id: str, api_id: int, parameter: Any, topic: str) -> None:
-        """Send WebRTC request"""
+    def send_webrtc_request(self, robot_id: str, api_id: int, parameter: Any, topic: str,
+                            priority: int = 0) -> None:
+        """Queue a WebRTC request; the robot's command sender sends it immediately"""
         try:
+            queue = self.command_queues.get(robot_id)
+            if queue is None:
+                logger.warning(f"No command queue for robot {robot_id}")
+                return
             payload = gen_command(api_id, parameter, topic)
-            self.webrtc_msgs.put_nowait(payload)
-            logger.debug(f"WebRTC request queued for robot {robot_id}")
+            queue.put(payload, priority)
+            logger.debug(f"WebRTC request queued for robot {robot_id} (priority {priority})")
         except Exception as e:
             logger.error(f"Error sending WebRTC request: {e}")
 
-    def process_webrtc_commands(self, robot_id: str) -> None:
-        """Process WebRTC commands from queue"""
+    async def run_command_sender(self, robot_id: str) -> None:
+        """Send queued commands of one robot as soon as they arrive"""
+        queue = self.command_queues[robot_id]
         while True:
+            command = await queue.get()
+            connection = self.connections.get(robot_id)
+            if connection is None or not connection.data_channel:
+                queue.task_done(command, sent=False)
+                logger.warning(f"No data channel available for robot {robot_id}, command dropped")
+                continue
             try:
-                message = self.webrtc_msgs.get_nowait()
-                try:
-                    self.send_command(robot_id, message)
-                finally:
-                    self.webrtc_msgs.task_done()
-            except asyncio.QueueEmpty:
-                break
+                connection.data_channel.send(command.payload)
+            except Exception as e:
+                queue.task_done(command, sent=False)
+                logger.error(f"Error sending command to robot {robot_id}: {e}")
+                continue
+            latency = queue.task_done(command)
+            logger.debug(
+                f"Command sent to robot {robot_id} {latency * 1e3:.2f} ms after its request")
+
+    async def run_velocity_channel(self, robot_id: str) -> None:
+        """Send the latest cmd_vel of one robot at the configured rate"""
+        await self.velocity_channels[robot_id].run()
+
+    def _send_on_loop(self, robot_id: str, command: str) -> None:
+        """Send a command from the event loop thread; dropped while not connected"""
+        connection = self.connections.get(robot_id)
+        if connection is None or not connection.data_channel:
+            return
+        connection.data_channel.send(command)
+
+    def command_latency(self, robot_id: str) -> Dict[str, float]:
+        """ROS callback to data_channel.send latency summary of one robot"""
+        queue = self.command_queues.get(robot_id)
+        return queue.latency.summary() if queue else {}
 
     def _on_validated(self, robot_id: str) -> None:
-        """Callback after connection validation"""
+        """Callback after connection validation; topic subscriptions are up to the callback"""
         try:
-            if robot_id in self.connections:
-                for topic in RTC_TOPIC.values():
-                    self.connections[robot_id].data_channel.send(
-                        json.dumps({"type": "subscribe", "topic": topic}))
-            
             if self.on_validated_callback:
                 self.on_validated_callback(robot_id)
                 
@@ -7,23 +7,21 @@ Implements clean architecture with real-time data publishing
 """
 
 import asyncio
-import threading
 import rclpy
-from rclpy.executors import SingleThreadedExecutor
 
 from .presentation.go2_driver_node import Go2DriverNode
+from .infrastructure.ros2.executors import spin_node
 
 
 async def run_robot_connections(node: Go2DriverNode):
     """Start robot connections"""
     try:
-        # Connect to robots
-        await node.connect_robots()
+        # Connect to robots concurrently; robots that failed are skipped
+        robot_ids = await node.connect_robots()
 
-        # Start control loops for each robot
+        # Start control loops for each connected robot
         tasks = []
-        for i in range(len(node.config.robot_ip_list)):
-            robot_id = str(i)
+        for robot_id in robot_ids:
             task = asyncio.create_task(node.run_robot_control_loop(robot_id))
             tasks.append(task)
 
@@ -35,31 +33,6 @@ async def run_robot_connections(node: Go2DriverNode):
         raise
 
 
-async def spin_node(node: Go2DriverNode):
-    """Run ROS2 node in a separate thread"""
-    executor = SingleThreadedExecutor()
-    executor.add_node(node)
-    
-    def spin_thread():
-        try:
-            executor.spin()
-        except Exception as e:
-            node.get_logger().error(f"Error in ROS2 spin: {e}")
-        finally:
-            executor.shutdown()
-
-    # Start in a separate thread
-    thread = threading.Thread(target=spin_thread, daemon=True)
-    thread.start()
-
-    try:
-        # Wait for node to finish
-        while rclpy.ok():
-            await asyncio.sleep(0.1)
-    finally:
-        thread.join(timeout=1.0)
-
-
 async def main_async():
     """Main asynchronous function"""
     # Initialize ROS2
@@ -71,8 +44,13 @@ async def main_async():
         node = Go2DriverNode(event_loop=current_loop)
         
         # Run ROS2 node and robot connections in parallel
-        ros_task = asyncio.create_task(spin_node(node))
+        ros_task = asyncio.create_task(spin_node(
+            node,
+            mode=node.config.executor,
+            num_threads=node.config.executor_threads,
+        ))
         robot_task = asyncio.create_task(run_robot_connections(node))
+        heartbeat_task = asyncio.create_task(node.run_heartbeat())
 
         # Wait for any task to complete
         done, pending = await asyncio.wait(
@@ -81,6 +59,7 @@ async def main_async():
         )
 
         # Cancel unfinished tasks
+        pending.add(heartbeat_task)
         for task in pending:
             task.cancel()
             try:
@@ -106,8 +85,14 @@ async def main_async():
         try:
             # Disconnect from robots
             if 'node' in locals() and hasattr(node, 'webrtc_adapter'):
-                for robot_id in node.webrtc_adapter.connections:
-                    await node.webrtc_adapter.disconnect(robot_id)
+                await node.webrtc_adapter.close()
+            if 'node' in locals() and hasattr(node, 'ingest_stage'):
+                node.ingest_stage.stop()
+            if 'node' in locals() and hasattr(node, 'video_workers'):
+                for worker in node.video_workers.values():
+                    worker.stop()
+            if 'node' in locals() and hasattr(node, 'ros2_publisher'):
+                node.ros2_publisher.close()
             
             # Close unfinished tasks
             tasks = [t for t in asyncio.all_tasks() if not t.done()]
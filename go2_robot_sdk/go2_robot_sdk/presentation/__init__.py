@@ -2,5 +2,6 @@
 Presentation layer - user interface (ROS2 node)
 """
 from .go2_driver_node import Go2DriverNode
+from .go2_supervisor_node import Go2SupervisorNode
 
-__all__ = ['Go2DriverNode'] 
\ No newline at end of file
+__all__ = ['Go2DriverNode', 'Go2SupervisorNode']
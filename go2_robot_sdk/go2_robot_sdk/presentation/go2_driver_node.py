@@ -4,11 +4,13 @@
 import asyncio
 import logging
 import os
-from typing import Dict, Any
+import time
+from typing import Dict, Any, List, Set
 
 from aiortc import MediaStreamTrack
 from cv_bridge import CvBridge
 
+from rclpy.callback_groups import MutuallyExclusiveCallbackGroup
 from rclpy.node import Node
 from rclpy.qos import QoSProfile, QoSHistoryPolicy, QoSReliabilityPolicy
 from rclpy.qos_overriding_options import QoSOverridingOptions
@@ -20,13 +22,20 @@ from geometry_msgs.msg import Twist, PoseStamped
 # Hook 測試：修改 src/ 下的檔案，應該會觸發 flake8 檢查
 from go2_interfaces.msg import Go2State, IMU
 from go2_interfaces.msg import LowState, VoxelMapCompressed, WebRtcReq
-from sensor_msgs.msg import PointCloud2, JointState, Joy, Image, CameraInfo
+from sensor_msgs.msg import PointCloud2, JointState, Joy, Image, CameraInfo, CompressedImage
+from std_msgs.msg import Header
 from nav_msgs.msg import Odometry
 
-from ..domain.entities import RobotConfig, RobotData, CameraData
-from ..application.services import RobotDataService, RobotControlService
-from ..infrastructure.ros2 import ROS2Publisher
+from ..domain.entities import RobotConfig
+from ..application.services import (
+    RobotDataService, RobotControlService, SubscriptionManager, IngestStage, TopicPolicy
+)
+from ..domain.constants import RTC_TOPIC
+from ..application.utils.metrics import MetricsRegistry, get_metrics_registry
+from ..application.utils.tracing import StampTracer
+from ..infrastructure.ros2 import ROS2Publisher, MetricsPublisher, VideoPacket
 from ..infrastructure.webrtc import WebRTCAdapter
+from ..infrastructure.sensors.video_worker import VideoWorker
 
 logging.basicConfig(
     level=logging.DEBUG,  # 允許所有日誌級別通過
@@ -35,6 +44,20 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)  # 設定 go2_driver_node 為 DEBUG 級別
 
+# Robot topics subscribed while any of their ROS publishers has a subscriber
+ROBOT_TOPIC_PUBLISHERS = {
+    RTC_TOPIC["LOW_STATE"]: ('joint_state',),
+    RTC_TOPIC["LF_SPORT_MOD_STATE"]: ('robot_state', 'imu'),
+    RTC_TOPIC["ULIDAR_ARRAY"]: ('lidar', 'lidar_delta', 'voxel'),
+}
+
+
+def _set_gauges(metrics: MetricsRegistry, name: str, help_text: str,
+                values: Dict[str, float], key: str = "stat", **labels: str) -> None:
+    """Set one gauge per entry of a component's stats dict, labelled key=<entry>"""
+    for entry, value in values.items():
+        metrics.gauge(name, help_text, **labels, **{key: entry}).set(value)
+
 
 class Go2DriverNode(Node):
     """Main Go2 driver node - entry point to the application"""
@@ -42,6 +65,12 @@ class Go2DriverNode(Node):
     def __init__(self, event_loop=None):
         super().__init__('go2_driver_node')  # Clean architecture main driver
         self.event_loop = event_loop
+
+        # Explicit callback groups: under the multi executor mode commands are
+        # never queued behind sensor or timer callbacks
+        self.command_group = MutuallyExclusiveCallbackGroup()
+        self.sensor_group = MutuallyExclusiveCallbackGroup()
+        self.timer_group = MutuallyExclusiveCallbackGroup()
         
         # Configuration initialization
         self.config = self._setup_configuration()
@@ -59,23 +88,60 @@ class Go2DriverNode(Node):
             broadcaster=self.broadcaster
         )
         
-        self.robot_data_service = RobotDataService(self.ros2_publisher)
+        self.stamp_tracer = (
+            StampTracer() if self.config.trace_stamps or self.config.use_robot_stamp else None)
+        self.robot_data_service = RobotDataService(self.ros2_publisher, self.stamp_tracer)
+        self.ingest_stage = self._setup_ingest_stage()
         
         self.webrtc_adapter = WebRTCAdapter(
             config=self.config,
             on_validated_callback=self._on_robot_validated,
             on_video_frame_callback=self._on_video_frame if self.config.enable_video else None,
-            event_loop=self.event_loop
+            event_loop=self.event_loop,
+            on_encoded_video_callback=self.ros2_publisher.publish_video_packet,
+            decode_video_callback=self.ros2_publisher.camera_in_demand
         )
         
         self.robot_control_service = RobotControlService(self.webrtc_adapter)
         
         # Set callback for data
         self.webrtc_adapter.set_data_callback(self._on_robot_data_received)
+        # Topics without a handler are dropped before JSON parsing
+        self.webrtc_adapter.set_topic_filter(self.robot_data_service.dispatcher.accepts)
+
+        # Robot topics are subscribed on demand and re-evaluated periodically
+        self.subscription_manager = SubscriptionManager(
+            send=self.webrtc_adapter.send_command,
+            always_on=self._always_on_robot_topics()
+        )
+        if self.config.conn_type == 'webrtc':
+            self.create_timer(self.config.subscription_check_period, self._update_subscriptions,
+                              callback_group=self.timer_group)
         
         # Subscribers initialization
         self._setup_subscribers()
+
+        # Performance metrics on /diagnostics (and optionally a Prometheus text file)
+        self.metrics = get_metrics_registry()
+        for collector in (self._collect_ingest_metrics, self._collect_command_metrics,
+                          self._collect_video_metrics, self._collect_lidar_metrics):
+            self.metrics.add_collector(collector)
+        if self.stamp_tracer is not None:
+            self.metrics.add_collector(self._collect_trace_metrics)
+        if self.config.metrics_period > 0:
+            self.metrics_publisher = MetricsPublisher(
+                self, self.metrics, prometheus_file=self.config.metrics_prometheus_file)
+            self.create_timer(self.config.metrics_period, self.metrics_publisher.publish,
+                              callback_group=self.timer_group)
         
+        # Liveness signal for go2_driver_supervisor, see run_heartbeat
+        self.heartbeat_publisher = (
+            self.create_publisher(Header, 'driver_heartbeat', 1)
+            if self.config.heartbeat_period > 0 else None)
+
+        # Video conversion threads, one per robot with a video track
+        self.video_workers: Dict[str, VideoWorker] = {}
+
         # State
         self.joy_state = Joy()
 
@@ -85,45 +151,112 @@ class Go2DriverNode(Node):
         token = os.getenv('ROBOT_TOKEN', os.getenv('GO2_TOKEN', ''))
         conn_type = os.getenv('CONN_TYPE', '')
 
-        # Declare parameters
-        self.declare_parameters(
-            namespace='',
-            parameters=[
-                ('robot_ip', robot_ip),
-                ('token', token),
-                ('conn_type', conn_type),
-                ('enable_video', True),
-                ('decode_lidar', True),
-                ('publish_raw_voxel', False),
-                ('obstacle_avoidance', False),
-            ]
-        )
+        # Every parameter is a RobotConfig.from_params argument of the same name
+        parameters = [
+            ('robot_ip', robot_ip),
+            ('token', token),
+            ('conn_type', conn_type),
+            ('enable_video', True),
+            ('decode_lidar', True),
+            ('lidar_decoder', 'wasm'),
+            ('lidar_decode_workers', 2),
+            ('lidar_keyframe_interval', 1),
+            ('publish_raw_voxel', False),
+            ('obstacle_avoidance', False),
+            ('robot_topics', ''),
+            ('subscription_check_period', 2.0),
+            ('lowstate_max_rate', 50.0),
+            ('ingest_queue_size', 10),
+            ('cmd_vel_rate', 20.0),
+            ('cmd_vel_timeout', 0.5),
+            ('robot_index', -1),
+            ('metrics_period', 5.0),
+            ('metrics_prometheus_file', ''),
+            ('trace_stamps', False),
+            ('use_robot_stamp', False),
+            ('executor', 'thread'),
+            ('executor_threads', 0),
+            ('camera_shm', False),
+            ('camera_shm_slots', 4),
+            ('video_max_fps', 0.0),
+            ('video_scale', 1.0),
+            ('video_format', 'bgr8'),
+            ('publish_compressed', False),
+            ('jpeg_quality', 80),
+            ('jpeg_max_fps', 10.0),
+            ('jpeg_workers', 2),
+            ('video_passthrough', False),
+            ('heartbeat_period', 1.0),
+        ]
+        self.declare_parameters(namespace='', parameters=parameters)
 
         self.add_on_set_parameters_callback(self._on_set_parameters)
 
         # Get parameter values
         config = RobotConfig.from_params(
-            robot_ip=self.get_parameter('robot_ip').get_parameter_value().string_value,
-            token=self.get_parameter('token').get_parameter_value().string_value,
-            conn_type=self.get_parameter('conn_type').get_parameter_value().string_value,
-            enable_video=self.get_parameter('enable_video').get_parameter_value().bool_value,
-            decode_lidar=self.get_parameter('decode_lidar').get_parameter_value().bool_value,
-            publish_raw_voxel=self.get_parameter('publish_raw_voxel').get_parameter_value().bool_value,
-            obstacle_avoidance=self.get_parameter('obstacle_avoidance').get_parameter_value().bool_value
-        )
+            **{name: self.get_parameter(name).value for name, _ in parameters})
 
         # Log configuration
         self.get_logger().info(f"Robot IPs: {config.robot_ip_list}")
         self.get_logger().info(f"Connection type: {config.conn_type}")
         self.get_logger().info(f"Connection mode: {config.conn_mode}")
+        if config.robot_index >= 0:
+            self.get_logger().info(f"Worker for robot {config.robot_index}")
         self.get_logger().info(f"Enable video: {config.enable_video}")
+        if config.enable_video:
+            self.get_logger().info(
+                f"Video: max fps {config.video_max_fps or 'unlimited'}, "
+                f"scale {config.video_scale}, format {config.video_format}")
+            if config.video_passthrough:
+                self.get_logger().info(
+                    f"H.264 passthrough as {VideoPacket.__name__}; decoding on demand only")
+            if config.publish_compressed:
+                self.get_logger().info(
+                    f"JPEG: quality {config.jpeg_quality}, "
+                    f"max fps {config.jpeg_max_fps or 'unlimited'}, {config.jpeg_workers} workers")
         self.get_logger().info(f"Decode lidar: {config.decode_lidar}")
+        self.get_logger().info(f"LiDAR decoder: {config.lidar_decoder}")
+        self.get_logger().info(f"LiDAR decode workers: {config.lidar_decode_workers}")
+        self.get_logger().info(f"LiDAR keyframe interval: {config.lidar_keyframe_interval}")
         self.get_logger().info(f"Publish raw voxel: {config.publish_raw_voxel}")
         self.get_logger().info(f"Obstacle avoidance: {config.obstacle_avoidance}")
+        self.get_logger().info(f"Always subscribed robot topics: {config.robot_topics}")
+        self.get_logger().info(f"Subscription check period: {config.subscription_check_period}s")
+        self.get_logger().info(f"Lowstate max rate: {config.lowstate_max_rate} Hz")
+        self.get_logger().info(f"Ingest queue size: {config.ingest_queue_size}")
+        self.get_logger().info(
+            f"cmd_vel rate: {config.cmd_vel_rate} Hz, timeout: {config.cmd_vel_timeout}s")
+        self.get_logger().info(
+            f"Metrics period: {config.metrics_period}s, "
+            f"Prometheus file: {config.metrics_prometheus_file or 'off'}")
+        self.get_logger().info(
+            f"Stamp tracing: {config.trace_stamps}, "
+            f"robot stamps in headers: {config.use_robot_stamp}")
+        self.get_logger().info(f"Executor mode: {config.executor}")
+        if config.camera_shm:
+            self.get_logger().info(f"Camera shared-memory ring: {config.camera_shm_slots} slots")
 
         return config
 
-    def _setup_publishers(self) -> Dict[str, list]:
+    def _setup_ingest_stage(self) -> IngestStage:
+        """Per-topic coalescing and rate caps between WebRTC and the data service"""
+        policies = {
+            RTC_TOPIC["LOW_STATE"]: TopicPolicy(
+                queue_size=1, max_rate=self.config.lowstate_max_rate),
+            RTC_TOPIC["LF_SPORT_MOD_STATE"]: TopicPolicy(queue_size=1),
+            RTC_TOPIC["ROBOTODOM"]: TopicPolicy(queue_size=1),
+            RTC_TOPIC["ULIDAR_ARRAY"]: TopicPolicy(
+                queue_size=1, merge=RobotDataService.merge_lidar_messages),
+        }
+        ingest_stage = IngestStage(
+            deliver=self.robot_data_service.process_webrtc_message,
+            policies=policies,
+            default_policy=TopicPolicy(queue_size=max(1, self.config.ingest_queue_size))
+        )
+        ingest_stage.start()
+        return ingest_stage
+
+    def _setup_publishers(self) -> Dict[str, Dict[str, Any]]:
         """ROS2 publishers setup"""
         qos_profile = QoSProfile(depth=10)
         best_effort_qos = QoSProfile(
@@ -132,68 +265,92 @@ class Go2DriverNode(Node):
             depth=1
         )
 
+        # Publishers per kind, keyed by robot ID (only this process's robots)
         publishers = {
-            'joint_state': [],
-            'robot_state': [],
-            'lidar': [],
-            'odometry': [],
-            'imu': [],
-            'camera': [],
-            'camera_info': [],
-            'voxel': []
+            'joint_state': {},
+            'robot_state': {},
+            'lidar': {},
+            'lidar_delta': {},
+            'odometry': {},
+            'imu': {},
+            'camera': {},
+            'camera_info': {},
+            'camera_compressed': {},
+            'camera_h264': {},
+            'camera_frame_ready': {},
+            'voxel': {}
         }
 
-        num_robots = len(self.config.robot_ip_list)
-        
-        for i in range(num_robots):
+        for robot_id in self.config.robot_ids:
             # Define topics depending on connection mode
             if self.config.conn_mode == 'single':
                 joint_topic = 'joint_states'
                 robot_state_topic = 'go2_states'
                 lidar_topic = 'point_cloud2'
+                lidar_delta_topic = 'point_cloud2_delta'
                 odom_topic = 'odom'
                 imu_topic = 'imu'
                 camera_topic = 'camera/image_raw'
                 camera_info_topic = 'camera/camera_info'
+                frame_ready_topic = 'camera/frame_ready'
+                compressed_topic = 'camera/image_raw/compressed'
+                h264_topic = 'camera/h264'
                 voxel_topic = '/utlidar/voxel_map_compressed'
             else:
-                prefix = f'robot{i}'
+                prefix = f'robot{robot_id}'
                 joint_topic = f'{prefix}/joint_states'
                 robot_state_topic = f'{prefix}/go2_states'
                 lidar_topic = f'{prefix}/point_cloud2'
+                lidar_delta_topic = f'{prefix}/point_cloud2_delta'
                 odom_topic = f'{prefix}/odom'
                 imu_topic = f'{prefix}/imu'
                 camera_topic = f'{prefix}/camera/image_raw'
                 camera_info_topic = f'{prefix}/camera/camera_info'
+                frame_ready_topic = f'{prefix}/camera/frame_ready'
+                compressed_topic = f'{prefix}/camera/image_raw/compressed'
+                h264_topic = f'{prefix}/camera/h264'
                 voxel_topic = f'{prefix}/utlidar/voxel_map_compressed'
 
             # Create publishers
-            publishers['joint_state'].append(
-                self.create_publisher(JointState, joint_topic, qos_profile))
-            publishers['robot_state'].append(
-                self.create_publisher(Go2State, robot_state_topic, qos_profile))
-            publishers['lidar'].append(
-                self.create_publisher(
-                    PointCloud2, lidar_topic, best_effort_qos,
-                    qos_overriding_options=QoSOverridingOptions.with_default_policies()))
-            publishers['odometry'].append(
-                self.create_publisher(Odometry, odom_topic, qos_profile))
-            publishers['imu'].append(
-                self.create_publisher(IMU, imu_topic, qos_profile))
+            publishers['joint_state'][robot_id] = self.create_publisher(
+                JointState, joint_topic, qos_profile)
+            publishers['robot_state'][robot_id] = self.create_publisher(
+                Go2State, robot_state_topic, qos_profile)
+            publishers['lidar'][robot_id] = self.create_publisher(
+                PointCloud2, lidar_topic, best_effort_qos,
+                qos_overriding_options=QoSOverridingOptions.with_default_policies())
+            # Deltas are only meaningful in sequence, so keep them reliable
+            publishers['lidar_delta'][robot_id] = self.create_publisher(
+                PointCloud2, lidar_delta_topic, qos_profile)
+            publishers['odometry'][robot_id] = self.create_publisher(
+                Odometry, odom_topic, qos_profile)
+            publishers['imu'][robot_id] = self.create_publisher(
+                IMU, imu_topic, qos_profile)
 
             if self.config.enable_video:
-                publishers['camera'].append(
-                    self.create_publisher(
-                        Image, camera_topic, best_effort_qos,
-                        qos_overriding_options=QoSOverridingOptions.with_default_policies()))
-                publishers['camera_info'].append(
-                    self.create_publisher(
-                        CameraInfo, camera_info_topic, best_effort_qos,
-                        qos_overriding_options=QoSOverridingOptions.with_default_policies()))
+                publishers['camera'][robot_id] = self.create_publisher(
+                    Image, camera_topic, best_effort_qos,
+                    qos_overriding_options=QoSOverridingOptions.with_default_policies())
+                publishers['camera_info'][robot_id] = self.create_publisher(
+                    CameraInfo, camera_info_topic, best_effort_qos,
+                    qos_overriding_options=QoSOverridingOptions.with_default_policies())
+                if self.config.publish_compressed:
+                    publishers['camera_compressed'][robot_id] = self.create_publisher(
+                        CompressedImage, compressed_topic, best_effort_qos,
+                        qos_overriding_options=QoSOverridingOptions.with_default_policies())
+                if self.config.video_passthrough:
+                    # Every access unit is needed to decode the stream, so keep it reliable
+                    publishers['camera_h264'][robot_id] = self.create_publisher(
+                        VideoPacket, h264_topic, qos_profile)
+                if self.config.camera_shm:
+                    # Header-only notification of a new frame in the shared-memory ring
+                    publishers['camera_frame_ready'][robot_id] = self.create_publisher(
+                        Header, frame_ready_topic, best_effort_qos,
+                        qos_overriding_options=QoSOverridingOptions.with_default_policies())
 
             if self.config.publish_raw_voxel:
-                publishers['voxel'].append(
-                    self.create_publisher(VoxelMapCompressed, voxel_topic, best_effort_qos))
+                publishers['voxel'][robot_id] = self.create_publisher(
+                    VoxelMapCompressed, voxel_topic, best_effort_qos)
 
         return publishers
 
@@ -202,38 +359,45 @@ class Go2DriverNode(Node):
         qos_profile = QoSProfile(depth=10)
 
         # Command subscribers
-        num_robots = len(self.config.robot_ip_list)
         
         if self.config.conn_mode == 'single':
             self.create_subscription(
                 Twist, 'cmd_vel',
-                lambda msg: self._on_cmd_vel(msg, "0"), qos_profile)
+                lambda msg: self._on_cmd_vel(msg, "0"), qos_profile,
+                callback_group=self.command_group)
             self.create_subscription(
                 WebRtcReq, 'webrtc_req',
-                lambda msg: self._on_webrtc_req(msg, "0"), qos_profile)
+                lambda msg: self._on_webrtc_req(msg, "0"), qos_profile,
+                callback_group=self.command_group)
         else:
-            for i in range(num_robots):
+            for robot_id in self.config.robot_ids:
                 self.create_subscription(
-                    Twist, f'robot{i}/cmd_vel',
-                    lambda msg, robot_id=str(i): self._on_cmd_vel(msg, robot_id), qos_profile)
+                    Twist, f'robot{robot_id}/cmd_vel',
+                    lambda msg, robot_id=robot_id: self._on_cmd_vel(msg, robot_id), qos_profile,
+                    callback_group=self.command_group)
                 self.create_subscription(
-                    WebRtcReq, f'robot{i}/webrtc_req',
-                    lambda msg, robot_id=str(i): self._on_webrtc_req(msg, robot_id), qos_profile)
+                    WebRtcReq, f'robot{robot_id}/webrtc_req',
+                    lambda msg, robot_id=robot_id: self._on_webrtc_req(msg, robot_id), qos_profile,
+                    callback_group=self.command_group)
 
         # Joystick subscriber
-        self.create_subscription(Joy, 'joy', self._on_joy, qos_profile)
+        self.create_subscription(Joy, 'joy', self._on_joy, qos_profile,
+                                 callback_group=self.command_group)
 
         # CycloneDDS support
         if self.config.conn_type == 'cyclonedds':
             self.create_subscription(
                 LowState, 'lowstate',
-                self._on_cyclonedds_low_state, qos_profile)
+                self._on_cyclonedds_low_state, qos_profile,
+                callback_group=self.sensor_group)
             self.create_subscription(
                 PoseStamped, '/utlidar/robot_pose',
-                self._on_cyclonedds_pose, qos_profile)
+                self._on_cyclonedds_pose, qos_profile,
+                callback_group=self.sensor_group)
             self.create_subscription(
                 PointCloud2, '/utlidar/cloud',
-                self._on_cyclonedds_lidar, qos_profile)
+                self._on_cyclonedds_lidar, qos_profile,
+                callback_group=self.sensor_group)
 
     def _on_set_parameters(self, params) -> SetParametersResult:
         """Callback for parameter changes"""
@@ -246,7 +410,8 @@ class Go2DriverNode(Node):
                     self.config.obstacle_avoidance = p.value
                     
                     try:
-                        self.robot_control_service.set_obstacle_avoidance(p.value, "0")
+                        for robot_id in self.config.robot_ids:
+                            self.robot_control_service.set_obstacle_avoidance(p.value, robot_id)
                     except Exception as e:
                         self.get_logger().error(f"Failed to set obstacle avoidance: {e}")
                         result.successful = False
@@ -265,7 +430,9 @@ class Go2DriverNode(Node):
 
     def _on_cmd_vel(self, msg: Twist, robot_id: str) -> None:
         """Callback for movement commands"""
-        self.get_logger().info(f"_on_cmd_vel called: x={msg.linear.x}, y={msg.linear.y}, z={msg.angular.z}, robot_id={robot_id}")
+        self.get_logger().debug(
+            f"_on_cmd_vel called: x={msg.linear.x}, y={msg.linear.y}, z={msg.angular.z}, "
+            f"robot_id={robot_id}")
         self.robot_control_service.handle_cmd_vel(
             msg.linear.x, msg.linear.y, msg.angular.z,
             robot_id, self.config.obstacle_avoidance
@@ -274,7 +441,7 @@ class Go2DriverNode(Node):
     def _on_webrtc_req(self, msg: WebRtcReq, robot_id: str) -> None:
         """Callback for WebRTC requests"""
         self.robot_control_service.handle_webrtc_request(
-            msg.api_id, msg.parameter, msg.topic, msg.id, robot_id
+            msg.api_id, msg.parameter, msg.topic, msg.id, robot_id, msg.priority
         )
 
     def _on_joy(self, msg: Joy) -> None:
@@ -284,41 +451,116 @@ class Go2DriverNode(Node):
     def _on_robot_validated(self, robot_id: str) -> None:
         """Callback after robot validation"""
         self.get_logger().info(f"Robot {robot_id} validated and ready")
+        self.subscription_manager.attach(robot_id)
+        self.subscription_manager.update(robot_id, self._robot_topics_in_demand(robot_id))
+
+    def _always_on_robot_topics(self) -> Set[str]:
+        """Odometry (it also drives TF) plus the configured robot_topics"""
+        topics = {RTC_TOPIC["ROBOTODOM"]}
+        for name in self.config.robot_topics:
+            if name == 'all':
+                topics.update(RTC_TOPIC.values())
+            else:
+                topics.add(RTC_TOPIC.get(name, name))
+        return topics
+
+    def _robot_topics_in_demand(self, robot_id: str) -> Set[str]:
+        """Robot topics whose ROS publishers currently have subscribers"""
+        demanded = set()
+        for topic, publisher_keys in ROBOT_TOPIC_PUBLISHERS.items():
+            for key in publisher_keys:
+                publisher = self.publishers_dict.get(key, {}).get(robot_id)
+                if publisher is not None and publisher.get_subscription_count() > 0:
+                    demanded.add(topic)
+                    break
+        return demanded
+
+    def _update_subscriptions(self) -> None:
+        """Timer callback: reconcile every connected robot's subscriptions"""
+        for robot_id in list(self.webrtc_adapter.connections):
+            try:
+                self.subscription_manager.update(robot_id, self._robot_topics_in_demand(robot_id))
+            except Exception as e:
+                self.get_logger().error(f"Failed to update subscriptions of robot {robot_id}: {e}")
+
+    # Metrics collectors: copy statistics the pipeline stages already keep into gauges
+
+    def _collect_ingest_metrics(self, metrics: MetricsRegistry) -> None:
+        for topic, counts in self.robot_data_service.dispatcher.stats().items():
+            _set_gauges(metrics, "go2_dispatch_messages", "Messages parsed/skipped by topic",
+                        counts, key="result", topic=topic)
+        for topic, counts in self.ingest_stage.stats().items():
+            _set_gauges(metrics, "go2_ingest_messages", "Ingest stage message counts",
+                        counts, key="result", topic=topic)
+        metrics.gauge("go2_ingest_pending", "Messages waiting in the ingest stage").set(
+            self.ingest_stage.pending())
+
+    def _collect_command_metrics(self, metrics: MetricsRegistry) -> None:
+        for robot_id in self.config.robot_ids:
+            _set_gauges(metrics, "go2_command_latency", "Request to data channel send latency",
+                        self.webrtc_adapter.command_latency(robot_id), robot=robot_id)
+            channel = self.webrtc_adapter.velocity_channels.get(robot_id)
+            if channel is not None:
+                counts = {name: getattr(channel, name)
+                          for name in ("received", "sent", "skipped", "timeouts")}
+                _set_gauges(metrics, "go2_cmd_vel_messages", "Velocity channel counts",
+                            counts, key="result", robot=robot_id)
+
+    def _collect_video_metrics(self, metrics: MetricsRegistry) -> None:
+        for robot_id, worker in list(self.video_workers.items()):
+            _set_gauges(metrics, "go2_video_frames", "Video worker frame counts and mean timings",
+                        worker.stats(), robot=robot_id)
+        for robot_id, connection in list(self.webrtc_adapter.connections.items()):
+            if connection.video_tap is not None:
+                _set_gauges(metrics, "go2_h264_frames", "H.264 passthrough frame counts",
+                            connection.video_tap.stats(), robot=robot_id)
+        if self.ros2_publisher.jpeg_pool is not None:
+            _set_gauges(metrics, "go2_jpeg_frames", "JPEG encoder frame counts and mean timing",
+                        self.ros2_publisher.jpeg_pool.stats())
+
+    def _collect_lidar_metrics(self, metrics: MetricsRegistry) -> None:
+        if self.webrtc_adapter.decode_pool is not None:
+            _set_gauges(metrics, "go2_lidar_pool", "LiDAR decode pool state",
+                        self.webrtc_adapter.decode_pool.stats())
+
+    def _collect_trace_metrics(self, metrics: MetricsRegistry) -> None:
+        for topic, stages in self.stamp_tracer.summary().items():
+            for stage, stats in stages.items():
+                _set_gauges(metrics, "go2_trace_ms", "Message age and pipeline stage timings",
+                            stats, topic=topic, stage=stage)
+        for robot_id, offset in self.stamp_tracer.offsets().items():
+            metrics.gauge("go2_clock_offset_seconds", "Robot to local clock offset",
+                          robot=robot_id).set(offset)
 
     def _on_robot_data_received(self, msg: Dict[str, Any], robot_id: str) -> None:
-        """Callback for receiving data from robot"""
-        self.robot_data_service.process_webrtc_message(msg, robot_id)
+        """Callback for receiving data from robot; processed on the ingest thread"""
+        self.ingest_stage.submit(msg, robot_id)
 
     async def _on_video_frame(self, track: MediaStreamTrack, robot_id: str) -> None:
-        """Callback for processing video frames"""
+        """Receive video frames; conversion and publishing run on the robot's video worker"""
         logger.info(f"Video frame received for robot {robot_id}")
 
-        while True:
-            try:
-                frame = await track.recv()
-                img = frame.to_ndarray(format="bgr24")
-
-                # Create camera data
-                camera_data = CameraData(
-                    image=img,
-                    height=img.shape[0],
-                    width=img.shape[1],
-                    encoding="bgr8"
-                )
-
-                robot_data = RobotData(
-                    robot_id=robot_id,
-                    timestamp=0.0,
-                    camera_data=camera_data
-                )
-
-                # Publish via ROS2Publisher
-                self.ros2_publisher.publish_camera_data(robot_data)
-                await asyncio.sleep(0)
+        worker = self.video_workers.get(robot_id)
+        if worker is None:
+            worker = self.video_workers[robot_id] = VideoWorker(
+                robot_id,
+                self.ros2_publisher.publish_camera_data,
+                max_fps=self.config.video_max_fps,
+                scale=self.config.video_scale,
+                output_format=self.config.video_format,
+                demand=lambda: self.ros2_publisher.camera_in_demand(robot_id),
+            )
+        worker.start()
 
-            except Exception as e:
-                logger.error(f"Error processing video frame: {e}")
-                break
+        try:
+            while True:
+                frame = await track.recv()
+                worker.submit(frame)
+        except Exception as e:
+            logger.error(f"Error processing video frame: {e}")
+        finally:
+            worker.stop()
+            logger.info(f"Video of robot {robot_id} stopped: {worker.stats()}")
 
     # CycloneDDS callbacks
     def _on_cyclonedds_low_state(self, msg: LowState) -> None:
@@ -336,31 +578,85 @@ class Go2DriverNode(Node):
         # You can add processing for CycloneDDS here if needed
         pass
 
-    async def connect_robots(self) -> None:
-        """Connect to robots"""
-        if self.config.conn_type == 'webrtc':
-            for i, robot_ip in enumerate(self.config.robot_ip_list):
-                try:
-                    await self.webrtc_adapter.connect(str(i))
-                except Exception as e:
-                    self.get_logger().error(f"Failed to connect to robot {i}: {e}")
-                    raise
+    async def connect_robots(self) -> List[str]:
+        """
+        Connect to all robots concurrently.
 
-    async def run_robot_control_loop(self, robot_id: str) -> None:
-        """Main robot control loop"""
+        A robot that fails to connect is logged and skipped; the others
+        stay connected.
+
+        Returns:
+            IDs of the robots that connected
+
+        Raises:
+            RuntimeError: If no robot could be connected
+        """
+        robot_ids = list(self.config.robot_ids)
+        if self.config.conn_type != 'webrtc':
+            return robot_ids
+
+        start = time.perf_counter()
+        results = await asyncio.gather(
+            *(self.webrtc_adapter.connect(robot_id) for robot_id in robot_ids),
+            return_exceptions=True
+        )
+        connected = []
+        for robot_id, result in zip(robot_ids, results):
+            if isinstance(result, BaseException):
+                self.get_logger().error(f"Failed to connect to robot {robot_id}: {result}")
+            else:
+                connected.append(robot_id)
+        self.get_logger().info(
+            f"Connected {len(connected)}/{len(robot_ids)} robots in "
+            f"{time.perf_counter() - start:.2f}s")
+
+        if not connected:
+            raise RuntimeError("Failed to connect to any robot")
+        return connected
+
+    async def run_heartbeat(self) -> None:
+        """
+        Publish driver_heartbeat every heartbeat_period seconds.
+
+        Runs on the event loop, so the heartbeat stops when the loop that
+        services WebRTC is blocked, not only when the process exits. The
+        frame_id carries the process id, which lets the supervisor match a
+        heartbeat to its worker process. Returns at once if heartbeat_period is 0.
+        """
+        if self.heartbeat_publisher is None:
+            return
+        msg = Header(frame_id=str(os.getpid()))
         while True:
             try:
-                # Process joystick commands
-                if self.joy_state.buttons:
-                    self.robot_control_service.handle_joy_command(
-                        self.joy_state.buttons, robot_id
-                    )
-
-                # Process WebRTC commands
-                self.webrtc_adapter.process_webrtc_commands(robot_id)
-                
-                await asyncio.sleep(0.1)
-                
+                msg.stamp = self.get_clock().now().to_msg()
+                self.heartbeat_publisher.publish(msg)
             except Exception as e:
-                self.get_logger().error(f"Error in control loop for robot {robot_id}: {e}")
-                raise 
\ No newline at end of file
+                self.get_logger().error(f"Error publishing heartbeat: {e}")
+            await asyncio.sleep(self.config.heartbeat_period)
+
+    async def run_robot_control_loop(self, robot_id: str) -> None:
+        """Main robot control loop"""
+        # WebRTC requests are sent by their own task as soon as they are queued
+        command_sender = asyncio.create_task(self.webrtc_adapter.run_command_sender(robot_id))
+        # cmd_vel is coalesced to the latest value and sent at a fixed rate
+        velocity_sender = asyncio.create_task(self.webrtc_adapter.run_velocity_channel(robot_id))
+        try:
+            while True:
+                try:
+                    # Process joystick commands
+                    if self.joy_state.buttons:
+                        self.robot_control_service.handle_joy_command(
+                            self.joy_state.buttons, robot_id
+                        )
+
+                    await asyncio.sleep(0.1)
+
+                except Exception as e:
+                    self.get_logger().error(f"Error in control loop for robot {robot_id}: {e}")
+                    raise
+        finally:
+            command_sender.cancel()
+            velocity_sender.cancel()
+            self.get_logger().info(
+                f"Robot {robot_id} command latency: "
+                f"{self.webrtc_adapter.command_latency(robot_id)}")
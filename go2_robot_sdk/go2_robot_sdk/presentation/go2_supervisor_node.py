@@ -0,0 +1,83 @@
+# Copyright (c) 2024, RoboVerse community
+# SPDX-License-Identifier: BSD-3-Clause
+
+import os
+from typing import Dict, Sequence
+
+from rclpy.node import Node
+from std_msgs.msg import Header
+
+from ..infrastructure.process import WorkerProcess, worker_ros_args
+
+
+class Go2SupervisorNode(Node):
+    """Runs one go2_driver_node worker process per robot and restarts them on exit or hang"""
+
+    def __init__(self, argv: Sequence[str]):
+        super().__init__('go2_driver_supervisor')
+
+        robot_ip = os.getenv('ROBOT_IP', os.getenv('GO2_IP', ''))
+        self.declare_parameters(
+            namespace='',
+            parameters=[
+                ('robot_ip', robot_ip),
+                ('health_check_period', 1.0),
+                ('max_restart_backoff', 30.0),
+                ('heartbeat_timeout', 5.0),
+                ('startup_timeout', 30.0),
+            ]
+        )
+        robot_ip = self.get_parameter('robot_ip').value
+        period = self.get_parameter('health_check_period').value
+        max_backoff = self.get_parameter('max_restart_backoff').value
+        heartbeat_timeout = self.get_parameter('heartbeat_timeout').value
+        startup_timeout = self.get_parameter('startup_timeout').value
+
+        robot_ip_list = robot_ip.replace(" ", "").split(",")
+        self.workers: Dict[int, WorkerProcess] = {
+            i: WorkerProcess(i, worker_ros_args(argv, i), max_backoff=max_backoff,
+                             heartbeat_timeout=heartbeat_timeout,
+                             startup_timeout=startup_timeout)
+            for i in range(len(robot_ip_list))
+        }
+        self.get_logger().info(
+            f"Supervising {len(self.workers)} driver workers for {robot_ip_list}, "
+            f"heartbeat timeout: {heartbeat_timeout or 'off'}")
+
+        # Workers publish driver_heartbeat with their pid as frame_id
+        self.create_subscription(Header, 'driver_heartbeat', self._on_heartbeat, 10)
+        for worker in self.workers.values():
+            worker.start()
+        self.create_timer(period, self._check_workers)
+
+    def _on_heartbeat(self, msg: Header) -> None:
+        for worker in self.workers.values():
+            if str(worker.pid) == msg.frame_id:
+                worker.heartbeat()
+                return
+
+    def _check_workers(self) -> None:
+        """Timer callback: restart workers that exited or stopped sending heartbeats"""
+        for worker in self.workers.values():
+            try:
+                worker.check()
+            except Exception as e:
+                self.get_logger().error(
+                    f"Failed to restart worker for robot {worker.robot_index}: {e}")
+
+    def status(self) -> Dict[int, Dict[str, object]]:
+        """Return {robot_index: {"alive", "restarts", "hangs", "last_exit_code"}}"""
+        return {
+            index: {
+                "alive": worker.alive,
+                "restarts": worker.restarts,
+                "hangs": worker.hangs,
+                "last_exit_code": worker.last_exit_code,
+            }
+            for index, worker in self.workers.items()
+        }
+
+    def stop_workers(self) -> None:
+        """Stop all workers"""
+        for worker in self.workers.values():
+            worker.stop()
@@ -0,0 +1,35 @@
+# Copyright (c) 2024, RoboVerse community
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+Entry point of the process-per-robot driver supervisor.
+Takes the same parameters as go2_driver_node and starts one driver worker
+process per robot in robot_ip, restarting workers that exit.
+"""
+
+import sys
+
+import rclpy
+
+from .presentation.go2_supervisor_node import Go2SupervisorNode
+
+
+def main():
+    """Entry point"""
+    rclpy.init()
+    node = None
+    try:
+        node = Go2SupervisorNode(sys.argv)
+        rclpy.spin(node)
+    except KeyboardInterrupt:
+        print("\nSupervisor terminated by keyboard interrupt")
+    finally:
+        if node is not None:
+            node.stop_workers()
+            node.destroy_node()
+        if rclpy.ok():
+            rclpy.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -23,6 +23,8 @@ class Go2LaunchConfig:
         self.map_name = os.getenv('MAP_NAME', '3d_map')
         self.save_map = os.getenv('MAP_SAVE', 'true')
         self.conn_type = os.getenv('CONN_TYPE', 'webrtc')
+        # One driver process per robot (go2_driver_supervisor) instead of one for all
+        self.shard_robots = os.getenv('SHARD_ROBOTS', 'false').lower() == 'true'
         
         # Derived configurations
         self.conn_mode = self._determine_connection_mode()
@@ -38,6 +40,13 @@ class Go2LaunchConfig:
         print(f"   Connection: {self.conn_type} ({self.conn_mode})")
         print(f"   URDF: {self.urdf_file}")
     
+    @property
+    def driver_executable(self) -> str:
+        """Supervisor for sharded multi-robot setups, the single driver node otherwise"""
+        if self.shard_robots and len(self.robot_ip_list) > 1 and self.conn_type == 'webrtc':
+            return 'go2_driver_supervisor'
+        return 'go2_driver_node'
+    
     def _parse_ip_list(self, robot_ip: str) -> List[str]:
         """Parse robot IP addresses from environment variable"""
         return robot_ip.replace(" ", "").split(",") if robot_ip else []
@@ -182,8 +191,8 @@ class Go2NodeFactory:
             # Main robot driver (clean architecture)
             Node(
                 package='go2_robot_sdk',
-                executable='go2_driver_node',
-                name='go2_driver_node',
+                executable=self.config.driver_executable,
+                name=self.config.driver_executable,
                 output='screen',
                 parameters=[{
                     'robot_ip': self.config.robot_ip,
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+pytest 測試套件
+驗證 MoveCommandTemplate 與 gen_mov_command 產生完全相同的指令字串
+"""
+
+import sys
+
+import pytest
+
+from go2_robot_sdk.application.utils import command_generator
+from go2_robot_sdk.application.utils.command_generator import (
+    MoveCommandTemplate, gen_mov_command
+)
+
+VELOCITIES = [
+    (0.0, 0.0, 0.0),
+    (0.5, -0.25, 1.0),
+    (-1.2, 0.33, -0.07),
+    (2.5, 0.0, -3.14),
+]
+
+
+@pytest.fixture(autouse=True)
+def fixed_id(monkeypatch):
+    monkeypatch.setattr(command_generator, 'generate_id', lambda: 123456789)
+
+
+@pytest.mark.parametrize('obstacle_avoidance', [False, True])
+@pytest.mark.parametrize('x, y, z', VELOCITIES)
+def test_template_matches_gen_mov_command(obstacle_avoidance, x, y, z):
+    """測試範本輸出與 gen_mov_command 逐字元相同"""
+    template = MoveCommandTemplate(obstacle_avoidance)
+
+    assert template.render(x, y, z) == gen_mov_command(x, y, z, obstacle_avoidance)
+
+
+@pytest.mark.parametrize('obstacle_avoidance', [False, True])
+def test_template_rounds_and_uses_command_id(obstacle_avoidance):
+    """測試範本將速度取到小數第二位並使用指定的 command_id"""
+    template = MoveCommandTemplate(obstacle_avoidance)
+    expected = gen_mov_command(0.12, -0.5, 0.99, obstacle_avoidance)
+
+    assert template.render(0.1234, -0.5001, 0.987) == expected
+    assert '"id": 42' in template.render(0.0, 0.0, 0.0, command_id=42)
+
+
+if __name__ == '__main__':
+    sys.exit(pytest.main([__file__, '-v']))
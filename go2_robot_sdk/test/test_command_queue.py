@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+pytest 測試套件
+驗證 CommandQueue 依優先權送出、同優先權維持 FIFO
+"""
+
+import asyncio
+import sys
+import threading
+
+import pytest
+
+from go2_robot_sdk.infrastructure.webrtc.command_queue import CommandQueue
+
+
+async def drain(queue, count):
+    """依序取出 count 個指令的 payload"""
+    payloads = []
+    for _ in range(count):
+        command = await asyncio.wait_for(queue.get(), timeout=1.0)
+        payloads.append(command.payload)
+        queue.task_done(command)
+    return payloads
+
+
+def test_fifo_within_priority():
+    """測試同優先權的指令依放入順序送出"""
+    async def run():
+        queue = CommandQueue(asyncio.get_running_loop())
+        for i in range(20):
+            queue.put(f'cmd{i}')
+        return await drain(queue, 20)
+
+    assert asyncio.run(run()) == [f'cmd{i}' for i in range(20)]
+
+
+def test_priority_overtakes_queued_commands():
+    """測試優先指令超越已排隊的一般指令，各自仍為 FIFO"""
+    async def run():
+        queue = CommandQueue(asyncio.get_running_loop())
+        queue.put('normal1')
+        queue.put('normal2')
+        queue.put('urgent1', priority=1)
+        queue.put('normal3')
+        queue.put('urgent2', priority=1)
+        return await drain(queue, 5)
+
+    assert asyncio.run(run()) == ['urgent1', 'urgent2', 'normal1', 'normal2', 'normal3']
+
+
+def test_put_from_other_thread():
+    """測試從 ROS 執行緒放入的指令由事件迴圈上的 sender 取得"""
+    async def run():
+        queue = CommandQueue(asyncio.get_running_loop())
+        thread = threading.Thread(
+            target=lambda: [queue.put(f'cmd{i}') for i in range(5)])
+        thread.start()
+        payloads = await drain(queue, 5)
+        thread.join()
+        return payloads, queue.latency.count
+
+    payloads, timed = asyncio.run(run())
+    assert payloads == [f'cmd{i}' for i in range(5)]
+    assert timed == 5
+
+
+def test_unsent_commands_counted_as_dropped():
+    """測試未送出的指令計入 dropped 且不計入延遲統計"""
+    async def run():
+        queue = CommandQueue(asyncio.get_running_loop())
+        queue.put('cmd')
+        queue.task_done(await queue.get(), sent=False)
+        return queue
+
+    queue = asyncio.run(run())
+    assert queue.dropped == 1
+    assert queue.latency.count == 0
+
+
+if __name__ == '__main__':
+    sys.exit(pytest.main([__file__, '-v']))
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+pytest 測試套件
+驗證 IngestStage 的佇列上限合併 (coalescing) 與 merge_lidar_messages
+"""
+
+import sys
+import threading
+import time
+
+import pytest
+
+from go2_robot_sdk.application.services.ingest_stage import IngestStage, TopicPolicy
+from go2_robot_sdk.application.services.robot_data_service import RobotDataService
+
+LIDAR = 'rt/utlidar/voxel_map_compressed'
+
+
+class Collector:
+    """收集送達的訊息，並可等待指定數量"""
+
+    def __init__(self):
+        self.messages = []
+        self._cond = threading.Condition()
+
+    def __call__(self, msg, robot_id):
+        with self._cond:
+            self.messages.append((robot_id, msg))
+            self._cond.notify_all()
+
+    def wait(self, count, timeout=2.0):
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while len(self.messages) < count and time.monotonic() < deadline:
+                self._cond.wait(deadline - time.monotonic())
+        return [msg for _, msg in self.messages]
+
+
+@pytest.fixture
+def collector():
+    return Collector()
+
+
+def run_stage(stage, count, collector):
+    """啟動送達執行緒並等待 count 則訊息"""
+    stage.start()
+    try:
+        return collector.wait(count)
+    finally:
+        stage.stop()
+
+
+def test_latest_value_coalescing(collector):
+    """測試 queue_size=1 時只送達最新一則，其餘計入 dropped"""
+    stage = IngestStage(collector, {'state': TopicPolicy(queue_size=1)})
+    for i in range(5):
+        stage.submit({'topic': 'state', 'seq': i}, '0')
+
+    delivered = run_stage(stage, 1, collector)
+
+    assert [msg['seq'] for msg in delivered] == [4]
+    assert stage.stats()['state'] == {'received': 5, 'delivered': 1, 'dropped': 4}
+
+
+def test_bounded_queue_drops_oldest(collector):
+    """測試預設策略的佇列滿時丟棄最舊的訊息"""
+    stage = IngestStage(collector, default_policy=TopicPolicy(queue_size=3))
+    for i in range(5):
+        stage.submit({'topic': 'other', 'seq': i}, '0')
+
+    delivered = run_stage(stage, 3, collector)
+
+    assert [msg['seq'] for msg in delivered] == [2, 3, 4]
+    assert stage.dropped['other'] == 2
+
+
+def test_queues_are_per_robot(collector):
+    """測試不同機器人的同一主題不互相合併"""
+    stage = IngestStage(collector, {'state': TopicPolicy(queue_size=1)})
+    stage.submit({'topic': 'state', 'seq': 0}, '0')
+    stage.submit({'topic': 'state', 'seq': 1}, '1')
+
+    run_stage(stage, 2, collector)
+
+    assert sorted((robot_id, msg['seq']) for robot_id, msg in collector.messages) == [
+        ('0', 0), ('1', 1)]
+
+
+def test_merge_hook_applied_to_dropped_lidar(collector):
+    """測試丟棄的 LiDAR 訊息經 merge_lidar_messages 併入下一則"""
+    policy = TopicPolicy(queue_size=1, merge=RobotDataService.merge_lidar_messages)
+    stage = IngestStage(collector, {LIDAR: policy})
+    stage.submit({'topic': LIDAR, 'seq': 0, 'unchanged': False}, '0')
+    stage.submit({'topic': LIDAR, 'seq': 1, 'unchanged': True}, '0')
+
+    delivered = run_stage(stage, 1, collector)
+
+    assert delivered == [{'topic': LIDAR, 'seq': 1, 'unchanged': False}]
+
+
+@pytest.mark.parametrize('dropped, latest, expected', [
+    (False, True, False),  # 被丟棄的幀有變化：下一幀不能再標為未變化
+    (True, True, True),  # 連續未變化：仍與前一次送達的幀相同
+    (True, False, False),
+    (False, False, False),
+])
+def test_merge_lidar_messages(dropped, latest, expected):
+    """測試 unchanged 旗標只有在被丟棄的幀也未變化時才保留"""
+    merged = RobotDataService.merge_lidar_messages(
+        {'unchanged': dropped}, {'unchanged': latest, 'seq': 1})
+
+    assert merged['unchanged'] is expected
+    assert merged['seq'] == 1
+
+
+if __name__ == '__main__':
+    sys.exit(pytest.main([__file__, '-v']))
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+pytest 測試套件
+驗證 NativeLidarDecoder 與 libvoxel.wasm 的輸出完全一致
+
+擷取的 voxel_map_compressed 封包 (*.bin) 可透過 GO2_VOXEL_CORPUS 環境變數指定，
+否則使用 benchmarks/voxel_corpus.py 產生的合成資料。
+"""
+
+import functools
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+
+from voxel_corpus import (  # noqa: E402
+    build_frame, load_frames, lz4_compress_block, split_frame, synthetic_grid
+)
+from go2_robot_sdk.infrastructure.sensors.lidar_decoder import (  # noqa: E402
+    NativeLidarDecoder, get_voxel_decoder, lz4_block_decompress,
+    update_meshes_for_cloud2, update_meshes_for_cloud2_reference
+)
+
+pytest.importorskip('wasmtime')
+
+KEYS = ('positions', 'uvs', 'indices')
+
+
+@functools.lru_cache(maxsize=None)
+def corpus():
+    """擷取封包 + 合成封包 (含 >=512 bytes 的尾端 literal 與不同高度的 origin)"""
+    frames = load_frames(os.environ.get('GO2_VOXEL_CORPUS'))
+
+    raw = bytearray(np.packbits(synthetic_grid(99).reshape(-1)).tobytes())
+    raw[-1024:] = np.random.default_rng(1).integers(0, 256, 1024, dtype=np.uint8).tobytes()
+    payload = lz4_compress_block(bytes(raw))
+    for z in (-1.2, 0.7, 3.0):
+        frames.append(build_frame(payload, origin=(0.0, 0.0, z)))
+    return [split_frame(frame) for frame in frames]
+
+
+@pytest.fixture(scope='module')
+def decoders():
+    return get_voxel_decoder('wasm'), get_voxel_decoder('native')
+
+
+@pytest.mark.parametrize('index', range(len(corpus())))
+def test_native_matches_wasm(decoders, index):
+    """測試 native 與 WASM 解碼結果逐位元組相同"""
+    wasm, native = decoders
+    metadata, payload = corpus()[index]
+
+    expected = wasm.decode(payload, metadata['data'])
+    actual = native.decode(payload, metadata['data'])
+
+    assert actual['point_count'] == expected['point_count']
+    assert actual['face_count'] == expected['face_count']
+    for key in KEYS:
+        assert actual[key].dtype == expected[key].dtype, key
+        assert np.array_equal(actual[key], expected[key]), key
+
+
+def test_invalid_payload_yields_empty_mesh(decoders):
+    """測試損毀的 LZ4 資料回傳空結果 (與 WASM 相同)"""
+    wasm, native = decoders
+    data = {'origin': [0.0, 0.0, 0.0], 'resolution': 0.05}
+
+    expected = wasm.decode(b'\xff\xff\x00', data)
+    actual = native.decode(b'\xff\xff\x00', data)
+
+    assert actual['face_count'] == expected['face_count'] == 0
+    assert actual['point_count'] == expected['point_count'] == 0
+
+
+@pytest.mark.parametrize('limiter', [0, 30])
+def test_cloud_dedup_matches_reference(decoders, limiter):
+    """測試整數鍵去重與 np.unique(axis=0) 參考實作結果相同 (含排序)"""
+    _, native = decoders
+    for metadata, payload in corpus():
+        data = metadata['data']
+        decoded = native.decode(payload, data)
+        args = (decoded['positions'], decoded['uvs'], data['resolution'], data['origin'], limiter)
+
+        expected = update_meshes_for_cloud2_reference(*args)
+        actual = update_meshes_for_cloud2(*args)
+
+        assert actual.dtype == expected.dtype
+        assert np.array_equal(actual, expected)
+
+
+def test_pure_python_lz4_fallback(monkeypatch):
+    """測試未安裝 lz4 套件時的純 Python 解壓縮"""
+    from go2_robot_sdk.infrastructure.sensors import lidar_decoder
+
+    raw = np.packbits(synthetic_grid(7).reshape(-1)).tobytes()
+    monkeypatch.setattr(lidar_decoder, 'lz4_block_decompress_c', None)
+    assert lz4_block_decompress(lz4_compress_block(raw), len(raw)) == raw
+    assert isinstance(get_voxel_decoder('native'), NativeLidarDecoder)
+
+
+if __name__ == '__main__':
+    sys.exit(pytest.main([__file__, '-v']))
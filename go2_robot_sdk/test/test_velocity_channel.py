@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+pytest 測試套件
+驗證 VelocityChannel.tick 的送出規則：逾時停車、零速度不重送、非零速度 keepalive
+"""
+
+import json
+import sys
+import time
+
+import pytest
+
+from go2_robot_sdk.infrastructure.webrtc.velocity_channel import VelocityChannel
+
+
+def velocity(payload):
+    """解析移動指令中的 (x, y, z)"""
+    parameter = json.loads(json.loads(payload)['data']['parameter'])
+    return parameter['x'], parameter['y'], parameter['z']
+
+
+@pytest.fixture
+def channel():
+    return VelocityChannel(lambda payload: None, rate=20.0, timeout=0.5, keepalive=0.25)
+
+
+def test_nothing_sent_before_first_twist(channel):
+    """測試尚未收到 Twist 時不送出任何指令"""
+    assert channel.tick(time.monotonic()) is None
+
+
+def test_nonzero_velocity_keepalive(channel):
+    """測試相同的非零速度只在 keepalive 間隔後重送"""
+    channel.set(0.5, 0.0, 0.1)
+    now = time.monotonic()
+
+    assert velocity(channel.tick(now)) == (0.5, 0.0, 0.1)
+    assert channel.tick(now + 0.1) is None
+    assert velocity(channel.tick(now + 0.3)) == (0.5, 0.0, 0.1)
+    assert channel.skipped == 1
+
+
+def test_zero_velocity_sent_once(channel):
+    """測試相同的零速度指令只送一次，超過 keepalive 也不重送"""
+    channel.set(0.0, 0.0, 0.0)
+    now = time.monotonic()
+
+    assert velocity(channel.tick(now)) == (0.0, 0.0, 0.0)
+    assert channel.tick(now + 0.3) is None
+    assert channel.tick(now + 2.0) is None
+
+
+def test_timeout_stops_robot(channel):
+    """測試移動中 cmd_vel 逾時後送出一次停止指令"""
+    channel.set(0.5, 0.0, 0.0)
+    now = time.monotonic()
+
+    assert velocity(channel.tick(now)) == (0.5, 0.0, 0.0)
+    assert velocity(channel.tick(now + 0.6)) == (0.0, 0.0, 0.0)
+    assert channel.timeouts == 1
+    assert channel.tick(now + 1.0) is None
+
+    # 新的 Twist 讓機器人繼續移動
+    channel.set(0.2, 0.0, 0.0)
+    assert velocity(channel.tick(time.monotonic())) == (0.2, 0.0, 0.0)
+
+
+def test_velocity_rounded_to_two_decimals(channel):
+    """測試速度取到小數第二位，微小變化不算新指令"""
+    channel.set(0.501, 0.0, 0.0)
+    now = time.monotonic()
+    assert velocity(channel.tick(now)) == (0.5, 0.0, 0.0)
+
+    channel.set(0.499, 0.0, 0.0)
+    assert channel.tick(now + 0.1) is None
+
+
+if __name__ == '__main__':
+    sys.exit(pytest.main([__file__, '-v']))
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+pytest 測試套件
+驗證 WorkerProcess 的心跳逾時偵測：停止送心跳的 worker 會被終止並重新啟動
+"""
+
+import sys
+import time
+
+import pytest
+
+from go2_robot_sdk.infrastructure.process.worker_process import WorkerProcess
+
+HUNG_WORKER = [sys.executable, '-c', 'import time; time.sleep(60)']
+
+
+@pytest.fixture
+def worker():
+    worker = WorkerProcess(0, [], initial_backoff=0.0, heartbeat_timeout=5.0,
+                           startup_timeout=30.0)
+    worker.command = HUNG_WORKER
+    worker.start()
+    yield worker
+    worker.stop(timeout=1.0)
+
+
+def test_heartbeats_keep_worker_running(worker):
+    """測試持續收到心跳時不重啟 worker"""
+    pid = worker.pid
+    now = time.monotonic()
+    worker.heartbeat(now + 10.0)
+    worker.check(now + 14.0)
+
+    assert worker.pid == pid
+    assert worker.hangs == 0
+
+
+def test_missed_heartbeats_restart_worker(worker):
+    """測試心跳逾時的 worker 被終止後重新啟動"""
+    pid = worker.pid
+    now = time.monotonic()
+    worker.heartbeat(now)
+    worker.check(now + 6.0)
+
+    assert worker.hangs == 1
+    assert worker.restarts == 1
+    assert worker.alive and worker.pid != pid
+    assert worker.last_heartbeat is None
+
+
+def test_startup_timeout_before_first_heartbeat(worker):
+    """測試尚未送出第一個心跳的 worker 適用 startup_timeout"""
+    worker.check(worker.started_at + 10.0)
+    assert worker.hangs == 0
+
+    worker.check(worker.started_at + 31.0)
+    assert worker.hangs == 1
+
+
+def test_heartbeat_timeout_disabled(worker):
+    """測試 heartbeat_timeout=0 時只偵測結束，不偵測停止回應"""
+    worker.heartbeat_timeout = 0.0
+    worker.check(worker.started_at + 1000.0)
+
+    assert worker.hangs == 0
+    assert worker.restarts == 0
+
+
+if __name__ == '__main__':
+    sys.exit(pytest.main([__file__, '-v']))
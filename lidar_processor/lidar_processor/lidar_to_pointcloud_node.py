@@ -16,8 +16,11 @@ from rclpy.node import Node
 from rclpy.qos import QoSProfile, QoSReliabilityPolicy, QoSHistoryPolicy
 from sensor_msgs.msg import PointCloud2
 from sensor_msgs_py import point_cloud2
+import numpy as np
 import open3d as o3d
 
+from go2_common.point_cloud_builder import PointCloud2Builder
+
 
 @dataclass
 class LidarConfig:
@@ -168,6 +171,7 @@ class LidarToPointCloudNode(Node):
     
     def _setup_publishers(self) -> None:
         """Setup publishers for processed data"""
+        self.cloud_builder = PointCloud2Builder(('x', 'y', 'z'))
         self.pointcloud_pub = self.create_publisher(
             PointCloud2, 
             '/pointcloud/aggregated', 
@@ -200,7 +204,8 @@ class LidarToPointCloudNode(Node):
         try:
             points = self.aggregator.get_points_copy()
             if points:
-                pointcloud_msg = point_cloud2.create_cloud_xyz32(header, points)
+                pointcloud_msg = self.cloud_builder.build(
+                    header, np.asarray(points, dtype=np.float32))
                 self.pointcloud_pub.publish(pointcloud_msg)
         except Exception as e:
             self.get_logger().error(f"Error publishing point cloud: {e}")
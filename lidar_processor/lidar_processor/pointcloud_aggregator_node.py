@@ -16,8 +16,11 @@ from rclpy.node import Node
 from rclpy.qos import QoSProfile, QoSReliabilityPolicy, QoSHistoryPolicy
 from sensor_msgs.msg import PointCloud2
 from sensor_msgs_py import point_cloud2
+from std_msgs.msg import Header
 import numpy as np
 
+from go2_common.point_cloud_builder import PointCloud2Builder
+
 
 @dataclass 
 class AggregatorConfig:
@@ -130,6 +133,7 @@ class PointCloudAggregatorNode(Node):
     
     def _setup_publishers(self) -> None:
         """Setup publishers for processed data"""
+        self.cloud_builder = PointCloud2Builder(('x', 'y', 'z'))
         self.filtered_pub = self.create_publisher(
             PointCloud2,
             '/pointcloud/filtered',
@@ -210,17 +214,17 @@ class PointCloudAggregatorNode(Node):
                 return
             
             # Create header
-            header = self.get_clock().now().to_msg()
-            header.frame_id = "base_link"
+            header = Header(frame_id="base_link")
+            header.stamp = self.get_clock().now().to_msg()
             
             # Publish filtered cloud
-            filtered_msg = point_cloud2.create_cloud_xyz32(header, all_points.tolist())
+            filtered_msg = self.cloud_builder.build(header, all_points)
             self.filtered_pub.publish(filtered_msg)
             
             # Create and publish downsampled version
             if self.config.downsample_rate > 1:
                 downsampled_points = all_points[::self.config.downsample_rate]
-                downsampled_msg = point_cloud2.create_cloud_xyz32(header, downsampled_points.tolist())
+                downsampled_msg = self.cloud_builder.build(header, downsampled_points)
                 self.downsampled_pub.publish(downsampled_msg)
             
             # Log statistics periodically